@@ -1,13 +1,14 @@
+import pandas as pd
 import streamlit as st
-from utils.data_loader import load_data
-from components.filters import create_sidebar_filters
+from utils.data_loader import load_data, load_all_data, load_numeric_columns, load_level_cube
+from components.filters import create_sidebar_filters, create_slice_filters, create_source_filters
 from components.charts import (
     create_difficulty_distribution,
     create_clear_rate_chart,
     create_engagement_chart,
     create_popularity_chart
 )
-from components.metrics import display_metrics
+from components.metrics import display_metrics, display_slice_metrics
 
 # Configuration de la page
 st.set_page_config(
@@ -21,10 +22,15 @@ st.title("📊 Analyse de Données de Jeux Platformer")
 st.markdown("---")
 st.text("Analyse des données de type platformer sur les données de jeu de superMario")
 
-# Chargement des données
-df = load_data(use_processed=True)
+# Chargement des données : un fichier traité, ou tous les fichiers téléchargés en parallèle
+all_files, show_local = create_source_filters()
+df = load_all_data() if all_files else load_data(use_processed=True)
 
 if df is not None:
+    if "sources" in df.attrs:
+        with st.expander("Provenance des données"):
+            st.dataframe(pd.DataFrame.from_dict(df.attrs["sources"], orient="index"), use_container_width=True)
+
     # Filtres
     selected_difficulty = create_sidebar_filters(df)
     
@@ -52,6 +58,19 @@ if df is not None:
     st.markdown("---")
     st.header("Statistiques Détaillées")
     display_metrics(df_filtered)
+
+    # Statistiques par tranche (difficulté x tag x créateurs), lues dans le cube d'agrégats
+    cube = load_level_cube(df)
+    if cube is not None:
+        selected_tag, selected_makers = create_slice_filters(cube)
+        st.markdown("---")
+        st.header("Statistiques par Tranche")
+        display_slice_metrics(
+            cube,
+            difficulty=selected_difficulty if selected_difficulty != "Tous" else None,
+            tag=selected_tag,
+            maker_buckets=selected_makers
+        )
     
     # Table des données
     st.markdown("---")
@@ -71,3 +90,11 @@ if df is not None:
 
 else:
     st.error("Impossible de charger les données. Veuillez vérifier les URLs des données.")
+
+# Statistiques de la dernière version locale, lues dans ses colonnes projetées en mémoire
+if show_local:
+    local_df = load_numeric_columns()
+    if local_df is not None:
+        st.markdown("---")
+        st.header("Dataset Local")
+        display_metrics(local_df)
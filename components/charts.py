@@ -1,8 +1,12 @@
 import plotly.express as px
+from src import large_charts
+
+# Au-delà de large_charts.LARGE_DATA_THRESHOLD niveaux, les graphiques sont construits à
+# partir de statistiques précalculées ou d'un échantillon (taille de page bornée)
 
 def create_difficulty_distribution(df):
     """Crée le graphique de distribution des difficultés"""
-    return px.pie(
+    return large_charts.pie(
         df,
         names="difficulty",
         title="Répartition des Niveaux par Difficulté",
@@ -11,7 +15,7 @@ def create_difficulty_distribution(df):
 
 def create_clear_rate_chart(df):
     """Crée le graphique de taux de réussite"""
-    return px.box(
+    return large_charts.box(
         df,
         x="difficulty",
         y="clear_rate",
@@ -21,7 +25,7 @@ def create_clear_rate_chart(df):
 
 def create_engagement_chart(df):
     """Crée le graphique d'engagement"""
-    return px.scatter(
+    return large_charts.scatter(
         df,
         x="difficulty_score",
         y="engagement_score",
@@ -32,7 +36,7 @@ def create_engagement_chart(df):
 
 def create_popularity_chart(df):
     """Crée le graphique de popularité"""
-    return px.violin(
+    return large_charts.violin(
         df,
         x="difficulty",
         y="likes",
@@ -43,7 +47,7 @@ def create_popularity_chart(df):
 # Ajout d'un graphique pour la distribution des scores de difficulté
 def create_difficulty_score_distribution(df):
     """Crée un graphique pour la distribution des scores de difficulté"""
-    return px.histogram(
+    return large_charts.histogram(
         df,
         x="difficulty_score",
         nbins=20,
@@ -55,7 +59,7 @@ def create_difficulty_score_distribution(df):
 # Graphique pour la relation entre la difficulté et le taux de réussite
 def create_clear_rate_vs_difficulty(df):
     """Crée un graphique de taux de réussite en fonction de la difficulté"""
-    return px.scatter(
+    return large_charts.scatter(
         df,
         x="difficulty_score",
         y="clear_rate",
@@ -68,7 +72,7 @@ def create_clear_rate_vs_difficulty(df):
 # Graphique pour la relation entre l'engagement et les likes
 def create_engagement_vs_likes(df):
     """Crée un graphique de l'engagement par rapport aux likes"""
-    return px.scatter(
+    return large_charts.scatter(
         df,
         x="likes",
         y="engagement_score",
@@ -7,4 +7,26 @@ def create_sidebar_filters(df):
     difficulties = ["Tous"] + sorted(df["difficulty"].unique().tolist())
     selected_difficulty = st.sidebar.selectbox("Sélectionner la difficulté", difficulties)
     
-    return selected_difficulty
\ No newline at end of file
+    return selected_difficulty
+
+
+def create_slice_filters(cube):
+    """Crée les filtres de tranche (tag et créateurs) servis par le cube d'agrégats"""
+    st.sidebar.subheader("Tranche")
+
+    tags = ["Tous"] + [tag for tag in cube.tags if tag != cube.ALL_TAGS]
+    selected_tag = st.sidebar.selectbox("Sélectionner le tag", tags)
+
+    maker_buckets = st.sidebar.multiselect("Créateurs (par nombre de niveaux)", cube.maker_buckets, default=cube.maker_buckets)
+
+    return (None if selected_tag == "Tous" else selected_tag), maker_buckets
+
+
+def create_source_filters():
+    """Crée le choix de la source des données et de l'affichage du dataset local"""
+    st.sidebar.header("Source des données")
+
+    all_files = st.sidebar.radio("Fichiers traités", ["Un fichier", "Tous les fichiers"]) == "Tous les fichiers"
+    show_local = st.sidebar.checkbox("Statistiques du dataset local (dernière version)")
+
+    return all_files, show_local
@@ -41,3 +41,17 @@ def display_metrics(df):
         st.markdown("---")
         st.subheader("Distribution des Niveaux par Difficulté")
         st.bar_chart(difficulty_distribution)
+
+
+def display_slice_metrics(cube, difficulty=None, tag=None, maker_buckets=None):
+    """Affiche moyenne et écart-type des mesures d'une tranche, lus dans le cube d'agrégats"""
+    stats = cube.slice(difficulty=difficulty, tag=tag, maker_bucket=maker_buckets)
+    st.metric("Niveaux dans la tranche", stats["levels"])
+    if stats["levels"] == 0:
+        return
+
+    rows = [
+        {"Mesure": measure, "Moyenne": stats[measure]["mean"], "Écart-type": stats[measure]["std"], "Effectif": stats[measure]["count"]}
+        for measure in cube.measures
+    ]
+    st.dataframe(rows, use_container_width=True)
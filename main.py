@@ -1,4 +1,5 @@
 import os
+import sys
 import logging
 from src.data_collection import DataCollector
 from src.data_preprocessing import DataPreprocessor
@@ -15,7 +16,12 @@ def setup_logging():
         ]
     )
 
-def main():
+def main(serve_dashboard: bool = False):
+    """
+    Exécute le pipeline sans interface (compatible batch/cron) ; les résultats sont
+    écrits dans analysis_output/. Avec serve_dashboard (option --dashboard), le
+    tableau de bord est ensuite servi à partir de ces artefacts.
+    """
     setup_logging()
     logging.info("Démarrage du pipeline d'analyse de la difficulté des jeux")
     
@@ -28,7 +34,7 @@ def main():
         
         # 1. Data Collection
         logging.info("Démarrage de la collecte de données à partir du référentiel PED...")
-        raw_data = collector.collect_game_data(limit=200)
+        raw_data = collector.collect_game_data(limit=200, compact=True)
         logging.info(f"Recueil {len(raw_data['levels'])} des entrées de niveau")
         
         # 2. Data Preprocessing
@@ -43,7 +49,11 @@ def main():
         
         # 4. Analysis and Visualization
         logging.info("Analyse de départ...")
-        analysis_results = analyzer.analyze_difficulty_patterns(structured_dataset)
+        analysis_results = analyzer.analyze_difficulty_patterns(
+            structured_dataset,
+            headless=True,
+            with_figures=serve_dashboard
+        )
         
         # Print summary of results
         print("\nRésumé de l'analyse:")
@@ -56,11 +66,16 @@ def main():
             print(f"{diff}: {count} niveaux")
         
         logging.info("Le pipeline d'analyse s'est achevé avec succès")
-        print("\nLe tableau de bord interactif s'ouvre dans votre navigateur...")
+        print(f"\nArtefacts d'analyse écrits dans {analyzer.output_dir}")
+
+        # 5. Dashboard (optionnel, bloquant)
+        if serve_dashboard:
+            print("\nLe tableau de bord interactif s'ouvre dans votre navigateur...")
+            analyzer.serve_dashboard()
         
     except Exception as e:
         logging.error(f"Échec du pipeline: {str(e)}")
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(serve_dashboard="--dashboard" in sys.argv[1:])
\ No newline at end of file
@@ -1,3 +1,7 @@
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import plotly.express as px
@@ -6,20 +10,82 @@ from plotly.subplots import make_subplots
 from dash import Dash, html, dcc
 from pathlib import Path
 import logging
-from typing import Dict, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Callable
 import webbrowser
 from threading import Timer
+from src.streaming_stats import StreamingAggregator
+from src.result_cache import ResultCache
+from src import large_charts
+from src.uncertainty import BootstrapEstimator
+from src.dataset_catalog import DatasetCatalog
+from src.dataset_structure import DatasetBuilder, PYARROW_AVAILABLE
+
+SNAPSHOT_PATTERN = re.compile(r"^dataset_(\d{8}_\d{6})(?:_\d+)?(\.parquet|\.pkl|\.csv)$")
+
+
+def _read_snapshot(path: Path, columns: List[str], chunk_size: int = 200_000) -> Iterator[pd.DataFrame]:
+    """Lit un snapshot (Parquet, Pickle ou CSV) par blocs, en ne gardant que les colonnes utiles."""
+    if path.suffix == ".parquet":
+        yield from DatasetBuilder.iter_dataset(path, columns=columns, batch_size=chunk_size)
+    elif path.suffix == ".pkl":
+        yield pd.read_pickle(path)[columns]
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+def _aggregate_snapshot(args) -> Dict[str, Any]:
+    """Agrégats d'un snapshot (exécuté dans un processus du pool)."""
+    path, spec = args
+    aggregator = StreamingAggregator(**spec)
+    for chunk in _read_snapshot(Path(path), aggregator.columns):
+        aggregator.update(chunk)
+    return aggregator.aggregates()
 
 class DataAnalyzer:
-    def __init__(self):
+    def __init__(self, cache: Optional[ResultCache] = None, use_cache: bool = True):
+        """
+        Args:
+            cache : Cache des résultats (par défaut analysis_output/cache, borné en taille)
+            use_cache : Désactive le cache si False (tout est recalculé)
+        """
         self.difficulty_thresholds = {
             "easy": 0.2,
             "medium": 0.4,
             "hard": 0.6,
             "very_hard": 0.8
         }
+        self.correlation_metrics = ["difficulty_score", "popularity_score", "engagement_score", "completion_rate"]
+        self.correlation_columns = self.correlation_metrics + ["clear_rate", "likes"]
+        self.mean_columns = ["difficulty_score", "clear_rate", "completion_rate", "engagement_score"]
+        self.group_columns = ["likes", "attempts", "engagement_score"]
+        self.quantile_levels = [0.25, 0.5, 0.75]
+        self.quantile_alpha = 0.005  # Erreur relative des quantiles en mode flux
+        # Incrémenter la version d'une section invalide uniquement ses entrées en cache
+        self.section_versions = {
+            "difficulty_distribution": 1,
+            "performance_metrics": 1,
+            "player_patterns": 1,
+            "correlations": 1,
+            "tables": 1,
+            "figures": 2,
+            "snapshot_summary": 1
+        }
+        # Paramètres lus par chaque section : seuls ceux-là entrent dans sa clé de cache
+        self.section_parameters = {
+            "difficulty_distribution": ["mean_columns", "quantile_levels"],
+            "performance_metrics": ["mean_columns", "correlation_columns", "quantile_levels"],
+            "player_patterns": ["correlation_columns", "group_columns"],
+            "correlations": ["correlation_metrics", "correlation_columns"],
+            "tables": ["correlation_columns", "group_columns"],
+            "figures": ["correlation_metrics", "correlation_columns"],
+            "snapshot_summary": [
+                "mean_columns", "correlation_metrics", "correlation_columns", "group_columns",
+                "quantile_levels", "quantile_alpha"
+            ]
+        }
         self.output_dir = Path("analysis_output")
         self.output_dir.mkdir(exist_ok=True)
+        self.cache = (cache or ResultCache(self.output_dir / "cache")) if use_cache else None
         self._setup_logging()
         self.app = Dash(__name__)
     
@@ -33,60 +99,434 @@ class DataAnalyzer:
             ]
         )
     
-    def analyze_difficulty_patterns(self, dataset: pd.DataFrame) -> Dict[str, Any]:
+    def analyze_difficulty_patterns(
+        self,
+        dataset: pd.DataFrame,
+        headless: bool = False,
+        save_artifacts: bool = True,
+        with_figures: Optional[bool] = None
+    ) -> Dict[str, Any]:
         """
         Effectue une analyse complète des schémas de difficultés et lance un tableau de bord interactif.
+
+        Les sections de résultats, les tables et les figures sont relues depuis le cache
+        quand les mêmes colonnes analysées ont déjà été traitées avec les mêmes paramètres.
+
+        Args:
+            dataset : Dataset à analyser
+            headless : Calcule sans lancer le tableau de bord (exécutions batch ou cron) ;
+                il se sert ensuite séparément avec serve_dashboard, à partir des artefacts
+            save_artifacts : Écrit résultats (JSON), tables (Parquet) et figures dans output_dir
+            with_figures : Construit les figures (par défaut seulement hors mode headless)
         """
         try:
-            analysis_results = {
-                "difficulty_distribution": self._analyze_difficulty_distribution(dataset),
-                "performance_metrics": self._calculate_performance_metrics(dataset),
-                "player_patterns": self._analyze_player_patterns(dataset),
-                "correlations": self._analyze_correlations(dataset)
-            }
+            with_figures = not headless if with_figures is None else with_figures
+            content_hash = self._content_hash(dataset)
+
+            names = list(self._sections()) + ["tables"] + (["figures"] if with_figures else [])
+            outputs = {name: self._cache_get(content_hash, name) for name in names}
+            missing = [name for name, value in outputs.items() if value is None]
+            if missing:
+                # Toutes les statistiques sont calculées une seule fois puis partagées
+                aggregates = self._aggregate(dataset)
+                for name in missing:
+                    outputs[name] = self._compute_output(name, dataset, aggregates)
+                    self._cache_put(content_hash, name, outputs[name])
+            logging.info(f"Analyse : {len(names) - len(missing)}/{len(names)} éléments relus depuis le cache")
+
+            analysis_results = {section: outputs[section] for section in self._sections()}
+            figures = outputs.get("figures", {})
+
+            if save_artifacts:
+                self.save_artifacts(analysis_results, outputs["tables"], figures, content_hash)
             
             # Create and launch interactive dashboard
-            self._create_dashboard(dataset, analysis_results)
+            if not headless:
+                self._create_dashboard(analysis_results, figures)
             
             return analysis_results
             
         except Exception as e:
             logging.error(f"L'analyse a échoué: {str(e)}")
             raise
-    
-    def _analyze_difficulty_distribution(self, df: pd.DataFrame) -> Dict[str, Any]:
+
+    def analyze_snapshot_series(self, data_dir: Path = Path("data"), n_workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Évolution des indicateurs clés sur tous les snapshots dataset_* de data_dir
+        (taux de réussite, engagement, répartition des difficultés, corrélations).
+
+        Le résumé de chaque snapshot est mis en cache (clé : fichier, taille, date de
+        modification et configuration) : un nouveau snapshot est le seul à calculer.
+        Les snapshots manquants sont agrégés en parallèle, un processus par fichier.
+
+        Args:
+            data_dir : Répertoire des snapshots
+            n_workers : Nombre de processus (None = nombre de cœurs)
+        Returns:
+            Une ligne par snapshot, indexée par sa date (unique : le suffixe _N d'un
+            snapshot de la même seconde y est ajouté en nanosecondes) et avec sa
+            version ; aussi écrite dans output_dir/tables/snapshot_series
+        """
+        try:
+            snapshots = self._discover_snapshots(Path(data_dir))
+            summaries = {}
+            for version, path in snapshots.items():
+                summaries[version] = self._cache_get(self._snapshot_identity(path), "snapshot_summary")
+            missing = [version for version, summary in summaries.items() if summary is None]
+
+            spec = {
+                "mean_columns": self.mean_columns,
+                "correlation_columns": self.correlation_columns,
+                "group_columns": self.group_columns,
+                "quantile_levels": self.quantile_levels,
+                "quantile_alpha": self.quantile_alpha
+            }
+            tasks = [(str(snapshots[version]), spec) for version in missing]
+            n_workers = min(n_workers or os.cpu_count() or 1, max(len(tasks), 1))
+            if n_workers > 1:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    aggregates = list(executor.map(_aggregate_snapshot, tasks))
+            else:
+                aggregates = [_aggregate_snapshot(task) for task in tasks]
+
+            for version, snapshot_aggregates in zip(missing, aggregates):
+                summaries[version] = self._snapshot_summary(snapshot_aggregates)
+                self._cache_put(self._snapshot_identity(snapshots[version]), "snapshot_summary", summaries[version])
+            logging.info(f"Série de snapshots : {len(snapshots)} snapshots, {len(missing)} calculés")
+
+            series = pd.DataFrame.from_dict(summaries, orient="index")
+            # Snapshots d'une même seconde (suffixe _N) : le suffixe départage en nanosecondes
+            keys = [DatasetCatalog.version_key(version) for version in series.index]
+            series.index = pd.to_datetime([timestamp for timestamp, _ in keys], format="%Y%m%d_%H%M%S") + \
+                pd.to_timedelta([suffix for _, suffix in keys], unit="ns")
+            series.index.name = "snapshot"
+            series.insert(0, "version", list(summaries))
+            series = series.sort_index()
+            # Une difficulté absente d'un snapshot non vide y a une part nulle
+            share_columns = [col for col in series.columns if col.startswith("share_")]
+            non_empty = series["levels"] > 0
+            series.loc[non_empty, share_columns] = series.loc[non_empty, share_columns].fillna(0.0)
+
+            tables_dir = self.output_dir / "tables"
+            tables_dir.mkdir(exist_ok=True)
+            if PYARROW_AVAILABLE:
+                series.to_parquet(tables_dir / "snapshot_series.parquet")
+            else:
+                series.to_csv(tables_dir / "snapshot_series.csv")
+            return series
+
+        except Exception as e:
+            logging.error(f"Échec de l'analyse de la série de snapshots: {str(e)}")
+            raise Exception(f"Échec de l'analyse de la série de snapshots: {str(e)}")
+
+    @staticmethod
+    def _discover_snapshots(data_dir: Path) -> Dict[str, Path]:
+        """Un fichier par snapshot (Parquet, sinon Pickle, sinon CSV), par version croissante."""
+        preference = {".parquet": 0, ".pkl": 1, ".csv": 2}
+        snapshots = {}
+        for path in data_dir.iterdir():
+            match = SNAPSHOT_PATTERN.match(path.name)
+            if match is None:
+                continue
+            version = path.name.split(".")[0].replace("dataset_", "")
+            current = snapshots.get(version)
+            if current is None or preference[path.suffix] < preference[current.suffix]:
+                snapshots[version] = path
+        return dict(sorted(snapshots.items(), key=lambda item: DatasetCatalog.version_key(item[0])))
+
+    @staticmethod
+    def _snapshot_identity(path: Path) -> str:
+        """Identifie le contenu d'un snapshot sans le lire (chemin, taille, date de modification)."""
+        if path.is_dir():
+            stats = [(f.relative_to(path).as_posix(), f.stat().st_size, f.stat().st_mtime_ns)
+                     for f in sorted(path.rglob("*")) if f.is_file()]
+        else:
+            stats = [(path.stat().st_size, path.stat().st_mtime_ns)]
+        return ResultCache.make_key(path.resolve().as_posix(), stats)
+
+    def _snapshot_summary(self, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        """Indicateurs clés d'un snapshot, à plat (une ligne de la série)."""
+        summary = {"levels": aggregates["count"]}
+        for col, value in aggregates["means"].items():
+            summary[f"mean_{col}"] = float(value)
+
+        counts = aggregates["difficulty_counts"]
+        total = counts.sum()
+        for difficulty, count in counts.items():
+            summary[f"share_{difficulty}"] = float(count / total) if total else np.nan
+
+        for key, value in self._analyze_correlations(aggregates).items():
+            summary[f"corr_{key}"] = float(value)
+        summary["corr_clear_rate_vs_difficulty_score"] = float(aggregates["correlation_matrix"].loc["clear_rate", "difficulty_score"])
+        return summary
+
+    def analyze_uncertainty(
+        self,
+        dataset: pd.DataFrame,
+        n_resamples: int = 10_000,
+        confidence: float = 0.95,
+        seed: int = 0,
+        n_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Intervalles de confiance bootstrap de chaque corrélation rapportée
+        (correlations, likes_vs_difficulty, difficulty_correlation) et de chaque moyenne
+        par difficulté, avec la probabilité que chaque difficulté soit la plus aimée,
+        la plus tentée ou la plus engageante.
+
+        Args:
+            dataset : Dataset analysé
+            n_resamples : Nombre de rééchantillonnages
+            confidence : Niveau de confiance
+            seed : Graine (résultats reproductibles)
+            n_workers : Nombre de processus (None = nombre de cœurs)
+        """
+        try:
+            metrics = self.correlation_metrics
+            pairs = [(metrics[i], metrics[j]) for i in range(len(metrics)) for j in range(i + 1, len(metrics))]
+            pairs += [("likes", "difficulty_score"), ("clear_rate", "difficulty_score")]
+
+            estimator = BootstrapEstimator(n_resamples=n_resamples, confidence=confidence, seed=seed, n_workers=n_workers)
+            return estimator.estimate(dataset, pairs, "difficulty", self.group_columns)
+
+        except Exception as e:
+            logging.error(f"Échec du calcul des intervalles de confiance: {str(e)}")
+            raise Exception(f"Échec du calcul des intervalles de confiance: {str(e)}")
+
+    def save_artifacts(
+        self,
+        analysis_results: Dict[str, Any],
+        tables: Dict[str, pd.DataFrame],
+        figures: Dict[str, str],
+        content_hash: Optional[str] = None
+    ) -> Path:
+        """
+        Écrit les artefacts d'une analyse dans output_dir :
+            results.json                 résultats et hash du dataset analysé
+            tables/<nom>.parquet         tables par difficulté et matrice de corrélation
+                                         (CSV sans pyarrow)
+            figures/<nom>.json           figures Plotly prêtes à afficher
+        Les figures d'une analyse précédente sont retirées pour ne pas mélanger deux datasets.
+        """
+        try:
+            payload = {
+                "content_hash": content_hash,
+                "created_at": pd.Timestamp.now().isoformat(),
+                "figures": list(figures),
+                "results": analysis_results
+            }
+            self._write_json(self.output_dir / "results.json", payload)
+
+            tables_dir = self.output_dir / "tables"
+            tables_dir.mkdir(exist_ok=True)
+            for name, table in tables.items():
+                if PYARROW_AVAILABLE:
+                    table.to_parquet(tables_dir / f"{name}.parquet")
+                else:
+                    table.to_csv(tables_dir / f"{name}.csv")
+
+            figures_dir = self.output_dir / "figures"
+            figures_dir.mkdir(exist_ok=True)
+            for stale in figures_dir.glob("*.json"):
+                if stale.stem not in figures:
+                    stale.unlink()
+            for name, figure_json in figures.items():
+                (figures_dir / f"{name}.json").write_text(figure_json)
+
+            logging.info(f"Artefacts d'analyse écrits dans {self.output_dir}")
+            return self.output_dir
+
+        except Exception as e:
+            logging.error(f"Échec de l'écriture des artefacts d'analyse: {str(e)}")
+            raise Exception(f"Échec de l'écriture des artefacts d'analyse: {str(e)}")
+
+    def serve_dashboard(self, artifacts_dir: Optional[Path] = None):
+        """
+        Lance le tableau de bord à partir des artefacts écrits par une analyse
+        (headless ou non), sans recalculer ni relire le dataset.
+        Sans figures enregistrées, seule la carte des corrélations est affichée,
+        reconstruite à partir de sa table.
+        """
+        artifacts_dir = Path(artifacts_dir or self.output_dir)
+        with open(artifacts_dir / "results.json", "r") as f:
+            payload = json.load(f)
+        analysis_results = payload["results"]
+
+        figures_dir = artifacts_dir / "figures"
+        figures = {
+            name: (figures_dir / f"{name}.json").read_text()
+            for name in payload.get("figures", []) if (figures_dir / f"{name}.json").exists()
+        }
+        if not figures:
+            tables_dir = artifacts_dir / "tables"
+            if (tables_dir / "correlation_matrix.parquet").exists():
+                corr_matrix = pd.read_parquet(tables_dir / "correlation_matrix.parquet")
+            else:
+                corr_matrix = pd.read_csv(tables_dir / "correlation_matrix.csv", index_col=0)
+            figures = {"correlation": self._correlation_figure(corr_matrix).to_json()}
+
+        self._create_dashboard(analysis_results, figures)
+
+    def analyze_difficulty_patterns_streaming(self, chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        """
+        Analyse en flux, pour un historique de niveaux plus grand que la mémoire : mêmes
+        résultats que analyze_difficulty_patterns, calculés bloc par bloc avec des
+        accumulateurs fusionnables (sans tableau de bord, qui exige toutes les lignes).
+
+        Args:
+            chunks : Blocs du dataset (DatasetBuilder.iter_dataset, pd.read_csv(chunksize=...))
+        Bornes d'erreur : voir StreamingAggregator (quantiles à quantile_alpha près en
+        relatif, le reste exact aux arrondis flottants près).
+        """
+        try:
+            aggregator = self.streaming_aggregator()
+            for chunk in chunks:
+                aggregator.update(chunk)
+            logging.info(f"Analyse en flux terminée ({aggregator.count} niveaux)")
+            return self._build_results(aggregator.aggregates())
+
+        except Exception as e:
+            logging.error(f"L'analyse en flux a échoué: {str(e)}")
+            raise
+
+    def streaming_aggregator(self) -> StreamingAggregator:
+        """Accumulateurs vides pour l'analyse en flux (fusionnables entre processus)."""
+        return StreamingAggregator(
+            self.mean_columns,
+            self.correlation_columns,
+            self.group_columns,
+            quantile_levels=self.quantile_levels,
+            quantile_alpha=self.quantile_alpha
+        )
+
+    def _sections(self) -> Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]]:
+        """Sections des résultats et fonction qui calcule chacune à partir des agrégats."""
         return {
-            "mean_difficulty": df["difficulty_score"].mean(),
-            "median_difficulty": df["difficulty_score"].median(),
+            "difficulty_distribution": self._analyze_difficulty_distribution,
+            "performance_metrics": self._calculate_performance_metrics,
+            "player_patterns": self._analyze_player_patterns,
+            "correlations": self._analyze_correlations
+        }
+
+    def _build_results(self, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        return {section: compute(aggregates) for section, compute in self._sections().items()}
+
+    def _compute_output(self, name: str, df: pd.DataFrame, aggregates: Dict[str, Any]) -> Any:
+        """Calcule une section des résultats, les tables ou les figures (JSON) à partir des agrégats."""
+        if name == "tables":
+            return self._build_tables(aggregates)
+        if name == "figures":
+            return {figure: fig.to_json() for figure, fig in self._build_figures(df, aggregates).items()}
+        return self._sections()[name](aggregates)
+
+    def _build_tables(self, aggregates: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+        """Tables colonnaires publiées avec les résultats."""
+        by_difficulty = aggregates["difficulty_means"].add_prefix("mean_")
+        by_difficulty.insert(0, "levels", aggregates["difficulty_counts"])
+        by_difficulty.index = by_difficulty.index.astype(str)
+        return {
+            "by_difficulty": by_difficulty,
+            "correlation_matrix": aggregates["correlation_matrix"].copy()
+        }
+
+    def _content_hash(self, df: pd.DataFrame) -> str:
+        """
+        Hash des seules colonnes utilisées par l'analyse : clé de contenu unique du cache,
+        quelle que soit la provenance du dataset.
+        """
+        columns = ["difficulty", "clears"] + self.correlation_columns + self.mean_columns + self.group_columns
+        return DatasetCatalog.content_hash(df[list(dict.fromkeys(columns))])
+
+    def _cache_config(self, section: str) -> Dict[str, Any]:
+        """Paramètres de l'analyseur dont dépend une section."""
+        return {name: getattr(self, name) for name in self.section_parameters[section]}
+
+    def _cache_key(self, content_hash: str, section: str) -> str:
+        return ResultCache.make_key(content_hash, section, self.section_versions[section], self._cache_config(section))
+
+    def _cache_get(self, content_hash: str, section: str) -> Optional[Any]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key(content_hash, section))
+
+    @staticmethod
+    def _write_json(path: Path, payload: Dict[str, Any]):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2, default=lambda value: value.item() if hasattr(value, "item") else str(value))
+        os.replace(tmp_path, path)
+
+    def _cache_put(self, content_hash: str, section: str, value: Any):
+        if self.cache is not None:
+            self.cache.put(self._cache_key(content_hash, section), value, section, content_hash)
+
+    def _aggregate(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Plan d'agrégation unique : moyennes, quantiles et corrélations en un appel
+        chacun, et un seul groupby par difficulté pour les effectifs et moyennes.
+        """
+        means = df[self.mean_columns].mean()
+        quantiles = df[["difficulty_score", "attempts"]].quantile(self.quantile_levels)
+
+        by_difficulty = df.groupby("difficulty", observed=False)[self.group_columns].agg(["size", "mean"])
+        counts = by_difficulty[(self.group_columns[0], "size")]
+
+        return {
+            "count": len(df),
+            "means": means,
             "difficulty_std": df["difficulty_score"].std(),
-            "difficulty_percentiles": df["difficulty_score"].quantile([0.25, 0.5, 0.75]).to_dict(),
-            "difficulty_distribution": df["difficulty"].value_counts().to_dict()
+            "quantiles": quantiles,
+            "correlation_matrix": self._correlation_matrix(df),
+            "difficulty_counts": counts.sort_values(ascending=False, kind="stable"),
+            "difficulty_means": by_difficulty.xs("mean", axis=1, level=1),
+            "attempts_vs_clears_ratio": (df["attempts"] / df["clears"]).mean()
+        }
+    
+    def _correlation_matrix(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Matrice de corrélation en un produit matriciel (pandas en cas de valeurs manquantes)."""
+        values = df[self.correlation_columns].to_numpy(dtype=np.float64)
+        if np.isnan(values).any():
+            return df[self.correlation_columns].corr()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.corrcoef(values, rowvar=False)
+        return pd.DataFrame(matrix, index=self.correlation_columns, columns=self.correlation_columns)
+    
+    def _analyze_difficulty_distribution(self, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        quantiles = aggregates["quantiles"]["difficulty_score"]
+        return {
+            "mean_difficulty": aggregates["means"]["difficulty_score"],
+            "median_difficulty": quantiles[0.5],
+            "difficulty_std": aggregates["difficulty_std"],
+            "difficulty_percentiles": quantiles.to_dict(),
+            "difficulty_distribution": aggregates["difficulty_counts"].to_dict()
         }
     
-    def _calculate_performance_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_performance_metrics(self, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        means = aggregates["means"]
         return {
-            "average_clear_rate": df["clear_rate"].mean(),
-            "median_attempts": df["attempts"].median(),
-            "total_levels": len(df),
-            "difficulty_correlation": df["clear_rate"].corr(df["difficulty_score"]),
-            "average_completion_rate": df["completion_rate"].mean(),
-            "average_engagement_score": df["engagement_score"].mean()
+            "average_clear_rate": means["clear_rate"],
+            "median_attempts": aggregates["quantiles"]["attempts"][0.5],
+            "total_levels": aggregates["count"],
+            "difficulty_correlation": aggregates["correlation_matrix"].loc["clear_rate", "difficulty_score"],
+            "average_completion_rate": means["completion_rate"],
+            "average_engagement_score": means["engagement_score"]
         }
     
-    def _analyze_player_patterns(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_player_patterns(self, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        group_means = aggregates["difficulty_means"]
         return {
-            "likes_vs_difficulty": df["likes"].corr(df["difficulty_score"]),
-            "attempts_vs_clears_ratio": (df["attempts"] / df["clears"]).mean(),
+            "likes_vs_difficulty": aggregates["correlation_matrix"].loc["likes", "difficulty_score"],
+            "attempts_vs_clears_ratio": aggregates["attempts_vs_clears_ratio"],
             "popularity_metrics": {
-                "most_liked_difficulty": df.groupby("difficulty")["likes"].mean().idxmax(),
-                "most_attempted_difficulty": df.groupby("difficulty")["attempts"].mean().idxmax(),
-                "most_engaging_difficulty": df.groupby("difficulty")["engagement_score"].mean().idxmax()
+                "most_liked_difficulty": group_means["likes"].idxmax(),
+                "most_attempted_difficulty": group_means["attempts"].idxmax(),
+                "most_engaging_difficulty": group_means["engagement_score"].idxmax()
             }
         }
     
-    def _analyze_correlations(self, df: pd.DataFrame) -> Dict[str, float]:
-        metrics = ["difficulty_score", "popularity_score", "engagement_score", "completion_rate"]
-        corr_matrix = df[metrics].corr()
+    def _analyze_correlations(self, aggregates: Dict[str, Any]) -> Dict[str, float]:
+        metrics = self.correlation_metrics
+        corr_matrix = aggregates["correlation_matrix"].loc[metrics, metrics]
         
         correlations = {}
         for i in range(len(metrics)):
@@ -96,36 +536,47 @@ class DataAnalyzer:
         
         return correlations
     
-    def _create_dashboard(self, df: pd.DataFrame, analysis_results: Dict[str, Any]):
-        """Création et lancement d'un tableau de bord interactif avec Plotly/Dash"""
-        
-        # Create figures
-        fig_difficulty_dist = px.histogram(
+    def _build_figures(self, df: pd.DataFrame, aggregates: Dict[str, Any]) -> Dict[str, go.Figure]:
+        """Construit les figures du tableau de bord (bornées en taille sur les grands datasets)."""
+        fig_difficulty_dist = large_charts.histogram(
             df, 
             x="difficulty_score",
             color="difficulty",
             title="Distribution des notes de difficulté"
         )
         
-        fig_correlation = px.imshow(
-            df[["difficulty_score", "popularity_score", "engagement_score", "completion_rate"]].corr(),
-            title="Carte thermique des corrélations"
-        )
+        fig_correlation = self._correlation_figure(aggregates["correlation_matrix"])
         
-        fig_metrics = px.box(
+        fig_metrics = large_charts.box(
             df,
             x="difficulty",
             y=["clear_rate", "completion_rate", "engagement_score"],
             title="Mesures par niveau de difficulté"
         )
         
-        fig_engagement = px.scatter(
+        fig_engagement = large_charts.scatter(
             df,
             x="difficulty_score",
             y="engagement_score",
             color="difficulty",
             title="Score d'engagement par rapport à la difficulté"
         )
+
+        return {
+            "difficulty_distribution": fig_difficulty_dist,
+            "correlation": fig_correlation,
+            "metrics": fig_metrics,
+            "engagement": fig_engagement
+        }
+    
+    def _correlation_figure(self, corr_matrix: pd.DataFrame) -> go.Figure:
+        return px.imshow(
+            corr_matrix.loc[self.correlation_metrics, self.correlation_metrics],
+            title="Carte thermique des corrélations"
+        )
+    
+    def _create_dashboard(self, analysis_results: Dict[str, Any], figures: Dict[str, str]):
+        """Création et lancement d'un tableau de bord interactif avec Plotly/Dash"""
         
         # Create dashboard layout
         self.app.layout = html.Div([
@@ -141,17 +592,15 @@ class DataAnalyzer:
             ]),
             
             html.Div([
-                dcc.Graph(figure=fig_difficulty_dist),
-                dcc.Graph(figure=fig_correlation),
-                dcc.Graph(figure=fig_metrics),
-                dcc.Graph(figure=fig_engagement)
+                dcc.Graph(figure=json.loads(figure_json)) for figure_json in figures.values()
             ])
         ])
         
         # Open browser and run dashboard
         Timer(1, lambda: webbrowser.open('http://127.0.0.1:8050/')).start()
-        self.app.run_server(debug=False)
+        self.app.run(debug=False)
 
 if __name__ == "__main__":
+    # Sert le tableau de bord de la dernière analyse (python -m src.analysis)
     analyzer = DataAnalyzer()
-    # Test with sample data if needed
\ No newline at end of file
+    analyzer.serve_dashboard()
\ No newline at end of file
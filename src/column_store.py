@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnStore:
+    """
+    Colonnes numériques d'un dataset stockées en tableaux projetables en mémoire.
+
+    Organisation du répertoire dataset_<ts>.columns/ :
+        schema.json     nombre de lignes, type et fichier de chaque colonne
+        <colonne>.npy   un tableau NumPy par colonne
+
+    open() projette les fichiers en lecture seule (np.memmap) : le démarrage ne lit
+    rien sur disque et plusieurs processus partagent la même copie en cache système.
+    """
+
+    numeric_columns = [
+        "clear_rate", "attempts", "clears", "likes",
+        "difficulty_score", "popularity_score", "engagement_score", "completion_rate"
+    ]
+
+    def __init__(self, path: Path, schema: Dict):
+        self.path = Path(path)
+        self.schema = schema
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def path_for(dataset_path: Union[str, Path]) -> Path:
+        """Répertoire des colonnes associé à un fichier de dataset."""
+        dataset_path = Path(dataset_path)
+        return dataset_path.with_name(f"{dataset_path.name.split('.')[0]}.columns")
+
+    @classmethod
+    def write(cls, df: pd.DataFrame, path: Union[str, Path], columns: Optional[Sequence[str]] = None) -> Path:
+        """
+        Écrit les colonnes numériques de df dans path.
+        Args:
+            df : Dataset
+            path : Répertoire de destination (remplacé s'il existe)
+            columns : Colonnes à écrire (numeric_columns par défaut, absentes ignorées)
+        Returns:
+            Le répertoire écrit
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir(parents=True)
+
+        schema = {"row_count": int(len(df)), "columns": {}}
+        for col in columns or cls.numeric_columns:
+            if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+                continue
+            values = np.ascontiguousarray(df[col].to_numpy())
+            np.save(tmp_path / f"{col}.npy", values, allow_pickle=False)
+            schema["columns"][col] = {"dtype": values.dtype.str, "file": f"{col}.npy"}
+
+        with open(tmp_path / "schema.json", "w") as f:
+            json.dump(schema, f, indent=2)
+
+        # Remplacement en une étape pour ne jamais exposer un répertoire incomplet
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "ColumnStore":
+        """Ouvre un répertoire de colonnes ; les tableaux sont projetés à la demande."""
+        path = Path(path)
+        with open(path / "schema.json", "r") as f:
+            return cls(path, json.load(f))
+
+    def __len__(self) -> int:
+        return self.schema["row_count"]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.schema["columns"])
+
+    def column(self, name: str) -> np.ndarray:
+        """Colonne projetée en lecture seule (aucune lecture avant le premier accès aux valeurs)."""
+        if name not in self._columns:
+            info = self.schema["columns"][name]
+            self._columns[name] = np.load(self.path / info["file"], mmap_mode="r", allow_pickle=False)
+        return self._columns[name]
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """DataFrame dont les colonnes référencent les tableaux projetés, sans copie."""
+        return pd.DataFrame({name: self.column(name) for name in columns or self.columns}, copy=False)
@@ -1,7 +1,9 @@
 import requests
+import io
 import json
+import re
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterator
 import logging
 from pathlib import Path
 import git
@@ -9,6 +11,11 @@ import os
 import uuid
 import pandas as pd  # Ajouté pour traiter les fichiers CSV ou JSON
 import numpy as np
+from src.snapshot_store import SnapshotStore
+from src.level_batch import LevelBatch
+
+# En-tête de hunk d'un diff unifié : @@ -début[,nombre] +début[,nombre] @@
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
 
 class DataCollector:
     def __init__(self):
@@ -16,6 +23,10 @@ class DataCollector:
         self.local_repo_path = Path("data/PED")
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)
+        self.levels_file = Path("data") / "game_levels.csv"  # Chemin relatif au dépôt PED
+        self.state_path = self.data_dir / "collector_state.json"
+        self.chunk_size = 10_000  # Nombre de lignes lues par bloc dans game_levels.csv
+        self.snapshot_store = SnapshotStore(self.data_dir / "snapshots")
         self._setup_logging()
     
     def _setup_logging(self):
@@ -28,14 +39,25 @@ class DataCollector:
             ]
         )
     
-    def collect_game_data(self, limit: int = 100) -> Dict[str, List[Dict[str, Any]]]:
+    def collect_game_data(self, limit: Optional[int] = 100, incremental: bool = False, compact: bool = False) -> Dict[str, List[Dict[str, Any]]]:
         """
         Collecte les données de jeu depuis le dépôt GitHub PED.
         Args:
-            limit: Nombre maximum d'entrées à collecter
+            limit: Nombre maximum d'entrées à collecter (None pour tout le fichier) ;
+                doit valoir None en mode incrémental
+            incremental: Si True, ne collecte que les lignes ajoutées ou modifiées
+                depuis le dernier commit traité (voir _collect_incremental)
+            compact: Si True, 'levels' est un LevelBatch construit bloc par bloc
+                au lieu d'une liste de dictionnaires (dans les deux modes)
         Returns:
             Dictionnaire contenant les données collectées avec la clé 'levels'
         """
+        if incremental:
+            if limit is not None:
+                # Le commit est enregistré comme traité : un delta tronqué perdrait des lignes
+                raise ValueError("La collecte incrémentale ne peut pas être limitée : passer limit=None.")
+            return self._collect_incremental(compact)
+
         try:
             logging.info(f"Clonage du dépôt depuis {self.repo_url}...")
 
@@ -43,10 +65,14 @@ class DataCollector:
             self._setup_repository()
 
             # Charger les données depuis le dépôt cloné
-            levels_data = self._load_data_from_repo(limit)
+            if compact:
+                levels_data = LevelBatch.concat([LevelBatch.from_frame(chunk) for chunk in self._iter_chunks(limit)])
+                logging.info(f"{len(levels_data)} niveaux collectés en lot compact ({levels_data.nbytes / 1e6:.2f} Mo)")
+            else:
+                levels_data = self._load_data_from_repo(limit)
             
             # Sauvegarder les données brutes
-            collected_data = {"levels": levels_data}
+            collected_data = {"levels": levels_data, "source_commit": self._current_commit()}
             self._save_raw_data(collected_data)
             
             return collected_data
@@ -65,30 +91,188 @@ class DataCollector:
             repo.remotes.origin.pull()  # Mettre à jour le dépôt
             logging.info("Dépôt mis à jour avec succès")
     
-    def _load_data_from_repo(self, limit: int) -> List[Dict[str, Any]]:
+    def _collect_incremental(self, compact: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Collecte incrémentale pilotée par les commits du dépôt PED.
+
+        Si le HEAD distant n'a pas bougé depuis le dernier commit traité, retourne
+        immédiatement sans pull ni lecture du CSV. Sinon, seules les lignes ajoutées
+        ou modifiées dans game_levels.csv depuis ce commit sont analysées.
+        Args:
+            compact: Si True, 'levels' est un LevelBatch, comme pour une collecte complète
+        """
+        try:
+            last_commit = self._load_state().get("last_commit")
+
+            if last_commit and self.local_repo_path.exists():
+                remote_head = self._get_remote_head()
+                if remote_head == last_commit:
+                    logging.info(f"Aucun nouveau commit depuis {last_commit[:8]}, collecte ignorée")
+                    return {"levels": self._no_levels(compact)}
+
+            self._setup_repository()
+            repo = git.Repo(self.local_repo_path)
+            head_commit = repo.head.commit.hexsha
+
+            if last_commit == head_commit:
+                logging.info(f"Aucun nouveau commit depuis {last_commit[:8]}, collecte ignorée")
+                return {"levels": self._no_levels(compact)}
+
+            if last_commit:
+                changed = self._load_changed_rows(repo, last_commit, head_commit)
+            else:
+                changed = pd.concat(list(self._iter_chunks()) or [pd.DataFrame()], ignore_index=True)
+            levels_data = LevelBatch.from_frame(changed) if compact else changed.to_dict(orient="records")
+
+            collected_data = {"levels": levels_data, "source_commit": head_commit}
+            if levels_data:
+                self._save_raw_data(collected_data)
+
+            self._save_state({"last_commit": head_commit})
+            logging.info(f"{len(levels_data)} niveaux collectés jusqu'au commit {head_commit[:8]}")
+            return collected_data
+
+        except Exception as e:
+            logging.error(f"Échec de la collecte incrémentale des données : {str(e)}")
+            return {"levels": self._no_levels(compact)}
+
+    @staticmethod
+    def _no_levels(compact: bool):
+        """Aucun niveau, dans le type demandé (liste ou LevelBatch)."""
+        return LevelBatch.from_frame(pd.DataFrame()) if compact else []
+
+    def _current_commit(self) -> Optional[str]:
+        """Commit courant du dépôt local, ou None s'il est illisible."""
+        try:
+            return git.Repo(self.local_repo_path).head.commit.hexsha
+        except Exception:
+            return None
+
+    def _get_remote_head(self) -> str:
+        """Retourne le hash du HEAD distant via ls-remote, sans télécharger d'objets."""
+        repo = git.Repo(self.local_repo_path)
+        output = repo.git.ls_remote("origin", "HEAD")
+        return output.split()[0] if output else ""
+
+    def _load_changed_rows(self, repo: "git.Repo", old_commit: str, new_commit: str) -> pd.DataFrame:
+        """
+        Analyse uniquement les enregistrements ajoutés ou modifiés de game_levels.csv
+        entre deux commits.
+
+        Le contenu du diff n'est pas interprété : seuls les en-têtes de hunk (@@) donnent
+        les numéros des lignes ajoutées dans la nouvelle version du fichier. Chaque ligne
+        est étendue à l'enregistrement CSV complet qui la contient (un champ entre
+        guillemets peut contenir des retours à la ligne), puis ces enregistrements sont
+        analysés avec l'en-tête du fichier.
+        """
+        file_path = self.local_repo_path / self.levels_file
+        if not file_path.exists():
+            logging.warning(f"Le fichier {file_path} n'a pas été trouvé dans le dépôt.")
+            return pd.DataFrame()
+
+        try:
+            diff = repo.git.diff(old_commit, new_commit, "--unified=0", "--", self.levels_file.as_posix())
+        except git.GitCommandError as e:
+            # Commit inconnu (historique réécrit, clone supprimé...) : rechargement complet
+            logging.warning(f"Diff impossible depuis {old_commit[:8]} ({str(e)}), rechargement complet")
+            return pd.concat(list(self._iter_chunks()) or [pd.DataFrame()], ignore_index=True)
+
+        added = self._added_line_numbers(diff)
+        if not added:
+            return pd.DataFrame()
+
+        header, records = None, []
+        position, last_added = 0, added[-1]
+        with open(file_path, "r", newline="") as f:
+            record, start, in_quotes = [], 1, False
+            for number, line in enumerate(f, start=1):
+                if number > last_added and not in_quotes:
+                    break
+                record.append(line)
+                # Un nombre impair de guillemets ouvre ou ferme un champ entre guillemets
+                in_quotes ^= line.count('"') % 2 == 1
+                if in_quotes:
+                    continue
+                if header is None:
+                    header = "".join(record)
+                else:
+                    while position < len(added) and added[position] < start:
+                        position += 1
+                    if position < len(added) and added[position] <= number:
+                        records.append("".join(record))
+                record, start = [], number + 1
+
+        if not records:
+            return pd.DataFrame()
+        return pd.read_csv(io.StringIO(header + "".join(records)))
+
+    @staticmethod
+    def _added_line_numbers(diff: str) -> List[int]:
+        """Numéros (croissants, à partir de 1) des lignes ajoutées, lus dans les en-têtes de hunk."""
+        numbers = []
+        for match in HUNK_HEADER.finditer(diff):
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            numbers.extend(range(start, start + count))
+        return numbers
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Charge l'état de la dernière collecte incrémentale."""
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, "r") as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict[str, Any]):
+        """Enregistre l'état de la collecte incrémentale."""
+        state = {**state, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with open(self.state_path, "w") as f:
+            json.dump(state, f, indent=2)
+
+    def iter_level_batches(self, limit: Optional[int] = None, chunk_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lit game_levels.csv par blocs bornés et produit les niveaux par lots.
+        Args:
+            limit: Nombre maximum d'entrées à lire (None pour tout le fichier)
+            chunk_size: Nombre de lignes par lot (self.chunk_size par défaut)
+        Returns:
+            Itérateur de listes de niveaux ; la lecture s'arrête dès que limit est atteint
+        """
+        for chunk in self._iter_chunks(limit, chunk_size):
+            yield chunk.to_dict(orient="records")
+
+    def _iter_chunks(self, limit: Optional[int] = None, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Lit game_levels.csv par blocs de DataFrame, en s'arrêtant à limit lignes."""
+        file_path = self.local_repo_path / self.levels_file
+
+        if not file_path.exists():
+            logging.warning(f"Le fichier {file_path} n'a pas été trouvé dans le dépôt.")
+            return
+
+        chunk_size = chunk_size or self.chunk_size
+        if limit is not None:
+            if limit <= 0:
+                return
+            chunk_size = min(chunk_size, limit)
+
+        # nrows arrête l'analyse du fichier dès que la limite est atteinte
+        with pd.read_csv(file_path, chunksize=chunk_size, nrows=limit) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def _load_data_from_repo(self, limit: Optional[int]) -> List[Dict[str, Any]]:
         """Charge les données depuis les fichiers dans le dépôt cloné."""
         levels_data = []
-        
-        # Exemple de chemin vers un fichier CSV ou JSON dans le dépôt
-        file_path = self.local_repo_path / "data" / "game_levels.csv"
-        
-        if file_path.exists():
-            # Si le fichier est CSV
-            df = pd.read_csv(file_path)
-            levels_data = df.head(limit).to_dict(orient="records")  # Limite le nombre d'entrées
-            
-        else:
-            logging.warning(f"Le fichier {file_path} n'a pas été trouvé dans le dépôt.")
-        
+        for batch in self.iter_level_batches(limit):
+            levels_data.extend(batch)
         return levels_data
     
     def _save_raw_data(self, data: Dict[str, List[Dict[str, Any]]]):
-        """Sauvegarde les données brutes dans un fichier JSON"""
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        filepath = self.data_dir / f"raw_data_{timestamp}.json"
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-        logging.info(f"Données brutes sauvegardées dans {filepath}")
+        """Sauvegarde les données brutes dans le stockage de snapshots adressé par contenu"""
+        if isinstance(data.get("levels"), LevelBatch):
+            data = {**data, "levels": data["levels"].to_records()}
+        snapshot_id = self.snapshot_store.save(data)
+        logging.info(f"Données brutes sauvegardées dans le snapshot {snapshot_id[:12]}")
 
 if __name__ == "__main__":
     collector = DataCollector()
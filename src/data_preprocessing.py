@@ -1,11 +1,96 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union, Optional, Sequence, Tuple, Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
 import logging
+import os
+from src.level_batch import LevelBatch
+
+
+def _attach_shared(name: str) -> shared_memory.SharedMemory:
+    """
+    Ouvre un segment créé par le processus parent sans l'inscrire auprès du
+    resource_tracker : seul le parent le possède et le supprime (unlink). Inscrit par
+    un worker, le segment serait signalé comme fuite, voire détruit, par un tracker
+    propre au worker ; le désinscrire ensuite retirerait l'inscription du parent
+    quand le tracker est partagé.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _coerce_shared_chunk(args: Tuple[int, int, List[Tuple[str, str, str, str, str, int]]]) -> None:
+    """
+    Convertit un bloc de colonnes numériques dans un processus du pool.
+
+    Entrées et sorties sont des segments de mémoire partagée créés par le processus
+    parent : rien n'est sérialisé hormis leurs noms. Pour chaque colonne, la valeur
+    convertie (float64) et le statut (0 valide, 1 manquant, 2 invalide) sont écrits
+    directement dans les segments de sortie.
+    """
+    start, stop, columns = args
+    for kind, input_name, input_dtype, output_name, status_name, length in columns:
+        segments = [_attach_shared(name) for name in (input_name, output_name, status_name)]
+        try:
+            source = np.ndarray((length,), dtype=np.dtype(input_dtype), buffer=segments[0].buf)[start:stop]
+            output = np.ndarray((length,), dtype=np.float64, buffer=segments[1].buf)[start:stop]
+            status = np.ndarray((length,), dtype=np.uint8, buffer=segments[2].buf)[start:stop]
+
+            np.copyto(output, source, casting="unsafe")
+            is_missing = np.isnan(output)
+            status[:] = is_missing
+            if kind == "int":
+                # Mêmes règles que DataPreprocessor._coerce_int : troncature, infinis invalides
+                np.trunc(output, out=output)
+                is_invalid = np.isinf(output)
+                output[is_invalid] = np.nan
+                status[is_invalid] = 2
+            del source, output, status
+        finally:
+            for segment in segments:
+                segment.close()
+
 
 class DataPreprocessor:
-    def __init__(self):
+    def __init__(self, n_workers: Optional[int] = 1, chunk_size: int = 500_000, parallel_min_rows: int = 5_000_000):
+        """
+        Args:
+            n_workers : Nombre de processus pour process_frame (None = nombre de cœurs, 1 = série)
+            chunk_size : Nombre de niveaux par bloc en mode parallèle
+            parallel_min_rows : En dessous de ce nombre de niveaux, le traitement reste
+                en série (démarrage du pool et copies en mémoire partagée non amortis)
+
+        Le mode parallèle est optionnel (n_workers=1 par défaut, comme dans main.py) :
+        seule la conversion des colonnes numériques est répartie entre les processus,
+        la validation et l'assemblage du résultat restent dans le processus parent.
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_min_rows = parallel_min_rows
         self.valid_difficulties = ["easy", "normal", "hard", "expert"]
+        self.required_fields = [
+            "level_id", "title", "maker", "difficulty", "clear_rate", 
+            "attempts", "clears", "likes", "tags", "completion_rate",
+            "difficulty_score", "popularity_score", "engagement_score"
+        ]
+        self.float_fields = [
+            "clear_rate", "completion_rate", "difficulty_score",
+            "popularity_score", "engagement_score"
+        ]
+        self.int_fields = ["attempts", "clears", "likes"]
+        self.text_fields = ["difficulty"]
+        # Champs non convertis : seule leur présence est exigée, une valeur manquante devient vide
+        self.empty_values = {"title": "", "tags": []}
+        self.report_sample_size = 10  # Nombre de level_id rejetés cités dans le rapport
+        self._validation_plan = self._compile_validation_plan()
         self._setup_logging()
     
     def _setup_logging(self):
@@ -22,49 +107,256 @@ class DataPreprocessor:
         """
          Nettoie et traite les données brutes du jeu.
         Args:
-            raw_data : Dictionnaire contenant les données de niveau brut
+            raw_data : Dictionnaire contenant les données de niveau brut. 'levels' peut être
+                une liste de dictionnaires, un LevelBatch, un DataFrame ou un dictionnaire
+                de colonnes ; un LevelBatch est rendu en LevelBatch, les deux derniers
+                en DataFrame
         Returns:
-            Dictionnaire contenant les données nettoyées et enrichies
+            Dictionnaire contenant les données nettoyées ('levels'), le rapport de
+            validation ('validation', voir validate_batch) et le commit source
         """
         try:
-            cleaned_data = []
-            
-            for level in raw_data.get("levels", []):
-                if self._validate_level_data(level):
-                    cleaned_level = self._process_level(level)
-                    cleaned_data.append(cleaned_level)
-            
-            return {"levels": cleaned_data}
+            levels = raw_data.get("levels", [])
+            if isinstance(levels, list):
+                cleaned, report = self.validate_batch(pd.DataFrame.from_records(levels))
+                cleaned = cleaned.to_dict(orient="records")
+            elif isinstance(levels, LevelBatch):
+                # Validation sans matérialiser les tags ; le masque est appliqué au lot,
+                # dont les tags restent encodés
+                cleaned, report, valid = self._validate(levels.to_frame(include_tags=False), skip_fields=["tags"])
+                cleaned = levels.take(valid).with_columns(cleaned)
+            else:
+                cleaned, report = self.validate_batch(levels)
+
+            # Le commit source suit les données jusqu'au catalogue des datasets
+            return {"levels": cleaned, "validation": report, "source_commit": raw_data.get("source_commit")}
             
         except Exception as e:
             logging.error(f"Échec de la structuration du jeu de données: {str(e)}")
             raise Exception(f"Échec de la structuration du jeu de données: {str(e)}")
     
-    def _validate_level_data(self, level: Dict[str, Any]) -> bool:
-        """Validates level data"""
-        required_fields = [
-            "level_id", "title", "maker", "difficulty", "clear_rate", 
-            "attempts", "clears", "likes", "tags", "completion_rate",
-            "difficulty_score", "popularity_score", "engagement_score"
-        ]
-        return all(key in level for key in required_fields)
-    
-    def _process_level(self, level: Dict[str, Any]) -> Dict[str, Any]:
-        """Traite un seul niveau, en s'assurant que tous les champs obligatoires sont présents et valides."""
-        processed = {
-            "level_id": level["level_id"],
-            "title": level["title"],
-            "maker": level["maker"],
-            "difficulty": level["difficulty"].lower(),
-            "clear_rate": float(level["clear_rate"]),
-            "attempts": int(level["attempts"]),
-            "clears": int(level["clears"]),
-            "likes": int(level["likes"]),
-            "tags": level["tags"],
-            "completion_rate": float(level["completion_rate"]),
-            "difficulty_score": float(level["difficulty_score"]),
-            "popularity_score": float(level["popularity_score"]),
-            "engagement_score": float(level["engagement_score"])
+    def process_frame(self, levels: Union[pd.DataFrame, Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Nettoie un lot de niveaux en colonnes, sans boucle par niveau.
+        Args:
+            levels : DataFrame ou dictionnaire colonne -> tableau
+        Returns:
+            DataFrame des niveaux valides, colonnes dans l'ordre de required_fields
+        """
+        return self.validate_batch(levels)[0]
+
+    def validate_batch(self, levels: Union[pd.DataFrame, Dict[str, Any]]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Valide et nettoie tout un lot en une passe, sans try/except par niveau.
+        Args:
+            levels : DataFrame ou dictionnaire colonne -> tableau
+        Returns:
+            (niveaux valides, rapport) où le rapport contient total_levels, valid_levels,
+            rejected_levels, les compteurs 'missing' (champ absent, ou valeur nulle d'un
+            champ converti) et 'invalid' (valeur non convertible) par champ, et
+            sample_rejected_ids
+        """
+        df = levels if isinstance(levels, pd.DataFrame) else pd.DataFrame(levels, copy=False)
+        cleaned, report, _ = self._validate(df)
+        return cleaned, report
+
+    def _validate(self, df: pd.DataFrame, skip_fields: Sequence[str] = ()) -> Tuple[pd.DataFrame, Dict[str, Any], np.ndarray]:
+        """
+        Valide un DataFrame en série ou en parallèle.
+        Args:
+            df : Niveaux à valider
+            skip_fields : Champs obligatoires stockés hors du DataFrame (tags d'un LevelBatch)
+        Returns:
+            (niveaux valides, rapport, masque des niveaux valides)
+        """
+        if self.n_workers > 1 and len(df) >= max(self.parallel_min_rows, 2 * self.chunk_size):
+            cleaned, report, valid = self._process_frame_parallel(df, skip_fields)
+        else:
+            cleaned, report, valid = self._validate_frame(df, skip_fields)
+
+        self._log_report(report)
+        return cleaned, report, valid
+
+    def _compile_validation_plan(self) -> List[Tuple[str, Callable[[pd.Series], pd.Series]]]:
+        """Associe une fois pour toutes chaque champ obligatoire à sa fonction de conversion."""
+        plan = []
+        for field in self.required_fields:
+            if field in self.float_fields:
+                plan.append((field, self._coerce_float))
+            elif field in self.int_fields:
+                plan.append((field, self._coerce_int))
+            elif field in self.text_fields:
+                plan.append((field, self._coerce_text))
+            else:
+                plan.append((field, None))
+        return plan
+
+    @staticmethod
+    def _coerce_float(values: pd.Series) -> pd.Series:
+        return pd.to_numeric(values, errors="coerce").astype("float64")
+
+    @staticmethod
+    def _coerce_int(values: pd.Series) -> pd.Series:
+        # int() tronque ; les infinis ne sont pas des entiers valides
+        values = np.trunc(pd.to_numeric(values, errors="coerce").astype("float64"))
+        return values.where(np.isfinite(values))
+
+    @staticmethod
+    def _coerce_text(values: pd.Series) -> pd.Series:
+        # Les valeurs non textuelles deviennent NaN
+        if not len(values):
+            return values
+        try:
+            return values.str.lower()
+        except AttributeError:
+            # Colonne entièrement non textuelle (ex. entiers)
+            return pd.Series(np.nan, index=values.index)
+
+    def _process_frame_parallel(self, df: pd.DataFrame, skip_fields: Sequence[str] = ()) -> Tuple[pd.DataFrame, Dict[str, Any], np.ndarray]:
+        """
+        Convertit les colonnes numériques par blocs sur un pool de processus, puis termine
+        la validation en série ; le résultat est identique à celui du traitement en série.
+
+        Seules les colonnes numériques de largeur fixe passent par la mémoire partagée
+        (copiées une fois, lues et écrites sur place par les processus). Les colonnes
+        textuelles et les tags ne quittent pas le processus parent : ils ne demandent
+        qu'une sélection par le masque final. Une colonne numérique stockée en objets est
+        convertie en série.
+        """
+        shareable = {}
+        for field in self.float_fields + self.int_fields:
+            if field in df.columns and field not in skip_fields:
+                values = self._fixed_width(df[field])
+                if values is not None:
+                    shareable[field] = values
+
+        n = len(df)
+        segments = []
+        outputs = {}
+        try:
+            columns = []
+            for field, values in shareable.items():
+                source = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                output = shared_memory.SharedMemory(create=True, size=max(n * 8, 1))
+                status = shared_memory.SharedMemory(create=True, size=max(n, 1))
+                segments.extend([source, output, status])
+                np.ndarray(values.shape, dtype=values.dtype, buffer=source.buf)[:] = values
+                kind = "int" if field in self.int_fields else "float"
+                columns.append((kind, source.name, values.dtype.str, output.name, status.name, n))
+                outputs[field] = (output, status)
+
+            tasks = [(start, min(start + self.chunk_size, n), columns) for start in range(0, n, self.chunk_size)]
+            logging.info(f"Prétraitement parallèle : {len(tasks)} blocs x {len(columns)} colonnes sur {self.n_workers} processus")
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                list(executor.map(_coerce_shared_chunk, tasks))
+
+            # Résultats recopiés hors des segments avant leur libération
+            converted = {}
+            for field, (output, status) in outputs.items():
+                codes = np.ndarray((n,), dtype=np.uint8, buffer=status.buf)
+                converted[field] = (
+                    pd.Series(np.ndarray((n,), dtype=np.float64, buffer=output.buf).copy(), index=df.index),
+                    codes == 1,
+                    codes == 2
+                )
+                del codes
+
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+
+        return self._validate_frame(df, skip_fields, converted)
+
+    @staticmethod
+    def _fixed_width(values: pd.Series) -> Optional[np.ndarray]:
+        """Tableau numérique de largeur fixe d'une colonne, ou None (objets, chaînes)."""
+        if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+            # Int64, Float64, boolean : valeurs manquantes en NaN
+            if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+                return values.to_numpy(dtype=np.float64, na_value=np.nan)
+            return None
+        array = values.to_numpy()
+        return array if array.dtype.kind in "biuf" else None
+
+    def _validate_frame(
+        self,
+        df: pd.DataFrame,
+        skip_fields: Sequence[str] = (),
+        converted: Optional[Dict[str, Tuple[pd.Series, np.ndarray, np.ndarray]]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any], np.ndarray]:
+        """
+        Coercition des types et filtrage des niveaux invalides, en colonnes.
+        converted : champs déjà convertis (valeurs, manquants, invalides), par exemple
+        par le pool de processus
+        """
+        converted = converted or {}
+        n = len(df)
+        valid = np.ones(n, dtype=bool)
+        columns = {}
+        missing = {}
+        invalid = {}
+
+        for field, coerce in self._validation_plan:
+            if field in skip_fields:
+                continue
+            if field not in df.columns:
+                columns[field] = pd.Series(np.nan, index=df.index)
+                missing[field] = n
+                valid[:] = False
+                continue
+
+            raw = df[field]
+            if coerce is None:
+                # Comme à l'origine, seule la présence du champ est exigée
+                columns[field] = self._fill_empty(field, raw)
+                continue
+
+            if field in converted:
+                values, is_missing, is_invalid = converted[field]
+            else:
+                is_missing = raw.isna().to_numpy()
+                values = coerce(raw)
+                is_invalid = values.isna().to_numpy() & ~is_missing
+
+            missing[field] = int(is_missing.sum())
+            invalid[field] = int(is_invalid.sum())
+            valid &= ~(is_missing | is_invalid)
+            columns[field] = values
+
+        cleaned = pd.DataFrame(columns, index=df.index)[valid].reset_index(drop=True)
+        for field in self.int_fields:
+            cleaned[field] = cleaned[field].astype("int64")
+
+        rejected_ids = df["level_id"][~valid] if "level_id" in df.columns else pd.Series([], dtype=object)
+        report = {
+            "total_levels": n,
+            "valid_levels": int(valid.sum()),
+            "rejected_levels": int(n - valid.sum()),
+            "missing": {field: count for field, count in missing.items() if count},
+            "invalid": {field: count for field, count in invalid.items() if count},
+            "sample_rejected_ids": rejected_ids.dropna().head(self.report_sample_size).tolist()
         }
-        
-        return processed
+        return cleaned, report, valid
+
+    def _fill_empty(self, field: str, values: pd.Series) -> pd.Series:
+        """Remplace les valeurs manquantes d'un champ non converti par sa valeur vide."""
+        if field not in self.empty_values:
+            return values
+        is_missing = values.isna().to_numpy()
+        if not is_missing.any():
+            return values
+        empty = self.empty_values[field]
+        if isinstance(empty, list):
+            # Une liste distincte par niveau
+            return pd.Series([[] if missing else value for value, missing in zip(values, is_missing)], index=values.index, dtype=object)
+        return values.where(~is_missing, empty)
+
+    def _log_report(self, report: Dict[str, Any]):
+        if not report["rejected_levels"]:
+            return
+        logging.warning(
+            f"{report['rejected_levels']} niveaux invalides écartés sur {report['total_levels']} "
+            f"(manquants : {report['missing']}, invalides : {report['invalid']}, "
+            f"exemples : {report['sample_rejected_ids']})"
+        )
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+class DatasetCatalog:
+    """
+    Catalogue des versions de dataset écrites dans data/.
+
+    Un seul fichier (catalog.json) décrit chaque version : fichiers, nombre de lignes,
+    schéma, hash du contenu, commit source et taille. La dernière version et une
+    version donnée se retrouvent par simple lecture du catalogue, sans parcourir le
+    répertoire ni ouvrir les datasets. Un contenu déjà catalogué n'est pas conservé
+    deux fois dans le même format, et une politique de rétention supprime les versions
+    anciennes.
+    """
+
+    metadata_columns = ["timestamp", "data_version"]  # Métadonnées d'exécution, hors contenu
+
+    def __init__(self, data_dir: Path = Path("data"), keep_last: Optional[int] = 20, max_age_days: Optional[float] = None):
+        """
+        Args:
+            data_dir : Répertoire des datasets
+            keep_last : Nombre de versions conservées (None = illimité)
+            max_age_days : Âge maximal d'une version en jours (None = illimité)
+        """
+        self.data_dir = Path(data_dir)
+        self.catalog_path = self.data_dir / "catalog.json"
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+        self._catalog = self._load()
+
+    def register(
+        self,
+        df: pd.DataFrame,
+        files: Sequence[Path],
+        source_commit: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Enregistre une version qui vient d'être écrite.
+        Args:
+            df : Dataset écrit
+            files : Fichiers de la version (le premier est le fichier principal)
+            source_commit : Commit du dépôt PED dont proviennent les données
+        Returns:
+            L'entrée du catalogue ; si le même contenu est déjà catalogué, les fichiers
+            fraîchement écrits sont supprimés et l'entrée existante est retournée
+        """
+        return self.register_entry(
+            files,
+            row_count=len(df),
+            schema={col: str(dtype) for col, dtype in df.dtypes.items()},
+            content_hash=self.content_hash(df),
+            source_commit=source_commit
+        )
+
+    def register_entry(
+        self,
+        files: Sequence[Path],
+        row_count: int,
+        schema: Dict[str, str],
+        content_hash: str,
+        source_commit: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Enregistre une version à partir de métadonnées déjà calculées (builds
+        incrémentaux qui n'ont pas le dataset complet en mémoire).
+        """
+        self._catalog = self._load()  # Un autre processus a pu écrire entre-temps
+        files = [Path(f) for f in files]
+
+        hash_key = self._hash_key(content_hash, files[0])
+        existing_id = self._catalog["by_hash"].get(hash_key)
+        if existing_id is not None and existing_id in self._catalog["versions"]:
+            existing = self._catalog["versions"][existing_id]
+            existing_files = {Path(f) for f in existing["files"]}
+            self._delete_files([f for f in files if f not in existing_files])
+            self._catalog["latest"] = existing_id
+            self._save()
+            logging.info(f"Contenu identique à la version {existing_id} : doublon supprimé")
+            return existing
+
+        version_id = files[0].name.split(".")[0].replace("dataset_", "")
+        entry = {
+            "version": version_id,
+            "path": files[0].as_posix(),
+            "files": [f.as_posix() for f in files],
+            "row_count": int(row_count),
+            "schema": schema,
+            "content_hash": content_hash,
+            "source_commit": source_commit,
+            "size_bytes": sum(self._size(f) for f in files),
+            "created_at": pd.Timestamp.now().isoformat()
+        }
+
+        replaced = self._catalog["versions"].get(version_id)
+        if replaced is not None:
+            # Fichiers réécrits dans la même seconde : l'ancienne entrée n'existe plus sur disque
+            self._catalog["by_hash"].pop(self._hash_key(replaced["content_hash"], replaced["path"]), None)
+
+        self._catalog["versions"][version_id] = entry
+        self._catalog["by_hash"][hash_key] = version_id
+        self._catalog["latest"] = version_id
+        self._save()
+        logging.info(f"Version {version_id} ajoutée au catalogue ({entry['row_count']} lignes)")
+        return entry
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Entrée de la version la plus récente, ou None si le catalogue est vide."""
+        latest_id = self._catalog["latest"]
+        return self._catalog["versions"].get(latest_id) if latest_id else None
+
+    def get(self, version_id: str) -> Optional[Dict[str, Any]]:
+        """Entrée d'une version donnée, ou None si elle n'existe pas."""
+        return self._catalog["versions"].get(version_id)
+
+    def find_by_hash(self, content_hash: str, suffix: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Entrée de la version ayant ce contenu, ou None.
+        Args:
+            suffix : Format du fichier principal (".parquet", ".pkl") ; le plus récent si None
+        """
+        if suffix is not None:
+            version_id = self._catalog["by_hash"].get(f"{content_hash}{suffix}")
+            return self._catalog["versions"].get(version_id) if version_id else None
+        matches = [v for v in self.versions() if v["content_hash"] == content_hash]
+        return matches[-1] if matches else None
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Toutes les versions, de la plus ancienne à la plus récente."""
+        return [self._catalog["versions"][v] for v in sorted(self._catalog["versions"], key=self.version_key)]
+
+    @staticmethod
+    def version_key(version_id: str) -> Tuple[str, int]:
+        """Clé de tri d'une version : horodatage puis suffixe numérique (_2 avant _10)."""
+        parts = version_id.split("_")
+        return "_".join(parts[:2]), int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0
+
+    def apply_retention(self) -> List[str]:
+        """
+        Supprime les versions au-delà de keep_last ou plus anciennes que max_age_days.
+        La dernière version n'est jamais supprimée.
+        Returns:
+            Identifiants des versions supprimées
+        """
+        versions = self.versions()
+        expired = set()
+
+        if self.keep_last is not None and len(versions) > self.keep_last:
+            expired.update(v["version"] for v in versions[:len(versions) - self.keep_last])
+
+        if self.max_age_days is not None:
+            cutoff = pd.Timestamp.now() - pd.Timedelta(days=self.max_age_days)
+            expired.update(v["version"] for v in versions if pd.Timestamp(v["created_at"]) < cutoff)
+
+        expired.discard(self._catalog["latest"])
+
+        for version_id in sorted(expired):
+            entry = self._catalog["versions"].pop(version_id)
+            self._catalog["by_hash"].pop(self._hash_key(entry["content_hash"], entry["path"]), None)
+            self._delete_files([Path(f) for f in entry["files"]])
+
+        if expired:
+            self._save()
+            logging.info(f"Rétention : {len(expired)} versions supprimées")
+        return sorted(expired)
+
+    @classmethod
+    def content_hash(cls, df: pd.DataFrame) -> str:
+        """
+        Hash du contenu (colonnes et valeurs), indépendant du format d'écriture.
+        Les métadonnées d'exécution (timestamp, data_version) ne sont pas hachées.
+        """
+        df = df.drop(columns=[col for col in cls.metadata_columns if col in df.columns])
+        digest = hashlib.sha256(",".join(map(str, df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _hash_key(content_hash: str, path: Path) -> str:
+        """
+        Clé de dédoublonnage : contenu et format du fichier principal. Une version CSV/Pickle
+        n'est jamais remplacée par une version Parquet de même contenu, ni l'inverse.
+        """
+        return f"{content_hash}{Path(path).suffix}"
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.catalog_path.exists():
+            return {"latest": None, "versions": {}, "by_hash": {}}
+        with open(self.catalog_path, "r") as f:
+            return json.load(f)
+
+    def _save(self):
+        self.data_dir.mkdir(exist_ok=True)
+        tmp_path = self.catalog_path.with_name(self.catalog_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._catalog, f, indent=2)
+        os.replace(tmp_path, self.catalog_path)
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        if path.is_dir():
+            return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        return path.stat().st_size if path.exists() else 0
+
+    @staticmethod
+    def _delete_files(paths: Sequence[Path]):
+        for path in paths:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
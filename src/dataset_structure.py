@@ -1,19 +1,68 @@
 import pandas as pd
 import numpy as np
+import hashlib
+import os
+import shutil
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union, Iterator
 import logging
+from src.level_batch import LevelBatch
+from src.tag_index import TagIndex
+from src.olap_cube import LevelCube
+from src.column_store import ColumnStore
+from src.dataset_catalog import DatasetCatalog
+
+try:
+    import pyarrow  # noqa: F401  (moteur Parquet de pandas)
+    import pyarrow.dataset as pa_dataset
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 class DatasetBuilder:
-    def __init__(self):
-        """Initialisation de la classe DatasetBuilder avec la liste des colonnes attendues."""
+    def __init__(
+        self,
+        output_format: str = "parquet",
+        partition_by_difficulty: bool = False,
+        compression: str = "zstd",
+        optimize_dtypes: bool = True,
+        catalog: Optional[DatasetCatalog] = None
+    ):
+        """
+        Initialisation de la classe DatasetBuilder avec la liste des colonnes attendues.
+
+        Args:
+            output_format : "parquet" (colonnaire, typé, compressé) ou "csv" (CSV + Pickle).
+                Sans pyarrow, le format CSV est utilisé.
+            partition_by_difficulty : Écrit un sous-répertoire Parquet par difficulté
+            compression : Codec Parquet (zstd, snappy, gzip...)
+            optimize_dtypes : Réduit l'empreinte mémoire (catégories, entiers et scores
+                réduits, métadonnées stockées une seule fois dans df.attrs)
+            catalog : Catalogue des versions (par défaut data/catalog.json avec sa
+                politique de rétention)
+        """
         self.columns = [
             "level_id", "difficulty", "clear_rate", "attempts", "clears",
             "likes", "title", "maker", "tags", "difficulty_score",
             "popularity_score", "engagement_score", "completion_rate"
         ]
+        self.categorical_columns = ["difficulty", "maker"]
+        self.integer_columns = ["attempts", "clears", "likes"]
+        self.float_columns = [
+            "clear_rate", "difficulty_score", "popularity_score",
+            "engagement_score", "completion_rate"
+        ]
+        self.integer_dtype = np.uint32  # Type fixe des compteurs (schéma identique d'une version à l'autre)
+        self.max_category_ratio = 0.5  # Au-delà de 50 % de valeurs distinctes, pas de catégorie
+        self.optimize_dtypes = optimize_dtypes
+        self.tag_index = None  # Index inversé des tags du dernier dataset construit
+        self.cube = None  # Cube d'agrégats du dernier dataset construit
+        self.output_format = output_format
+        self.partition_by_difficulty = partition_by_difficulty
+        self.compression = compression
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)  # Crée le répertoire 'data' si nécessaire
+        self.catalog = catalog or DatasetCatalog(self.data_dir)
         self._setup_logging()  # Configuration des logs
 
     def _setup_logging(self):
@@ -32,26 +81,26 @@ class DatasetBuilder:
         Structure les données nettoyées dans un DataFrame pandas.
         
         Args:
-            cleaned_data : Dictionnaire contenant les données nettoyées (niveau).
+            cleaned_data : Dictionnaire contenant les données nettoyées (niveau) : liste
+                de dictionnaires, DataFrame ou LevelBatch.
             
         Returns:
             pd.DataFrame : Le DataFrame structuré.
         """
         try:
-            # Conversion des données en DataFrame
-            df = pd.DataFrame(cleaned_data.get("levels", []))
-            
-            # Vérification des colonnes manquantes et ajout avec des valeurs par défaut
-            self._add_missing_columns(df)
+            # Relu partition par partition, un dataset partitionné revient trié par
+            # difficulté : l'index des tags doit suivre cet ordre
+            df = self._structure(cleaned_data, order_by_difficulty=self.partition_by_difficulty)
             
-            # Ajout des métadonnées (timestamp, version)
-            self._add_metadata(df)
-            
-            # Traitement des tags (si présents)
-            self._process_tags(df)
-            
-            # Sauvegarde du dataset
-            self._save_dataset(df)
+            # Sauvegarde du dataset, de son index de tags, des colonnes projetables et du cube
+            dataset_files = self._save_dataset(df)
+            dataset_files.append(self._save_tag_index(dataset_files[0]))
+            dataset_files.append(self._save_columns(df, dataset_files[0]))
+            dataset_files.append(self._save_cube(dataset_files[0]))
+
+            # Enregistrement dans le catalogue (doublons et rétention)
+            self.catalog.register(df, dataset_files, source_commit=cleaned_data.get("source_commit"))
+            self.catalog.apply_retention()
             
             return df
         
@@ -59,6 +108,221 @@ class DatasetBuilder:
             logging.error(f"Échec de la structuration du jeu de données: {str(e)}")
             raise Exception(f"Échec de la structuration du jeu de données: {str(e)}")
 
+    def build_incremental(self, delta_data: Dict[str, List[Dict[str, Any]]], base_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Construit une nouvelle version en appliquant un delta de niveaux nouveaux ou
+        modifiés à une version existante (upsert par level_id).
+
+        Avec un dataset partitionné par difficulté, seules les partitions touchées par
+        le delta sont relues et réécrites ; les autres sont reprises par lien physique,
+        sans copie. Sinon, la version de base est relue entièrement puis réécrite.
+        Les niveaux du delta identiques à la version de base sont ignorés ; si aucun
+        niveau ne change, aucune version n'est créée.
+
+        Args:
+            delta_data : Niveaux nettoyés à insérer ou remplacer (même format que build_dataset)
+            base_version : Version de base (la dernière version du catalogue par défaut)
+        Returns:
+            L'entrée du catalogue de la nouvelle version (à relire avec load_dataset),
+            ou celle de la version de base pour un delta sans effet
+        """
+        dataset_files, entry = [], None
+        try:
+            base = self.catalog.get(base_version) if base_version else self.catalog.latest()
+            if base is None:
+                logging.info("Aucune version de base dans le catalogue : construction complète.")
+                self.build_dataset(delta_data)
+                return self.catalog.latest()
+
+            delta = self._structure(delta_data)
+            delta = delta.drop_duplicates("level_id", keep="last").reset_index(drop=True)
+            base_path = Path(base["path"])
+
+            if self.partition_by_difficulty and PYARROW_AVAILABLE and base_path.is_dir():
+                dataset_path, delta = self._upsert_partitions(base_path, delta)
+                if dataset_path is not None:
+                    dataset_files = [dataset_path]
+                    # Ordre de relecture (par partition) pour l'index des tags, les colonnes et le cube
+                    merged = self.load_dataset(dataset_path, columns=ColumnStore.numeric_columns + ["tags", "difficulty", "maker"])
+                    schema = self._stored_schema(dataset_path)
+            else:
+                base_df = self._read_version(base)
+                delta = self._changed_levels(base_df, delta)
+                if len(delta):
+                    merged = self._upsert(base_df, delta)
+                    dataset_files = self._save_dataset(merged)
+                    schema = {col: str(dtype) for col, dtype in merged.dtypes.items()}
+
+            if not len(delta):
+                logging.info(f"Delta sans effet sur la version {base['version']} : aucune nouvelle version.")
+                return base
+            row_count = len(merged)
+
+            self.tag_index = TagIndex.from_tags(merged["tags"])
+            self.cube = LevelCube.from_frame(merged)
+            dataset_files.append(self._save_tag_index(dataset_files[0]))
+            dataset_files.append(self._save_columns(merged, dataset_files[0]))
+            dataset_files.append(self._save_cube(dataset_files[0]))
+
+            # Hash chaîné : base + niveaux effectivement modifiés, sans relire la version complète
+            content_hash = hashlib.sha256(
+                (base["content_hash"] + DatasetCatalog.content_hash(delta)).encode("utf-8")
+            ).hexdigest()
+            entry = self.catalog.register_entry(
+                dataset_files,
+                row_count=row_count,
+                schema=schema,
+                content_hash=content_hash,
+                source_commit=delta_data.get("source_commit")
+            )
+            self.catalog.apply_retention()
+            logging.info(f"Build incrémental : {len(delta)} niveaux appliqués à la version {base['version']}")
+            return entry
+
+        except Exception as e:
+            if entry is None:
+                # Version inachevée : absente du catalogue, elle ne serait jamais supprimée par la rétention
+                self._discard(dataset_files)
+            logging.error(f"Échec du build incrémental: {str(e)}")
+            raise Exception(f"Échec du build incrémental: {str(e)}")
+
+    def _structure(self, cleaned_data: Dict[str, List[Dict[str, Any]]], order_by_difficulty: bool = False) -> pd.DataFrame:
+        """
+        Convertit les niveaux nettoyés en DataFrame typé et construit l'index des tags
+        et le cube d'agrégats.
+        Args:
+            cleaned_data : Niveaux nettoyés (liste de dictionnaires, DataFrame ou LevelBatch)
+            order_by_difficulty : Trie les niveaux par difficulté (ordre de relecture d'un
+                dataset partitionné)
+        """
+        # Conversion des données en DataFrame (sans copie pour un LevelBatch)
+        levels = cleaned_data.get("levels", [])
+        df = levels.to_frame() if isinstance(levels, LevelBatch) else pd.DataFrame(levels)
+        
+        # Vérification des colonnes manquantes et ajout avec des valeurs par défaut
+        self._add_missing_columns(df)
+        
+        # Ajout des métadonnées (timestamp, version)
+        self._add_metadata(df)
+
+        # Tags normalisés une seule fois en listes (chaînes séparées par des virgules découpées)
+        tags = levels if isinstance(levels, LevelBatch) else LevelBatch.from_frame(df[["tags"]])
+        if order_by_difficulty:
+            order = np.argsort(df["difficulty"].astype(str).to_numpy(), kind="stable")
+            df = df.iloc[order].reset_index(drop=True)
+            tags = tags.take(order)
+        if isinstance(levels, LevelBatch):
+            tag_lists = df["tags"].tolist()  # Déjà matérialisés en listes par to_frame
+        else:
+            tag_lists = tags.tag_lists()
+            df["tags"] = tag_lists
+
+        # Index inversé des tags, construit avant leur mise à plat en chaînes
+        self.tag_index = TagIndex.from_batch(tags)
+
+        # Traitement des tags (si présents)
+        self._process_tags(df)
+
+        # Réduction de l'empreinte mémoire
+        if self.optimize_dtypes:
+            self._optimize_dtypes(df)
+
+        # Cube d'agrégats, à partir des mêmes listes de tags
+        self.cube = LevelCube.from_frame(df.assign(tags=tag_lists))
+
+        return df
+
+    def _upsert(self, base: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """Remplace les niveaux de base présents dans le delta et ajoute les nouveaux."""
+        # isin s'appuie sur une table de hachage des level_id du delta
+        kept = base[~base["level_id"].isin(delta["level_id"])]
+        merged = pd.concat([kept, delta], ignore_index=True)
+        merged.attrs = dict(delta.attrs)
+        # La concaténation de catégories différentes ou de types distincts donne des objets
+        if self.optimize_dtypes:
+            self._optimize_dtypes(merged)
+        return merged
+
+    def _changed_levels(self, base: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """Niveaux du delta absents de base ou dont au moins une valeur diffère."""
+        previous = base[base["level_id"].isin(delta["level_id"])].drop_duplicates("level_id", keep="last")
+        known = pd.Series(self._row_hashes(previous), index=previous["level_id"].astype(object).to_numpy())
+        unchanged = known.reindex(delta["level_id"].astype(object).to_numpy()).to_numpy() == self._row_hashes(delta)
+        return delta[~unchanged].reset_index(drop=True)
+
+    def _row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """Hash de chaque niveau sur les colonnes du dataset, indépendant des types de stockage."""
+        numeric = set(self.integer_columns + self.float_columns)
+        canonical = pd.DataFrame({
+            col: df[col].astype(np.float64) if col in numeric else df[col].astype(object)
+            for col in self.columns if col in df.columns
+        })
+        return pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+
+    def _upsert_partitions(self, base_path: Path, delta: pd.DataFrame) -> Tuple[Optional[Path], pd.DataFrame]:
+        """
+        Applique le delta à un dataset partitionné en ne réécrivant que les partitions touchées.
+        Returns:
+            (répertoire de la nouvelle version, ou None si aucun niveau ne change ;
+            niveaux du delta effectivement modifiés)
+        """
+        # Partitions d'origine des niveaux mis à jour (seules les clés sont relues)
+        keys = self.load_dataset(base_path, columns=["level_id", "difficulty"])
+        moved = keys["difficulty"][keys["level_id"].isin(delta["level_id"])]
+        changed = set(delta["difficulty"].astype(str)) | set(moved.astype(str))
+        touched = self.load_dataset(base_path, difficulties=sorted(changed))
+
+        # Niveaux identiques à la version de base écartés, puis partitions à réécrire recalculées
+        delta = self._changed_levels(touched, delta)
+        if not len(delta):
+            return None, delta
+        moved = keys["difficulty"][keys["level_id"].isin(delta["level_id"])]
+        changed = set(delta["difficulty"].astype(str)) | set(moved.astype(str))
+        touched = touched[touched["difficulty"].astype(str).isin(changed)]
+
+        dataset_path = self.data_dir / f"dataset_{self._new_timestamp()}.parquet"
+
+        try:
+            # Partitions inchangées : liens physiques vers les fichiers de la version de base
+            for partition in sorted(base_path.iterdir()):
+                if not partition.is_dir() or partition.name.split("=", 1)[-1] in changed:
+                    continue
+                (dataset_path / partition.name).mkdir(parents=True)
+                for file in partition.iterdir():
+                    try:
+                        os.link(file, dataset_path / partition.name / file.name)
+                    except OSError:
+                        shutil.copy2(file, dataset_path / partition.name / file.name)
+
+            # Partitions touchées : fusionnées avec le delta puis réécrites avec le
+            # schéma de la version de base, celui des partitions reprises
+            merged = self._upsert(touched, delta)
+            schema = pa_dataset.dataset(base_path, format="parquet", partitioning="hive").schema
+            self._write_parquet(merged, dataset_path, schema=schema)
+        except Exception:
+            self._discard([dataset_path])
+            raise
+
+        logging.info(
+            f"Partitions réécrites : {sorted(changed)} ; "
+            f"partitions reprises sans copie depuis {base_path.name}"
+        )
+        return dataset_path, delta
+
+    @staticmethod
+    def _stored_schema(dataset_path: Path) -> Dict[str, str]:
+        """Types pandas des colonnes d'un dataset Parquet partitionné, lus dans ses métadonnées."""
+        partitioning = pa_dataset.HivePartitioning.discover(infer_dictionary=True)
+        dataset = pa_dataset.dataset(dataset_path, format="parquet", partitioning=partitioning)
+        return {col: str(dtype) for col, dtype in dataset.head(0).to_pandas().dtypes.items()}
+
+    def _read_version(self, entry: Dict[str, Any]) -> pd.DataFrame:
+        """Relit entièrement une version du catalogue (Parquet ou Pickle)."""
+        path = Path(entry["path"])
+        if path.suffix == ".pkl":
+            return pd.read_pickle(path)
+        return self.load_dataset(path)
+
     def _add_missing_columns(self, df: pd.DataFrame):
         """Ajoute les colonnes manquantes avec une valeur par défaut (NaN)."""
         for col in self.columns:
@@ -67,9 +331,55 @@ class DatasetBuilder:
                 df[col] = np.nan  # Valeur par défaut pour les colonnes manquantes
 
     def _add_metadata(self, df: pd.DataFrame):
-        """Ajoute des métadonnées telles que le timestamp et la version des données."""
-        df["timestamp"] = pd.Timestamp.now()
-        df["data_version"] = "1.0"
+        """
+        Ajoute des métadonnées telles que le timestamp et la version des données.
+        Avec optimize_dtypes, elles sont stockées une seule fois dans df.attrs
+        plutôt que répétées sur chaque ligne.
+        """
+        if self.optimize_dtypes:
+            df.attrs["timestamp"] = pd.Timestamp.now().isoformat()
+            df.attrs["data_version"] = "1.0"
+        else:
+            df["timestamp"] = pd.Timestamp.now()
+            df["data_version"] = "1.0"
+
+    def _optimize_dtypes(self, df: pd.DataFrame):
+        """
+        Réduit l'empreinte mémoire des colonnes : catégories pour les chaînes peu variées,
+        uint32 pour les compteurs, float32 pour les scores et taux.
+
+        Les entiers sont conservés à l'identique. Le passage en float32 arrondit les scores
+        à environ 7 chiffres significatifs : la conversion est donc avec perte pour les flottants.
+        Les largeurs sont fixes (et non déduites des bornes de chaque lot), pour que toutes
+        les versions et partitions d'un dataset partagent le même schéma.
+        """
+        memory_before = int(df.memory_usage(deep=True).sum())
+
+        for col in self.categorical_columns + ["tags"]:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                if df[col].nunique(dropna=True) <= self.max_category_ratio * max(len(df), 1):
+                    df[col] = df[col].astype("category")
+
+        integer_max = np.iinfo(self.integer_dtype).max
+        for col in self.integer_columns:
+            if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+                if not len(df) or (df[col].min() >= 0 and df[col].max() <= integer_max):
+                    df[col] = df[col].astype(self.integer_dtype)
+                else:
+                    logging.warning(f"Colonne {col} hors des bornes de {np.dtype(self.integer_dtype)} : type conservé.")
+
+        float32_max = np.finfo(np.float32).max
+        for col in self.float_columns:
+            if col in df.columns and pd.api.types.is_float_dtype(df[col]):
+                if not len(df) or df[col].abs().max() < float32_max:
+                    df[col] = df[col].astype(np.float32)
+
+        memory_after = int(df.memory_usage(deep=True).sum())
+        df.attrs["memory_usage"] = {"before_bytes": memory_before, "after_bytes": memory_after}
+        logging.info(
+            f"Optimisation des types : {memory_before / 1e6:.2f} Mo -> {memory_after / 1e6:.2f} Mo "
+            f"({memory_before / max(memory_after, 1):.1f}x, {(memory_before - memory_after) / 1e6:.2f} Mo économisés)"
+        )
 
     def _process_tags(self, df: pd.DataFrame):
         """Convertit les tags de liste en chaîne de caractères séparée par des virgules."""
@@ -78,16 +388,165 @@ class DatasetBuilder:
         else:
             df["tags"] = ""  # Si "tags" n'existe pas, on l'initialise à une chaîne vide.
 
-    def _save_dataset(self, df: pd.DataFrame):
-        """Enregistre le dataset dans des fichiers CSV et Pickle."""
+    def _save_tag_index(self, dataset_path: Path) -> Path:
+        """Enregistre l'index des tags à côté du dataset (dataset_<ts>.tags.npz)."""
+        index_path = self.tag_index_path(dataset_path)
+        self.tag_index.save(index_path)
+        logging.info(f"Index des tags sauvegardé dans {index_path}")
+        return index_path
+
+    @staticmethod
+    def tag_index_path(dataset_path: Union[str, Path]) -> Path:
+        """Chemin de l'index des tags associé à un fichier de dataset."""
+        dataset_path = Path(dataset_path)
+        return dataset_path.with_name(f"{dataset_path.name.split('.')[0]}.tags.npz")
+
+    def _save_columns(self, df: pd.DataFrame, dataset_path: Path) -> Path:
+        """Enregistre les colonnes numériques projetables en mémoire (dataset_<ts>.columns/)."""
+        columns_path = ColumnStore.write(df, ColumnStore.path_for(dataset_path))
+        logging.info(f"Colonnes numériques projetables sauvegardées dans {columns_path}")
+        return columns_path
+
+    def _save_cube(self, dataset_path: Path) -> Path:
+        """Enregistre le cube d'agrégats difficulté x tag x créateur (dataset_<ts>.cube.npz)."""
+        cube_path = self.cube_path(dataset_path)
+        self.cube.save(cube_path)
+        logging.info(f"Cube d'agrégats sauvegardé dans {cube_path}")
+        return cube_path
+
+    @staticmethod
+    def cube_path(dataset_path: Union[str, Path]) -> Path:
+        """Chemin du cube d'agrégats associé à un fichier de dataset."""
+        dataset_path = Path(dataset_path)
+        return dataset_path.with_name(f"{dataset_path.name.split('.')[0]}.cube.npz")
+
+    def _save_dataset(self, df: pd.DataFrame) -> List[Path]:
+        """Enregistre le dataset au format configuré et retourne les fichiers écrits (principal en premier)."""
+        timestamp = self._new_timestamp()
+
+        if self.output_format == "parquet":
+            if PYARROW_AVAILABLE:
+                return [self._save_parquet(df, timestamp)]
+            logging.warning("pyarrow n'est pas installé : enregistrement en CSV et Pickle.")
+
+        return self._save_csv_pickle(df, timestamp)
+
+    def _new_timestamp(self) -> str:
+        """
+        Horodatage d'une nouvelle version, suffixé (_1, _2...) si des versions de la même
+        seconde existent déjà : deux builds n'écrivent jamais au même endroit, et le
+        suffixe suit toujours le plus grand déjà utilisé (jamais un nom libéré par la
+        rétention, qui serait classé avant les versions plus anciennes).
+        """
         timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Sauvegarde en format CSV
+        names = [path.name.split(".")[0].replace("dataset_", "") for path in self.data_dir.glob(f"dataset_{timestamp}*")]
+        names += [version["version"] for version in self.catalog.versions()]
+        suffixes = [DatasetCatalog.version_key(name)[1] for name in names if name.split("_")[:2] == timestamp.split("_")]
+        return f"{timestamp}_{max(suffixes) + 1}" if suffixes else timestamp
+
+    def _save_parquet(self, df: pd.DataFrame, timestamp: str) -> Path:
+        """Enregistre le dataset en Parquet compressé, typé et éventuellement partitionné par difficulté."""
+        parquet_path = self.data_dir / f"dataset_{timestamp}.parquet"
+        self._write_parquet(df, parquet_path)
+        logging.info(f"Ensemble de données sauvegardé dans {parquet_path}")
+        return parquet_path
+
+    def _write_parquet(self, df: pd.DataFrame, path: Path, schema: Optional["pyarrow.Schema"] = None):
+        """
+        Écrit le dataset en Parquet.
+        Args:
+            schema : Schéma Arrow imposé (celui de la version de base lors d'un upsert de
+                partitions) ; par défaut celui du DataFrame, voir _arrow_schema
+        """
+        typed = df.copy(deep=False)
+        for col in self.categorical_columns:
+            if col in typed.columns and not isinstance(typed[col].dtype, pd.CategoricalDtype):
+                typed[col] = typed[col].astype("category")
+        if "timestamp" in typed.columns:
+            typed["timestamp"] = pd.to_datetime(typed["timestamp"])
+
+        options = {}
+        if self.partition_by_difficulty:
+            # Répertoire propre à la version ; seules y figurent déjà les partitions
+            # reprises par lien physique (_upsert_partitions), jamais réécrites
+            options = {"partition_cols": ["difficulty"], "existing_data_behavior": "delete_matching"}
+        typed.to_parquet(
+            path,
+            engine="pyarrow",
+            compression=self.compression,
+            index=False,
+            schema=schema if schema is not None else self._arrow_schema(typed),
+            **options
+        )
+
+    @staticmethod
+    def _arrow_schema(df: pd.DataFrame) -> "pyarrow.Schema":
+        """
+        Schéma Arrow du DataFrame, avec des index de dictionnaire int32 : la largeur des
+        codes d'une catégorie ne dépend pas de son nombre de modalités, et toutes les
+        partitions d'un dataset gardent le même schéma.
+        """
+        schema = pyarrow.Schema.from_pandas(df, preserve_index=False)
+        fields = [
+            pyarrow.field(field.name, pyarrow.dictionary(pyarrow.int32(), field.type.value_type))
+            if pyarrow.types.is_dictionary(field.type) else field
+            for field in schema
+        ]
+        return pyarrow.schema(fields, metadata=schema.metadata)
+
+    @staticmethod
+    def _discard(paths: Sequence[Path]):
+        """Supprime les fichiers (ou répertoires) d'une version qui n'a pas pu être enregistrée."""
+        for path in paths:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+
+    def _save_csv_pickle(self, df: pd.DataFrame, timestamp: str) -> List[Path]:
+        """Enregistre le dataset dans des fichiers CSV et Pickle."""
+        # Sauvegarde en format CSV (le CSV ne conserve pas df.attrs : métadonnées en colonnes)
         csv_path = self.data_dir / f"dataset_{timestamp}.csv"
-        df.to_csv(csv_path, index=False)
+        metadata = {key: df.attrs[key] for key in ("timestamp", "data_version") if key in df.attrs}
+        df.assign(**metadata).to_csv(csv_path, index=False)
         logging.info(f"Ensemble de données sauvegardé dans {csv_path}")
         
         # Sauvegarde en format Pickle pour préserver les types de données
         pickle_path = self.data_dir / f"dataset_{timestamp}.pkl"
         df.to_pickle(pickle_path)
         logging.info(f"Ensemble de données sauvegardé dans {pickle_path}")
+        return [pickle_path, csv_path]
+
+    @staticmethod
+    def load_dataset(
+        path: Union[str, Path],
+        columns: Optional[Sequence[str]] = None,
+        difficulties: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Relit un dataset Parquet en ne chargeant que les colonnes et difficultés demandées.
+
+        Args:
+            path : Fichier ou répertoire (partitionné) Parquet
+            columns : Colonnes à charger (projection) ; toutes si None
+            difficulties : Difficultés à conserver ; le filtre est appliqué à la lecture
+                (partitions ignorées, groupes de lignes écartés grâce aux statistiques)
+        Returns:
+            pd.DataFrame : Le DataFrame relu.
+        """
+        filters = [("difficulty", "in", list(difficulties))] if difficulties else None
+        return pd.read_parquet(path, engine="pyarrow", columns=list(columns) if columns else None, filters=filters)
+
+    @staticmethod
+    def iter_dataset(
+        path: Union[str, Path],
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = 100_000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Parcourt un dataset Parquet par blocs de batch_size lignes, sans le charger
+        entièrement (analyse en flux d'un historique plus grand que la mémoire).
+        """
+        dataset = pa_dataset.dataset(path, format="parquet", partitioning="hive")
+        for batch in dataset.to_batches(columns=list(columns) if columns else None, batch_size=batch_size):
+            yield batch.to_pandas()
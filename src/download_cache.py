@@ -0,0 +1,391 @@
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Any, BinaryIO, Iterator, Optional, Sequence, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows : l'index n'est protégé qu'entre les threads du processus
+    fcntl = None
+
+# Moteur Parquet de pandas ; pickle sinon
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+
+class _HashingStream(io.RawIOBase):
+    """Flux binaire en lecture seule sur les blocs d'une réponse HTTP, haché au fil de la lecture."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+        self._hash = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._hash.update(self._chunk[:size])
+        self._chunk = self._chunk[size:]
+        return size
+
+    def hexdigest(self) -> str:
+        """Hash du contenu complet (le reste du flux est lu s'il ne l'a pas été)."""
+        while self.read(1 << 20):
+            pass
+        return self._hash.hexdigest()
+
+
+class DownloadCache:
+    """
+    Cache disque des fichiers distants, conservés sous forme déjà analysée (DataFrame).
+
+    Chaque entrée est un fichier Parquet (<clé>.parquet, ou pickle sans pyarrow) ;
+    index.json garde pour chaque URL l'ETag, le Last-Modified, le hash du contenu,
+    la taille, la date de dernière validation et le dernier accès.
+
+    Une entrée validée il y a moins de max_age secondes est servie sans appel réseau.
+    Au-delà, une requête conditionnelle (If-None-Match / If-Modified-Since) est envoyée :
+    304 ou contenu de même hash, l'entrée est conservée ; sinon le fichier est de
+    nouveau analysé. Le contenu est passé à parse en flux, au fil du téléchargement,
+    sans copie complète en mémoire. Si le serveur est injoignable, l'entrée existante
+    est servie.
+    Au-delà de max_bytes, les entrées les moins récemment utilisées sont supprimées.
+
+    Plusieurs instances (sessions Streamlit, processus) peuvent partager le répertoire :
+    chaque écriture de l'index relit la version sur disque sous verrou et n'y applique
+    que les entrées modifiées ou supprimées par cette instance.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = Path("data") / "download_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age: float = 24 * 3600,
+        session: Optional[requests.Session] = None,
+        timeout: float = 60,
+        pool_size: int = 16
+    ):
+        """
+        Args:
+            cache_dir : Répertoire du cache
+            max_bytes : Taille maximale du cache sur disque
+            max_age : Durée (secondes) pendant laquelle une entrée est servie sans revalidation
+            session : Session HTTP (pool de connexions) ; une nouvelle session par défaut
+            timeout : Délai maximal des requêtes HTTP
+            pool_size : Connexions conservées par hôte dans la session par défaut
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.lock_path = self.cache_dir / "index.lock"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.session = session or self._make_session(pool_size)
+        self.timeout = timeout
+        self._lock = threading.RLock()  # Index partagé entre les threads (sessions Streamlit)
+        self._index = self._load_index()
+        self._changed = set()  # Clés modifiées depuis la dernière écriture de l'index
+        self._removed = set()  # Clés supprimées depuis la dernière écriture de l'index
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def fetch(self, url: str, parse: Callable[[BinaryIO], pd.DataFrame], force_revalidate: bool = False) -> pd.DataFrame:
+        """
+        DataFrame du fichier distant, depuis le cache si possible.
+        Args:
+            url : URL du fichier
+            parse : Analyse du contenu (flux binaire, lu au fil du téléchargement) en DataFrame
+            force_revalidate : Revalide l'entrée même si elle est récente
+        """
+        key = self.make_key(url)
+        with self._lock:
+            if key not in self._index:
+                self._refresh()  # Entrée peut-être écrite depuis par une autre instance
+            entry = dict(self._index[key]) if key in self._index else None
+
+        if entry is not None and not force_revalidate and time.time() - entry["validated_at"] < self.max_age:
+            df = self._read_entry(key, entry)
+            if df is not None:
+                return df
+            entry = None
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if entry is not None:
+                logging.warning(f"Revalidation impossible ({str(e)}) : entrée en cache servie pour {url}")
+                df = self._read_entry(key, entry)
+                if df is not None:
+                    return df
+            raise
+
+        with response:
+            if response.status_code == 304:
+                df = self._revalidated(key, entry)
+                # Fichier en cache devenu illisible : l'entrée a été abandonnée, téléchargement complet
+                return df if df is not None else self.fetch(url, parse)
+
+            stream = _HashingStream(response.iter_content(chunk_size=1 << 20))
+            df = parse(io.BufferedReader(stream, buffer_size=1 << 20))
+            content_hash = stream.hexdigest()
+
+        if entry is not None and entry.get("content_hash") == content_hash and self._mark_validated(key, response):
+            # Serveur sans ETag/Last-Modified exploitable : même contenu, l'entrée n'est pas réécrite
+            return df
+
+        self.put(url, df, content_hash, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return df
+
+    def fetch_many(
+        self,
+        urls: Sequence[str],
+        parse: Callable[[BinaryIO], pd.DataFrame],
+        max_workers: int = 16
+    ) -> Dict[str, Union[pd.DataFrame, Exception]]:
+        """
+        Télécharge (ou relit en cache) plusieurs fichiers en parallèle avec la session partagée ;
+        chaque fichier est analysé dans son thread dès sa réception.
+        Returns:
+            {url: DataFrame, ou l'exception levée pour cette URL}, dans l'ordre de urls
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+            futures = {executor.submit(self.fetch, url, parse): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    logging.error(f"Échec du téléchargement de {url}: {str(e)}")
+                    results[url] = e
+        return {url: results[url] for url in urls}
+
+    def put(
+        self,
+        url: str,
+        df: pd.DataFrame,
+        content_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Enregistre le DataFrame d'une URL puis applique la limite de taille."""
+        key = self.make_key(url)
+        file_name = self._write_frame(key, df)
+        now = time.time()
+        with self._lock:
+            self._refresh()
+            previous = self._index.get(key)
+            if previous is not None and previous["file"] != file_name:
+                self._unlink(previous["file"])
+            self._changed.add(key)
+            self._removed.discard(key)
+            self._index[key] = {
+                "url": url,
+                "file": file_name,
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+                "size": (self.cache_dir / file_name).stat().st_size,
+                "validated_at": now,
+                "last_access": now
+            }
+            self._save_index(evict=True)
+
+    def invalidate(self, url: Optional[str] = None) -> int:
+        """
+        Supprime l'entrée d'une URL (tout le cache sans argument).
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            self._refresh()
+            keys = list(self._index) if url is None else [key for key in [self.make_key(url)] if key in self._index]
+            self._remove(keys)
+            self._save_index()
+        if keys:
+            logging.info(f"Cache des téléchargements : {len(keys)} entrées invalidées")
+        return len(keys)
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return sum(entry["size"] for entry in self._index.values())
+
+    def _revalidated(self, key: str, entry: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """Entrée confirmée par le serveur (304) : relue puis marquée comme validée."""
+        df = self._read_entry(key, entry)
+        if df is not None:
+            self._mark_validated(key)
+        return df
+
+    def _mark_validated(self, key: str, response: Optional[requests.Response] = None) -> bool:
+        """Met à jour la date de validation (et les validateurs) d'une entrée toujours présente."""
+        with self._lock:
+            current = self._index.get(key)
+            if current is None:
+                return False
+            current["validated_at"] = time.time()
+            self._changed.add(key)
+            if response is not None:
+                current["etag"] = response.headers.get("ETag") or current.get("etag")
+                current["last_modified"] = response.headers.get("Last-Modified") or current.get("last_modified")
+            self._save_index()
+            return True
+
+    def _read_entry(self, key: str, entry: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """DataFrame d'une entrée, ou None si son fichier a disparu ou est corrompu."""
+        path = self.cache_dir / entry["file"]
+        try:
+            if path.suffix == ".parquet":
+                df = pd.read_parquet(path, engine="pyarrow")
+            else:
+                with open(path, "rb") as f:
+                    df = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"Entrée du cache abandonnée ({str(e)}) : {path}")
+            with self._lock:
+                if self._index.pop(key, None) is not None:
+                    self._removed.add(key)
+                    self._changed.discard(key)
+                self._save_index()
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index[key]["last_access"] = time.time()
+                self._changed.add(key)
+                self._save_index()
+        return df
+
+    def _write_frame(self, key: str, df: pd.DataFrame) -> str:
+        """Écrit le DataFrame (Parquet, ou pickle si pyarrow est absent ou refuse le schéma)."""
+        if PYARROW_AVAILABLE:
+            file_name = f"{key}.parquet"
+            tmp_path = self.cache_dir / f"{file_name}.tmp"
+            try:
+                df.to_parquet(tmp_path, engine="pyarrow", index=False)
+                os.replace(tmp_path, self.cache_dir / file_name)
+                return file_name
+            except Exception as e:
+                logging.warning(f"Écriture Parquet impossible ({str(e)}) : enregistrement en pickle.")
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+        file_name = f"{key}.pkl"
+        tmp_path = self.cache_dir / f"{file_name}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_dir / file_name)
+        return file_name
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes (index fusionné)."""
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            evicted.append(key)
+        self._remove(evicted)
+        logging.info(f"Cache des téléchargements : {len(evicted)} entrées évincées (LRU)")
+
+    def _remove(self, keys: List[str]):
+        for key in keys:
+            entry = self._index.pop(key)
+            self._changed.discard(key)
+            self._removed.add(key)
+            self._unlink(entry["file"])
+
+    def _unlink(self, file_name: str):
+        path = self.cache_dir / file_name
+        if path.exists():
+            path.unlink()
+
+    @staticmethod
+    def _make_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    @contextmanager
+    def _index_lock(self):
+        """Verrou exclusif sur l'index, partagé entre processus (fcntl)."""
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Relit l'index sur disque en conservant les modifications pas encore écrites."""
+        with self._index_lock():
+            self._index = self._merged_index()
+
+    def _merged_index(self) -> Dict[str, Dict[str, Any]]:
+        """Index sur disque auquel sont appliquées les modifications de cette instance."""
+        index = self._load_index()
+        for key in self._removed:
+            index.pop(key, None)
+        for key in self._changed:
+            if key in self._index:
+                index[key] = self._index[key]
+        return index
+
+    def _save_index(self, evict: bool = False):
+        """
+        Écrit l'index : relu sous verrou, fusionné avec les modifications de cette
+        instance, puis remplacé atomiquement (éviction LRU sur l'index fusionné).
+        """
+        with self._index_lock():
+            self._index = self._merged_index()
+            if evict:
+                self._evict()
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._index, f, indent=2)
+            os.replace(tmp_path, self.index_path)
+            self._changed.clear()
+            self._removed.clear()
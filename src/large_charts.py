@@ -0,0 +1,278 @@
+"""
+Figures Plotly à charge bornée pour les grands datasets.
+
+Jusqu'à LARGE_DATA_THRESHOLD lignes, chaque fonction produit la même figure que
+plotly.express. Au-delà, la taille du JSON envoyé au navigateur ne dépend plus du
+nombre de lignes :
+    - nuages de points : échantillon uniforme en WebGL (droites de tendance ajustées
+      sur toutes les lignes) ou carte de densité précalculée
+    - boîtes à moustaches : quartiles, moustaches (1,5 x IQR) et moyenne précalculés,
+      sans les points aberrants
+    - violons : densité par groupe précalculée sur une grille, avec la boîte au centre
+    - histogrammes et camemberts : effectifs précalculés
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from typing import Dict, List, Optional, Sequence, Union
+
+# Au-delà de ce nombre de lignes, les figures n'embarquent plus les valeurs brutes
+LARGE_DATA_THRESHOLD = 100_000
+MAX_SCATTER_POINTS = 20_000
+DENSITY_BINS = 100
+
+
+def is_large(df: pd.DataFrame) -> bool:
+    return len(df) > LARGE_DATA_THRESHOLD
+
+
+def scatter(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    color: Optional[str] = None,
+    title: Optional[str] = None,
+    labels: Optional[Dict[str, str]] = None,
+    trendline: Optional[str] = None,
+    mode: str = "sample",
+    max_points: int = MAX_SCATTER_POINTS,
+    seed: int = 0
+) -> go.Figure:
+    """
+    Nuage de points ; au-delà du seuil, échantillon de max_points lignes (mode "sample")
+    ou carte de densité (mode "density").
+    """
+    if not is_large(df):
+        return px.scatter(df, x=x, y=y, color=color, title=title, labels=labels, trendline=trendline)
+    if mode == "density":
+        return density_heatmap(df, x, y, title=title, labels=labels)
+
+    sample = df.sample(n=min(max_points, len(df)), random_state=seed)
+    category_orders = {color: _groups(df, color)} if color else None
+    fig = px.scatter(
+        sample, x=x, y=y, color=color, title=title, labels=labels,
+        category_orders=category_orders, render_mode="webgl"
+    )
+    if trendline == "ols":
+        _add_trendlines(fig, df, x, y, color)
+    return fig
+
+
+def density_heatmap(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    title: Optional[str] = None,
+    labels: Optional[Dict[str, str]] = None,
+    bins: int = DENSITY_BINS
+) -> go.Figure:
+    """Carte de densité (effectifs par case d'une grille bins x bins), calculée côté serveur."""
+    values = df[[x, y]].to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values).any(axis=1)]
+    counts, x_edges, y_edges = np.histogram2d(values[:, 0], values[:, 1], bins=bins)
+    z = np.where(counts > 0, counts, np.nan).T  # Cases vides transparentes
+
+    labels = labels or {}
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale="Viridis",
+        colorbar={"title": "Niveaux"}
+    ))
+    fig.update_layout(title=title, xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y))
+    return fig
+
+
+def box(
+    df: pd.DataFrame,
+    x: str,
+    y: Union[str, Sequence[str]],
+    color: Optional[str] = None,
+    title: Optional[str] = None
+) -> go.Figure:
+    """Boîtes à moustaches par groupe x ; au-delà du seuil, statistiques précalculées."""
+    if not is_large(df):
+        return px.box(df, x=x, y=y if isinstance(y, str) else list(y), color=color, title=title)
+
+    variables = [y] if isinstance(y, str) else list(y)
+    groups = _groups(df, x)
+    fig = go.Figure()
+
+    if len(variables) == 1 and color == x:
+        # Une trace par groupe, comme px.box(color=x)
+        stats = box_stats(df, x, variables[0])
+        for group in groups:
+            fig.add_trace(_box_trace([group], stats.loc[[group]], name=str(group)))
+    else:
+        for variable in variables:
+            stats = box_stats(df, x, variable)
+            fig.add_trace(_box_trace(groups, stats.loc[groups], name=variable))
+        fig.update_layout(boxmode="group")
+
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=variables[0] if len(variables) == 1 else "value")
+    return fig
+
+
+def violin(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    color: Optional[str] = None,
+    title: Optional[str] = None,
+    bins: int = DENSITY_BINS
+) -> go.Figure:
+    """Violons par groupe x ; au-delà du seuil, densités et boîtes précalculées."""
+    if not is_large(df):
+        return px.violin(df, x=x, y=y, color=color, title=title)
+
+    groups = _groups(df, x)
+    values = df[y].to_numpy(dtype=np.float64)
+    finite = ~np.isnan(values)
+    edges = np.histogram_bin_edges(values[finite], bins=bins)
+    grid = (edges[:-1] + edges[1:]) / 2
+    kernel = np.exp(-0.5 * np.linspace(-2, 2, 5) ** 2)
+    stats = box_stats(df, x, y)
+    colors = px.colors.qualitative.Plotly
+
+    fig = go.Figure()
+    codes = _codes(df, x, groups)
+    for position, group in enumerate(groups):
+        density, _ = np.histogram(values[finite & (codes == position)], bins=edges)
+        density = np.convolve(density, kernel / kernel.sum(), mode="same")
+        width = 0.45 * density / density.max() if density.max() > 0 else density
+        color_value = colors[position % len(colors)]
+
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([position - width, (position + width)[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            fill="toself", mode="lines", line={"color": color_value, "width": 1},
+            name=str(group), legendgroup=str(group)
+        ))
+        box_trace = _box_trace([position], stats.loc[[group]], name=str(group))
+        box_trace.update(width=0.08, marker_color=color_value, showlegend=False, legendgroup=str(group))
+        fig.add_trace(box_trace)
+
+    fig.update_layout(
+        title=title, xaxis_title=x, yaxis_title=y,
+        xaxis={"tickmode": "array", "tickvals": list(range(len(groups))), "ticktext": [str(g) for g in groups]}
+    )
+    return fig
+
+
+def histogram(
+    df: pd.DataFrame,
+    x: str,
+    color: Optional[str] = None,
+    nbins: Optional[int] = None,
+    title: Optional[str] = None,
+    color_discrete_sequence: Optional[List[str]] = None
+) -> go.Figure:
+    """Histogramme (empilé par color) ; au-delà du seuil, effectifs précalculés."""
+    if not is_large(df):
+        return px.histogram(df, x=x, color=color, nbins=nbins, title=title, color_discrete_sequence=color_discrete_sequence)
+
+    values = df[x].to_numpy(dtype=np.float64)
+    finite = ~np.isnan(values)
+    edges = np.histogram_bin_edges(values[finite], bins=nbins or 50)
+    centers = (edges[:-1] + edges[1:]) / 2
+    colors = color_discrete_sequence or px.colors.qualitative.Plotly
+
+    fig = go.Figure()
+    if color:
+        groups = _groups(df, color)
+        codes = _codes(df, color, groups)
+        for position, group in enumerate(groups):
+            counts, _ = np.histogram(values[finite & (codes == position)], bins=edges)
+            fig.add_trace(go.Bar(x=centers, y=counts, width=np.diff(edges), name=str(group),
+                                 marker_color=colors[position % len(colors)]))
+    else:
+        counts, _ = np.histogram(values[finite], bins=edges)
+        fig.add_trace(go.Bar(x=centers, y=counts, width=np.diff(edges), marker_color=colors[0]))
+
+    fig.update_layout(title=title, barmode="stack", bargap=0, xaxis_title=x, yaxis_title="count")
+    return fig
+
+
+def pie(df: pd.DataFrame, names: str, title: Optional[str] = None, color_discrete_sequence: Optional[List[str]] = None) -> go.Figure:
+    """Camembert des effectifs, comptés côté serveur."""
+    counts = df[names].value_counts()
+    return px.pie(
+        values=counts.to_numpy(),
+        names=counts.index.astype(str),
+        title=title,
+        color_discrete_sequence=color_discrete_sequence
+    )
+
+
+def box_stats(df: pd.DataFrame, x: str, y: str) -> pd.DataFrame:
+    """Quartiles, moustaches (1,5 x IQR bornées aux données), moyenne et effectif de y par groupe x."""
+    groups = _groups(df, x)
+    codes = _codes(df, x, groups)
+    values = df[y].to_numpy(dtype=np.float64)
+
+    rows = []
+    for position, group in enumerate(groups):
+        group_values = values[(codes == position) & ~np.isnan(values)]
+        if not len(group_values):
+            rows.append({"q1": np.nan, "median": np.nan, "q3": np.nan, "lowerfence": np.nan,
+                         "upperfence": np.nan, "mean": np.nan, "count": 0})
+            continue
+        q1, median, q3 = np.quantile(group_values, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        rows.append({
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "lowerfence": group_values[group_values >= q1 - 1.5 * iqr].min(),
+            "upperfence": group_values[group_values <= q3 + 1.5 * iqr].max(),
+            "mean": group_values.mean(),
+            "count": len(group_values)
+        })
+    return pd.DataFrame(rows, index=groups)
+
+
+def _box_trace(positions: Sequence, stats: pd.DataFrame, name: str) -> go.Box:
+    return go.Box(
+        x=list(positions),
+        q1=stats["q1"].tolist(),
+        median=stats["median"].tolist(),
+        q3=stats["q3"].tolist(),
+        lowerfence=stats["lowerfence"].tolist(),
+        upperfence=stats["upperfence"].tolist(),
+        mean=stats["mean"].tolist(),
+        name=name,
+        boxpoints=False
+    )
+
+
+def _add_trendlines(fig: go.Figure, df: pd.DataFrame, x: str, y: str, color: Optional[str]):
+    """Droites des moindres carrés ajustées sur toutes les lignes (et non sur l'échantillon affiché)."""
+    traces = {trace.name: trace for trace in fig.data}
+    subsets = df.groupby(color, observed=True) if color else [(None, df)]
+    for group, subset in subsets:
+        values = subset[[x, y]].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) < 2 or np.ptp(values[:, 0]) == 0:
+            continue
+        slope, intercept = np.polyfit(values[:, 0], values[:, 1], 1)
+        x_range = np.array([values[:, 0].min(), values[:, 0].max()])
+        trace = traces.get(str(group)) if group is not None else fig.data[0]
+        fig.add_trace(go.Scattergl(
+            x=x_range, y=slope * x_range + intercept, mode="lines",
+            line={"color": trace.marker.color if trace is not None else None},
+            name=f"{group} (tendance)" if group is not None else "tendance",
+            showlegend=False
+        ))
+
+
+def _groups(df: pd.DataFrame, column: str) -> List:
+    """Groupes présents, triés."""
+    return sorted(df[column].dropna().unique().tolist())
+
+
+def _codes(df: pd.DataFrame, column: str, groups: List) -> np.ndarray:
+    """Position de chaque ligne dans groups (-1 pour les valeurs manquantes)."""
+    return pd.Index(groups).get_indexer(df[column].astype(object))
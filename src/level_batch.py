@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+from itertools import chain
+from typing import Dict, List, Any, Sequence
+
+
+class LevelBatch:
+    """
+    Conteneur compact de niveaux, en colonnes (struct-of-arrays), transmis tel quel
+    entre DataCollector, DataPreprocessor et DatasetBuilder.
+
+    - colonnes numériques : un tableau NumPy contigu par champ
+    - difficulty et maker : catégories (codes entiers + dictionnaire de chaînes)
+    - tags : offsets + codes dans un vocabulaire commun ; les tags du niveau i sont
+      tag_vocabulary[tag_codes[tag_offsets[i]:tag_offsets[i + 1]]]
+    - level_id et title : tableaux d'objets partagés par référence
+
+    to_frame construit un DataFrame à partir de ces tableaux sans les recopier.
+    """
+
+    numeric_fields = [
+        "clear_rate", "attempts", "clears", "likes", "completion_rate",
+        "difficulty_score", "popularity_score", "engagement_score"
+    ]
+    categorical_fields = ["difficulty", "maker"]
+    string_fields = ["level_id", "title"]
+    field_order = [
+        "level_id", "title", "maker", "difficulty", "clear_rate",
+        "attempts", "clears", "likes", "tags", "completion_rate",
+        "difficulty_score", "popularity_score", "engagement_score"
+    ]
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        categoricals: Dict[str, pd.Categorical],
+        tag_offsets: np.ndarray,
+        tag_codes: np.ndarray,
+        tag_vocabulary: np.ndarray
+    ):
+        self.columns = columns
+        self.categoricals = categoricals
+        self.tag_offsets = tag_offsets
+        self.tag_codes = tag_codes
+        self.tag_vocabulary = tag_vocabulary
+
+    def __len__(self) -> int:
+        return len(self.tag_offsets) - 1
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "LevelBatch":
+        """
+        Construit un lot à partir d'un DataFrame de niveaux.
+        Les colonnes numériques déjà typées sont reprises sans copie ; les tags peuvent
+        être des listes ou des chaînes séparées par des virgules.
+        """
+        columns, categoricals = cls._frame_columns(df)
+        tags = df["tags"] if "tags" in df.columns else pd.Series([[]] * len(df), dtype=object)
+        tag_offsets, tag_codes, tag_vocabulary = cls.encode_tags(tags)
+
+        return cls(columns, categoricals, tag_offsets, tag_codes, tag_vocabulary)
+
+    def with_columns(self, df: pd.DataFrame) -> "LevelBatch":
+        """
+        Lot dont les colonnes sont celles de df (mêmes niveaux, dans le même ordre)
+        et dont les tags, toujours encodés, sont ceux de ce lot.
+        """
+        columns, categoricals = self._frame_columns(df)
+        return LevelBatch(columns, categoricals, self.tag_offsets, self.tag_codes, self.tag_vocabulary)
+
+    @classmethod
+    def _frame_columns(cls, df: pd.DataFrame):
+        """Colonnes numériques et textuelles (sans copie si déjà typées) et catégories d'un DataFrame."""
+        columns = {}
+        for field in cls.numeric_fields + cls.string_fields:
+            if field in df.columns:
+                dtype = object if field in cls.string_fields else None
+                columns[field] = df[field].to_numpy(dtype=dtype)
+
+        categoricals = {}
+        for field in cls.categorical_fields:
+            if field in df.columns:
+                values = df[field]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    categoricals[field] = values.array.remove_unused_categories()
+                else:
+                    categoricals[field] = pd.Categorical(values)
+        return columns, categoricals
+
+    @classmethod
+    def concat(cls, batches: Sequence["LevelBatch"]) -> "LevelBatch":
+        """Concatène plusieurs lots en réconciliant catégories et vocabulaires de tags."""
+        batches = [batch for batch in batches if batch is not None]
+        if not batches:
+            return cls.from_frame(pd.DataFrame())
+        if len(batches) == 1:
+            return batches[0]
+
+        columns = {
+            field: np.concatenate([batch.columns[field] for batch in batches])
+            for field in batches[0].columns
+        }
+        categoricals = {
+            field: pd.api.types.union_categoricals([batch.categoricals[field] for batch in batches])
+            for field in batches[0].categoricals
+        }
+
+        tag_vocabulary = pd.unique(np.concatenate([batch.tag_vocabulary for batch in batches]))
+        positions = pd.Index(tag_vocabulary)
+        tag_codes = []
+        tag_offsets = [np.zeros(1, dtype=np.int64)]
+        shift = 0
+        for batch in batches:
+            remap = positions.get_indexer(batch.tag_vocabulary)
+            tag_codes.append(remap[batch.tag_codes] if len(batch.tag_codes) else batch.tag_codes)
+            tag_offsets.append(batch.tag_offsets[1:] + shift)
+            shift += batch.tag_offsets[-1]
+
+        return cls(
+            columns,
+            categoricals,
+            np.concatenate(tag_offsets),
+            np.concatenate(tag_codes).astype(cls._code_dtype(len(tag_vocabulary))),
+            np.asarray(tag_vocabulary, dtype=object)
+        )
+
+    def take(self, indices: np.ndarray) -> "LevelBatch":
+        """Sélectionne des niveaux par position (ou masque booléen)."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+
+        starts = self.tag_offsets[indices]
+        counts = self.tag_offsets[indices + 1] - starts
+        tag_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        # Positions des tags conservés, sans boucle Python
+        tag_positions = np.repeat(starts - tag_offsets[:-1], counts) + np.arange(tag_offsets[-1])
+
+        return LevelBatch(
+            {field: values[indices] for field, values in self.columns.items()},
+            {field: values[indices] for field, values in self.categoricals.items()},
+            tag_offsets,
+            self.tag_codes[tag_positions],
+            self.tag_vocabulary
+        )
+
+    def to_frame(self, include_tags: bool = True) -> pd.DataFrame:
+        """
+        Construit un DataFrame dont les colonnes numériques et catégorielles
+        référencent les tableaux du lot (pas de copie).
+        Args:
+            include_tags: Matérialise les tags en listes de chaînes
+        """
+        data = {}
+        for field in self.field_order:
+            if field in self.columns:
+                data[field] = self.columns[field]
+            elif field in self.categoricals:
+                data[field] = self.categoricals[field]
+            elif field == "tags" and include_tags:
+                data[field] = self.tag_lists()
+        return pd.DataFrame(data, copy=False)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Retourne les niveaux sous forme de liste de dictionnaires."""
+        return self.to_frame().to_dict(orient="records")
+
+    def tag_lists(self) -> List[List[str]]:
+        """Tags de tous les niveaux, sous forme de listes."""
+        values = self.tag_vocabulary[self.tag_codes].tolist()
+        ends = self.tag_offsets[1:].tolist()
+        starts = self.tag_offsets[:-1].tolist()
+        return [values[a:b] for a, b in zip(starts, ends)]
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les tableaux du lot (hors chaînes référencées)."""
+        total = self.tag_offsets.nbytes + self.tag_codes.nbytes
+        total += sum(values.nbytes for values in self.columns.values())
+        total += sum(values.codes.nbytes for values in self.categoricals.values())
+        return total
+
+    @classmethod
+    def encode_tags(cls, tags: pd.Series):
+        """Encode une colonne de tags en (offsets, codes, vocabulaire)."""
+        tag_lists = [cls._as_tag_list(value) for value in tags]
+        counts = np.fromiter(map(len, tag_lists), dtype=np.int64, count=len(tag_lists))
+        tag_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        flat = list(chain.from_iterable(tag_lists))
+        codes, vocabulary = pd.factorize(pd.Series(flat, dtype=object))
+        return tag_offsets, codes.astype(cls._code_dtype(len(vocabulary))), np.asarray(vocabulary, dtype=object)
+
+    @staticmethod
+    def _as_tag_list(value: Any) -> List[str]:
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return list(value)
+        if isinstance(value, str):
+            return [tag.strip() for tag in value.split(",") if tag.strip()]
+        return []
+
+    @staticmethod
+    def _code_dtype(cardinality: int) -> np.dtype:
+        """Plus petit type entier capable de coder cardinality valeurs."""
+        for dtype in (np.int8, np.int16, np.int32):
+            if cardinality <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+        return np.dtype(np.int64)
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Iterator
+
+
+class LevelGenerator:
+    """
+    Génère des niveaux synthétiques réalistes, colonne par colonne, pour les tests
+    de charge et de passage à l'échelle du pipeline.
+
+    Les colonnes produites ont le même schéma que game_levels.csv et alimentent
+    directement DataPreprocessor.process_data et DatasetBuilder.build_dataset.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        difficulty_weights: Optional[Dict[str, float]] = None,
+        difficulty_profiles: Optional[Dict[str, tuple]] = None,
+        tag_weights: Optional[Dict[str, float]] = None,
+        n_makers: int = 1000,
+        maker_skew: float = 1.1,
+        mean_tags: float = 2.0,
+        attempts_log_mean: float = 4.0,
+        attempts_log_std: float = 1.0
+    ):
+        """
+        Args:
+            seed: Graine du générateur aléatoire (reproductibilité)
+            difficulty_weights: Proportion de chaque difficulté
+            difficulty_profiles: Paramètres (a, b) de la loi Beta du difficulty_score par difficulté
+            tag_weights: Fréquence relative de chaque tag
+            n_makers: Nombre de créateurs distincts
+            maker_skew: Exposant de la loi de Zipf des créateurs (quelques créateurs très prolifiques)
+            mean_tags: Nombre moyen de tags par niveau
+            attempts_log_mean: Moyenne du log du nombre de tentatives pour un niveau facile
+            attempts_log_std: Écart-type du log du nombre de tentatives
+        """
+        self.difficulty_weights = difficulty_weights or {
+            "easy": 0.30,
+            "normal": 0.35,
+            "hard": 0.25,
+            "expert": 0.10
+        }
+        self.difficulty_profiles = difficulty_profiles or {
+            "easy": (2.0, 8.0),
+            "normal": (4.0, 6.0),
+            "hard": (6.0, 4.0),
+            "expert": (8.0, 2.0)
+        }
+        self.tag_weights = tag_weights or {
+            "platformer": 0.25,
+            "speedrun": 0.12,
+            "puzzle": 0.15,
+            "technical": 0.10,
+            "auto": 0.06,
+            "music": 0.05,
+            "kaizo": 0.04,
+            "themed": 0.08,
+            "multiplayer": 0.05,
+            "boss": 0.06,
+            "short": 0.04
+        }
+        self.n_makers = n_makers
+        self.maker_skew = maker_skew
+        self.mean_tags = mean_tags
+        self.attempts_log_mean = attempts_log_mean
+        self.attempts_log_std = attempts_log_std
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, n_levels: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Génère des niveaux au format attendu par DataPreprocessor.process_data.
+        Returns:
+            Dictionnaire contenant les niveaux avec la clé 'levels'
+        """
+        return {"levels": self.generate_frame(n_levels).to_dict(orient="records")}
+
+    def generate_frame(self, n_levels: int) -> pd.DataFrame:
+        """Génère n_levels niveaux sous forme de DataFrame."""
+        return pd.DataFrame(self.generate_columns(n_levels))
+
+    def iter_frames(self, n_levels: int, batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Génère n_levels niveaux par lots pour borner la mémoire sur plusieurs millions de lignes."""
+        offset = 0
+        while offset < n_levels:
+            size = min(batch_size, n_levels - offset)
+            yield pd.DataFrame(self.generate_columns(size, start=offset))
+            offset += size
+
+    def generate_columns(self, n_levels: int, start: int = 0) -> Dict[str, Any]:
+        """
+        Génère les colonnes de n_levels niveaux en une seule passe vectorisée.
+        Args:
+            n_levels: Nombre de niveaux à générer
+            start: Numéro du premier niveau (pour les titres des lots successifs)
+        Returns:
+            Dictionnaire colonne -> tableau NumPy (les tags sont des listes de chaînes)
+        """
+        rng = self.rng
+        n = n_levels
+
+        # Difficulté et score de difficulté (Beta par catégorie)
+        names = np.array(list(self.difficulty_weights))
+        weights = np.array(list(self.difficulty_weights.values()), dtype=float)
+        codes = rng.choice(len(names), size=n, p=weights / weights.sum())
+        profiles = np.array([self.difficulty_profiles[name] for name in names], dtype=float)
+        difficulty_score = rng.beta(profiles[codes, 0], profiles[codes, 1])
+
+        # Probabilité de réussite décroissante avec la difficulté
+        clear_prob = rng.beta(1.0 + 9.0 * (1.0 - difficulty_score), 1.0 + 9.0 * difficulty_score)
+
+        # Tentatives log-normales, plus nombreuses pour les niveaux difficiles
+        log_attempts = rng.normal(self.attempts_log_mean + 2.0 * difficulty_score, self.attempts_log_std)
+        attempts = np.exp(log_attempts).astype(np.int64) + 1
+        clears = rng.binomial(attempts, clear_prob)
+        clear_rate = np.round(100.0 * clears / attempts, 2)
+
+        completion_rate = np.clip(clear_prob + rng.normal(0.0, 0.05, n), 0.0, 1.0)
+
+        # Engagement maximal pour une difficulté intermédiaire
+        engagement_score = np.clip(
+            1.0 - 1.5 * np.abs(difficulty_score - 0.55) + rng.normal(0.0, 0.1, n), 0.0, 1.0
+        )
+        popularity_score = np.clip(
+            0.6 * engagement_score + 0.4 * log_attempts / (self.attempts_log_mean + 2.0 + 3.0 * self.attempts_log_std)
+            + rng.normal(0.0, 0.05, n),
+            0.0, 1.0
+        )
+        likes = rng.poisson(0.05 * attempts * engagement_score)
+
+        return {
+            "level_id": self._generate_uuids(n),
+            "title": np.char.add("Level ", np.arange(start + 1, start + n + 1).astype(str)).astype(object),
+            "maker": self._generate_makers(n),
+            "difficulty": names[codes].astype(object),
+            "clear_rate": clear_rate,
+            "attempts": attempts,
+            "clears": clears,
+            "likes": likes,
+            "tags": self._generate_tags(n),
+            "completion_rate": np.round(completion_rate, 3),
+            "difficulty_score": np.round(difficulty_score, 3),
+            "popularity_score": np.round(popularity_score, 3),
+            "engagement_score": np.round(engagement_score, 3)
+        }
+
+    def _generate_uuids(self, n: int) -> np.ndarray:
+        """Génère des UUID4 sous forme de chaînes, sans boucle Python."""
+        raw = self.rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # variante RFC 4122
+
+        hex_digits = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+        chars = np.empty((n, 32), dtype=np.uint8)
+        chars[:, 0::2] = hex_digits[raw >> 4]
+        chars[:, 1::2] = hex_digits[raw & 0x0F]
+
+        dash = np.full((n, 1), ord("-"), dtype=np.uint8)
+        uuids = np.hstack([chars[:, :8], dash, chars[:, 8:12], dash, chars[:, 12:16], dash,
+                           chars[:, 16:20], dash, chars[:, 20:]])
+        return np.ascontiguousarray(uuids).view("S36").ravel().astype(str).astype(object)
+
+    def _generate_makers(self, n: int) -> np.ndarray:
+        """Répartit les niveaux entre créateurs selon une loi de Zipf tronquée."""
+        ranks = np.arange(1, self.n_makers + 1, dtype=float)
+        weights = ranks ** -self.maker_skew
+        makers = self.rng.choice(self.n_makers, size=n, p=weights / weights.sum())
+        names = np.char.add("Player ", np.arange(1, self.n_makers + 1).astype(str)).astype(object)
+        return names[makers]
+
+    def _generate_tags(self, n: int) -> List[List[str]]:
+        """Tire 1 à len(vocabulaire) tags distincts par niveau, pondérés par tag_weights."""
+        vocabulary = np.array(list(self.tag_weights), dtype=object)
+        weights = np.array(list(self.tag_weights.values()), dtype=float)
+        n_tags = len(vocabulary)
+
+        counts = np.clip(self.rng.poisson(self.mean_tags, n), 1, n_tags)
+        max_count = int(counts.max()) if n else 0
+
+        # Tirage pondéré sans remise : top-k de log(poids) + bruit de Gumbel
+        keys = np.log(weights) + self.rng.gumbel(size=(n, n_tags))
+        order = np.argsort(-keys, axis=1)[:, :max_count]
+        mask = np.arange(max_count) < counts[:, None]
+
+        values = vocabulary[order[mask]].tolist()
+        ends = np.cumsum(counts).tolist()
+        starts = [0] + ends[:-1]
+        return [values[a:b] for a, b in zip(starts, ends)]
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Union
+from src.level_batch import LevelBatch
+
+
+class LevelCube:
+    """
+    Cube d'agrégats additifs par difficulté x tag x tranche de créateur.
+
+    Chaque cellule stocke, pour chaque mesure, l'effectif des valeurs présentes, leur
+    somme et la somme des carrés des écarts à la moyenne de la cellule (M2) ; moyenne
+    et variance d'une tranche quelconque s'obtiennent en fusionnant quelques cellules
+    (formule de Chan, comme MomentAccumulator), sans relire le dataset.
+
+    Un niveau compte dans la cellule de chacun de ses tags et dans la cellule du tag
+    ALL_TAGS ; une tranche filtre donc au plus un tag (sinon un niveau portant deux des
+    tags demandés serait compté deux fois).
+    """
+
+    ALL_TAGS = "*"
+    measures = [
+        "difficulty_score", "popularity_score", "engagement_score", "completion_rate",
+        "clear_rate", "likes", "attempts", "clears"
+    ]
+
+    def __init__(
+        self,
+        difficulties: List[str],
+        tags: List[str],
+        maker_buckets: List[str],
+        levels: np.ndarray,
+        counts: np.ndarray,
+        sums: np.ndarray,
+        m2: np.ndarray,
+        measures: Optional[List[str]] = None
+    ):
+        self.difficulties = list(difficulties)
+        self.tags = list(tags)
+        self.maker_buckets = list(maker_buckets)
+        self.levels = levels  # (difficulté, tag, tranche)
+        self.counts = counts  # (difficulté, tag, tranche, mesure)
+        self.sums = sums
+        self.m2 = m2
+        self.measures = list(measures or self.measures)
+        self._positions = {
+            "difficulty": {value: i for i, value in enumerate(self.difficulties)},
+            "tag": {value: i for i, value in enumerate(self.tags)},
+            "maker_bucket": {value: i for i, value in enumerate(self.maker_buckets)}
+        }
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, maker_ranks: Sequence[int] = (10, 100)) -> "LevelCube":
+        """
+        Construit le cube en une passe vectorisée.
+        Args:
+            df : Dataset (tags en listes ou chaînes séparées par des virgules)
+            maker_ranks : Rangs limites des tranches de créateurs, classés par nombre de
+                niveaux : (10, 100) donne top_10, top_100 (rangs 11 à 100) et other
+        """
+        measures = [col for col in cls.measures if col in df.columns]
+        difficulty_codes, difficulties = pd.factorize(df["difficulty"].astype(object), sort=True)
+        bucket_codes, maker_buckets = cls._maker_buckets(df["maker"], maker_ranks)
+
+        tags = df["tags"] if "tags" in df.columns else pd.Series([[]] * len(df), dtype=object)
+        tag_offsets, tag_codes, vocabulary = LevelBatch.encode_tags(tags)
+        order = np.argsort(vocabulary.astype(str), kind="stable")
+        remap = np.empty(len(vocabulary), dtype=np.int64)
+        remap[order] = np.arange(len(vocabulary))
+        tag_names = [cls.ALL_TAGS] + vocabulary[order].astype(str).tolist()
+
+        # Une ligne par (niveau, tag) plus une ligne par niveau pour ALL_TAGS
+        n_rows = len(df)
+        rows = np.concatenate([np.arange(n_rows), np.repeat(np.arange(n_rows), np.diff(tag_offsets))])
+        tag_index = np.concatenate([np.zeros(n_rows, dtype=np.int64), remap[tag_codes] + 1])
+
+        shape = (len(difficulties), len(tag_names), len(maker_buckets))
+        valid = difficulty_codes[rows] >= 0  # Niveaux sans difficulté exclus
+        cells = np.ravel_multi_index(
+            (difficulty_codes[rows][valid], tag_index[valid], bucket_codes[rows][valid]), shape
+        )
+        rows = rows[valid]
+        n_cells = int(np.prod(shape))
+
+        levels = np.bincount(cells, minlength=n_cells).reshape(shape)
+        values = df[measures].to_numpy(dtype=np.float64)[rows]
+        present = ~np.isnan(values)
+        values = np.where(present, values, 0.0)
+        counts = np.stack([np.bincount(cells, weights=present[:, m], minlength=n_cells) for m in range(len(measures))], axis=-1)
+        sums = np.stack([np.bincount(cells, weights=values[:, m], minlength=n_cells) for m in range(len(measures))], axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cell_means = np.where(counts > 0, sums / counts, 0.0)
+        # Écarts à la moyenne de la cellule : pas de différence de grandes sommes
+        deviations = np.where(present, values - cell_means[cells], 0.0)
+        m2 = np.stack([np.bincount(cells, weights=deviations[:, m] ** 2, minlength=n_cells) for m in range(len(measures))], axis=-1)
+
+        return cls(
+            [str(d) for d in difficulties], tag_names, list(maker_buckets), levels,
+            counts.reshape(shape + (len(measures),)),
+            sums.reshape(shape + (len(measures),)),
+            m2.reshape(shape + (len(measures),)),
+            measures
+        )
+
+    def slice(
+        self,
+        difficulty: Optional[Union[str, Sequence[str]]] = None,
+        tag: Optional[str] = None,
+        maker_bucket: Optional[Union[str, Sequence[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Statistiques d'une tranche, par exemple slice("hard", "speedrun", ["top_10", "top_100"]).
+        Args:
+            difficulty : Difficulté(s) retenue(s) (toutes si None)
+            tag : Tag retenu (tous si None)
+            maker_bucket : Tranche(s) de créateurs retenue(s) (toutes si None)
+        Returns:
+            {"levels": nombre de niveaux, "<mesure>": {"count", "sum", "mean", "variance", "std"}}
+        """
+        index = np.ix_(
+            self._select("difficulty", difficulty),
+            self._select("tag", self.ALL_TAGS if tag is None else tag),
+            self._select("maker_bucket", maker_bucket)
+        )
+        cell_counts = self.counts[index].reshape(-1, len(self.measures))
+        cell_sums = self.sums[index].reshape(-1, len(self.measures))
+        counts = cell_counts.sum(axis=0)
+        sums = cell_sums.sum(axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+            cell_means = np.where(cell_counts > 0, cell_sums / cell_counts, 0.0)
+            # Fusion de Chan de toutes les cellules : M2 = somme des M2 + sum n_i (moyenne_i - moyenne)^2
+            m2 = self.m2[index].reshape(-1, len(self.measures)).sum(axis=0)
+            m2 = m2 + (cell_counts * (cell_means - np.nan_to_num(means)) ** 2).sum(axis=0)
+            variances = np.where(counts > 1, m2 / (counts - 1), np.nan)
+
+        result = {"levels": int(self.levels[index].sum())}
+        for m, measure in enumerate(self.measures):
+            result[measure] = {
+                "count": int(counts[m]),
+                "sum": float(sums[m]),
+                "mean": float(means[m]),
+                "variance": float(variances[m]),
+                "std": float(np.sqrt(variances[m]))
+            }
+        return result
+
+    def to_frame(self) -> pd.DataFrame:
+        """Cellules non vides du cube : une ligne par (difficulté, tag, tranche)."""
+        index = pd.MultiIndex.from_product(
+            [self.difficulties, self.tags, self.maker_buckets], names=["difficulty", "tag", "maker_bucket"]
+        )
+        n_measures = len(self.measures)
+        data = {"levels": self.levels.ravel()}
+        for m, measure in enumerate(self.measures):
+            data[f"{measure}_count"] = self.counts.reshape(-1, n_measures)[:, m]
+            data[f"{measure}_sum"] = self.sums.reshape(-1, n_measures)[:, m]
+            data[f"{measure}_m2"] = self.m2.reshape(-1, n_measures)[:, m]
+        frame = pd.DataFrame(data, index=index)
+        return frame[frame["levels"] > 0]
+
+    def save(self, path: Union[str, Path]):
+        """Enregistre le cube (format .npz compressé)."""
+        np.savez_compressed(
+            path,
+            difficulties=np.array(self.difficulties, dtype=str),
+            tags=np.array(self.tags, dtype=str),
+            maker_buckets=np.array(self.maker_buckets, dtype=str),
+            measures=np.array(self.measures, dtype=str),
+            levels=self.levels,
+            counts=self.counts,
+            sums=self.sums,
+            m2=self.m2
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "LevelCube":
+        """Recharge un cube enregistré par save."""
+        with np.load(path, allow_pickle=False) as data:
+            if "m2" in data:
+                m2 = data["m2"]
+            else:
+                # Cube enregistré avec la somme des carrés : M2 = sumsq - sum^2 / n
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    m2 = np.maximum(data["sumsq"] - np.where(data["counts"] > 0, data["sums"] ** 2 / data["counts"], 0.0), 0.0)
+            return cls(
+                data["difficulties"].tolist(),
+                data["tags"].tolist(),
+                data["maker_buckets"].tolist(),
+                data["levels"],
+                data["counts"],
+                data["sums"],
+                m2,
+                data["measures"].tolist()
+            )
+
+    def _select(self, dimension: str, values: Optional[Union[str, Sequence[str]]]) -> List[int]:
+        positions = self._positions[dimension]
+        if values is None:
+            return list(positions.values())
+        if isinstance(values, str):
+            values = [values]
+        return [positions[value] for value in values if value in positions]
+
+    @staticmethod
+    def _maker_buckets(makers: pd.Series, maker_ranks: Sequence[int]):
+        """Tranche de chaque niveau selon le rang de son créateur (nombre de niveaux décroissant)."""
+        ranks = sorted(maker_ranks)
+        labels = [f"top_{rank}" for rank in ranks] + ["other"]
+
+        codes, uniques = pd.factorize(makers.astype(object))
+        level_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        maker_rank = np.empty(len(uniques), dtype=np.int64)
+        maker_rank[np.argsort(-level_counts, kind="stable")] = np.arange(1, len(uniques) + 1)
+
+        maker_bucket = np.searchsorted(np.array(ranks), maker_rank, side="left")
+        # Créateur inconnu : tranche "other"
+        bucket_codes = np.where(codes >= 0, maker_bucket[codes], len(ranks))
+        return bucket_codes, labels
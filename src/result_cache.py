@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+class ResultCache:
+    """
+    Cache persistant et borné en taille des résultats d'analyse.
+
+    Chaque entrée est un fichier pickle (<clé>.pkl) ; index.json garde pour chaque
+    clé sa section, le hash du dataset, sa taille et son dernier accès. Au-delà de
+    max_bytes, les entrées les moins récemment utilisées sont supprimées.
+    """
+
+    def __init__(self, cache_dir: Path = Path("analysis_output") / "cache", max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir : Répertoire du cache
+            max_bytes : Taille maximale du cache sur disque
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self._index = self._load_index()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Clé stable à partir de valeurs sérialisables en JSON (hash, section, configuration...)."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Valeur en cache, ou None ; un accès rafraîchit l'entrée pour l'éviction LRU."""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        path = self.cache_dir / entry["file"]
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # Fichier supprimé ou tronqué : l'entrée est abandonnée
+            self._index.pop(key, None)
+            self._save_index()
+            return None
+
+        entry["last_access"] = time.time()
+        self._save_index()
+        return value
+
+    def put(self, key: str, value: Any, section: str, content_hash: str):
+        """Enregistre une valeur puis applique la limite de taille."""
+        file_name = f"{key}.pkl"
+        tmp_path = self.cache_dir / f"{file_name}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_dir / file_name)
+
+        self._index[key] = {
+            "file": file_name,
+            "section": section,
+            "content_hash": content_hash,
+            "size": (self.cache_dir / file_name).stat().st_size,
+            "last_access": time.time()
+        }
+        self._evict()
+        self._save_index()
+
+    def invalidate(self, section: Optional[str] = None, content_hash: Optional[str] = None) -> int:
+        """
+        Supprime les entrées d'une section et/ou d'un dataset (tout le cache sans argument).
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        keys = [
+            key for key, entry in self._index.items()
+            if (section is None or entry["section"] == section)
+            and (content_hash is None or entry["content_hash"] == content_hash)
+        ]
+        self._remove(keys)
+        self._save_index()
+        if keys:
+            logging.info(f"Cache d'analyse : {len(keys)} entrées invalidées")
+        return len(keys)
+
+    @property
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self._index.values())
+
+    def _evict(self):
+        total = self.size
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            evicted.append(key)
+        self._remove(evicted)
+        logging.info(f"Cache d'analyse : {len(evicted)} entrées évincées (LRU)")
+
+    def _remove(self, keys: List[str]):
+        for key in keys:
+            entry = self._index.pop(key)
+            path = self.cache_dir / entry["file"]
+            if path.exists():
+                path.unlink()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, "r") as f:
+            return json.load(f)
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,226 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+
+def _json_default(value: Any) -> Any:
+    """Convertit les scalaires et tableaux NumPy en types JSON natifs."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Type non sérialisable : {type(value).__name__}")
+
+
+def _encode(obj: Any) -> bytes:
+    """Encodage JSON compact et déterministe (clés triées, sans espaces)."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+class SnapshotStore:
+    """
+    Stockage adressé par contenu des collectes brutes.
+
+    Organisation du répertoire :
+        packs/<sha>.jsonl.gz      niveaux (un JSON compact par ligne), compressés
+        manifests/<sha>.json.gz   liste ordonnée [level_id, hash du niveau, pack]
+        objects/<sha>.txt.gz      hashes des niveaux de chaque pack (écrit une fois, avec le pack)
+        index.json                historique horodatage -> snapshot (et commit source)
+
+    Un snapshot ne réécrit que les niveaux jamais stockés : un niveau déjà présent
+    dans un snapshot quelconque (même contenu, level_id compris dans le hash) est
+    référencé dans son pack d'origine, même si le snapshot précédent ne contenait
+    qu'un delta. Une collecte identique produit le même manifeste et n'est stockée
+    qu'une fois. Un snapshot n'écrit que la liste d'objets de son nouveau pack : le
+    coût d'écriture suit le delta, non l'historique.
+    """
+
+    def __init__(self, root: Path = Path("data") / "snapshots"):
+        self.root = Path(root)
+        self.packs_dir = self.root / "packs"
+        self.manifests_dir = self.root / "manifests"
+        self.index_path = self.root / "index.json"
+        self.objects_dir = self.root / "objects"
+        self.objects_path = self.root / "objects.json.gz"  # Table unique des versions antérieures
+        self.packs_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        self._objects: Dict[str, str] = {}  # hash du niveau -> pack, listes déjà lues
+        self._object_lists = set()
+
+    def save(self, data: Dict[str, List[Dict[str, Any]]]) -> str:
+        """
+        Enregistre une collecte brute.
+        Args:
+            data: Dictionnaire contenant les niveaux avec la clé 'levels' (et
+                éventuellement 'source_commit', conservé dans l'index)
+        Returns:
+            Identifiant (hash) du snapshot
+        """
+        known = self._known_objects()
+
+        entries = []
+        new_records = []
+        for record in data.get("levels", []):
+            encoded = _encode(record)
+            record_hash = hashlib.sha1(encoded).hexdigest()
+            level_id = str(record.get("level_id", record_hash))
+            if record_hash in known:
+                pack = known[record_hash]
+            else:
+                pack = None
+                new_records.append(encoded)
+            entries.append([level_id, record_hash, pack])
+
+        if new_records:
+            pack = self._write_blob(self.packs_dir, b"\n".join(new_records), ".jsonl.gz")
+            for entry in entries:
+                if entry[2] is None:
+                    entry[2] = pack
+            self._save_objects(pack, [hashlib.sha1(record).hexdigest() for record in new_records])
+
+        snapshot_id = self._write_blob(self.manifests_dir, _encode({"levels": entries}), ".json.gz")
+        self._append_to_index(snapshot_id, len(entries), len(new_records), data.get("source_commit"))
+
+        logging.info(
+            f"Snapshot {snapshot_id[:12]} enregistré : {len(entries)} niveaux, "
+            f"{len(new_records)} nouveaux"
+        )
+        return snapshot_id
+
+    def load(self, snapshot_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Recharge un snapshot (le plus récent si snapshot_id est None).
+        Returns:
+            Dictionnaire contenant les niveaux avec la clé 'levels', dans l'ordre d'origine
+        """
+        if snapshot_id is None:
+            snapshots = self.list_snapshots()
+            if not snapshots:
+                return {"levels": []}
+            snapshot_id = snapshots[-1]["snapshot"]
+
+        entries = self._read_manifest(snapshot_id)
+
+        records_by_pack: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for pack in {entry[2] for entry in entries}:
+            records_by_pack[pack] = self._read_pack(pack)
+
+        return {"levels": [records_by_pack[pack][record_hash] for _, record_hash, pack in entries]}
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """Retourne l'historique des snapshots, du plus ancien au plus récent."""
+        if not self.index_path.exists():
+            return []
+        with open(self.index_path, "r") as f:
+            return json.load(f)["snapshots"]
+
+    def _known_objects(self) -> Dict[str, str]:
+        """
+        Associe hash du niveau -> pack pour tous les niveaux déjà stockés. Seules les
+        listes d'objets pas encore lues par cette instance sont lues.
+        """
+        if not self.objects_dir.exists():
+            self._migrate_objects()
+
+        for path in self.objects_dir.glob("*.txt.gz"):
+            pack = path.name.split(".")[0]
+            if pack in self._object_lists:
+                continue
+            with open(path, "rb") as f:
+                self._objects.update(dict.fromkeys(gzip.decompress(f.read()).decode("ascii").split(), pack))
+            self._object_lists.add(pack)
+        return self._objects
+
+    def _save_objects(self, pack: str, record_hashes: List[str]):
+        """Écrit la liste des objets d'un nouveau pack ; les autres listes ne sont pas touchées."""
+        path = self.objects_dir / f"{pack}.txt.gz"
+        if not path.exists():
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress("\n".join(record_hashes).encode("ascii"), mtime=0))
+            os.replace(tmp_path, path)
+        self._objects.update(dict.fromkeys(record_hashes, pack))
+        self._object_lists.add(pack)
+
+    def _migrate_objects(self):
+        """
+        Crée les listes d'objets par pack d'un store antérieur, depuis la table unique
+        objects.json.gz ou, à défaut, depuis l'ensemble des manifestes.
+        """
+        if self.objects_path.exists():
+            with open(self.objects_path, "rb") as f:
+                known = json.loads(gzip.decompress(f.read()))
+        else:
+            known = {}
+            for snapshot in self.list_snapshots():
+                for _, record_hash, pack in self._read_manifest(snapshot["snapshot"]):
+                    known[record_hash] = pack
+
+        by_pack: Dict[str, List[str]] = {}
+        for record_hash, pack in known.items():
+            by_pack.setdefault(pack, []).append(record_hash)
+
+        tmp_dir = self.objects_dir.with_name(self.objects_dir.name + ".tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+        for pack, record_hashes in by_pack.items():
+            with open(tmp_dir / f"{pack}.txt.gz", "wb") as f:
+                f.write(gzip.compress("\n".join(record_hashes).encode("ascii"), mtime=0))
+        # Remplacement en une étape pour ne jamais exposer un répertoire incomplet
+        os.replace(tmp_dir, self.objects_dir)
+        if self.objects_path.exists():
+            os.remove(self.objects_path)
+
+    def _read_manifest(self, snapshot_id: str) -> List[List[str]]:
+        path = self.manifests_dir / f"{snapshot_id}.json.gz"
+        with open(path, "rb") as f:
+            return json.loads(gzip.decompress(f.read()))["levels"]
+
+    def _read_pack(self, pack: str) -> Dict[str, Dict[str, Any]]:
+        path = self.packs_dir / f"{pack}.jsonl.gz"
+        with open(path, "rb") as f:
+            lines = gzip.decompress(f.read()).split(b"\n")
+        return {hashlib.sha1(line).hexdigest(): json.loads(line) for line in lines}
+
+    def _write_blob(self, directory: Path, payload: bytes, suffix: str) -> str:
+        """Écrit un blob compressé nommé par son hash ; ne réécrit jamais un blob existant."""
+        blob_id = hashlib.sha256(payload).hexdigest()
+        path = directory / f"{blob_id}{suffix}"
+        if not path.exists():
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                # mtime=0 : même contenu, mêmes octets
+                f.write(gzip.compress(payload, mtime=0))
+            os.replace(tmp_path, path)
+        return blob_id
+
+    def _append_to_index(self, snapshot_id: str, n_levels: int, n_new: int, source_commit: Optional[str] = None):
+        """Ajoute le snapshot à l'index ; une collecte identique à la précédente prolonge son entrée."""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        snapshots = self.list_snapshots()
+        if snapshots and snapshots[-1]["snapshot"] == snapshot_id:
+            snapshots[-1]["last_seen"] = timestamp
+            if source_commit:
+                snapshots[-1]["source_commit"] = source_commit
+        else:
+            snapshots.append({
+                "timestamp": timestamp,
+                "last_seen": timestamp,
+                "snapshot": snapshot_id,
+                "levels": n_levels,
+                "new_levels": n_new,
+                "source_commit": source_commit
+            })
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"snapshots": snapshots}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,291 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Sequence
+
+
+class MomentAccumulator:
+    """
+    Moyenne et variance en ligne (Welford, fusion de Chan) pour plusieurs colonnes.
+
+    Les valeurs manquantes sont ignorées colonne par colonne, comme Series.mean/std.
+    Le résultat est exact aux arrondis flottants près.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+
+    def update(self, values: np.ndarray):
+        """Ajoute un bloc de lignes (tableau n x k)."""
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self._combine(count, mean, m2)
+
+    def merge(self, other: "MomentAccumulator"):
+        self._combine(other.count, other.mean, other.m2)
+
+    def _combine(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray):
+        total = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = self.m2 + m2 + np.where(total > 0, delta ** 2 * self.count * count / total, 0.0)
+        self.count = total
+
+    def means(self) -> pd.Series:
+        return pd.Series(np.where(self.count > 0, self.mean, np.nan), index=self.columns)
+
+    def std(self) -> pd.Series:
+        """Écart-type corrigé (ddof=1)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+        return pd.Series(np.sqrt(variance), index=self.columns)
+
+
+class QuantileSketch:
+    """
+    Esquisse de quantiles à erreur relative bornée (buckets logarithmiques, type DDSketch).
+
+    Une valeur x > 0 tombe dans le bucket k = ceil(log_gamma(x)) avec
+    gamma = (1 + alpha) / (1 - alpha) ; les valeurs négatives sont rangées de la même
+    façon sur |x| et les zéros comptés à part. Deux esquisses se fusionnent en
+    additionnant les compteurs.
+
+    Borne d'erreur : le quantile q renvoyé est à moins de alpha (en relatif) de
+    l'observation de rang floor(q * (n - 1)) ; l'interpolation linéaire de pandas
+    se situe entre cette observation et la suivante.
+    """
+
+    def __init__(self, alpha: float = 0.005):
+        self.alpha = alpha
+        self.gamma = (1.0 + alpha) / (1.0 - alpha)
+        self._log_gamma = np.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zeros = 0
+
+    @property
+    def count(self) -> int:
+        return self.zeros + sum(self.positive.values()) + sum(self.negative.values())
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.zeros += int(np.count_nonzero(values == 0))
+        self._add(self.positive, values[values > 0])
+        self._add(self.negative, -values[values < 0])
+
+    def merge(self, other: "QuantileSketch"):
+        self.zeros += other.zeros
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+
+    def quantiles(self, levels: Sequence[float]) -> List[float]:
+        n = self.count
+        if not n:
+            return [np.nan] * len(levels)
+
+        # Valeurs représentatives de chaque bucket, dans l'ordre croissant
+        neg_keys = np.array(sorted(self.negative, reverse=True), dtype=np.int64)
+        pos_keys = np.array(sorted(self.positive), dtype=np.int64)
+        values = np.concatenate([-self._value(neg_keys), [0.0], self._value(pos_keys)])
+        counts = np.concatenate([
+            [self.negative[k] for k in neg_keys.tolist()], [self.zeros], [self.positive[k] for k in pos_keys.tolist()]
+        ]).astype(np.int64)
+
+        cumulative = np.cumsum(counts)
+        ranks = np.floor(np.asarray(levels, dtype=float) * (n - 1))
+        return values[np.searchsorted(cumulative, ranks, side="right")].tolist()
+
+    def _add(self, store: Dict[int, int], values: np.ndarray):
+        if not len(values):
+            return
+        keys, counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def _value(self, keys: np.ndarray) -> np.ndarray:
+        return 2.0 * self.gamma ** keys.astype(float) / (self.gamma + 1.0)
+
+
+class CorrelationAccumulator:
+    """
+    Corrélations de Pearson en ligne, par paires de colonnes.
+
+    Pour chaque paire, seules les lignes où les deux valeurs sont présentes comptent
+    (comme DataFrame.corr) ; effectifs, moyennes, moments d'ordre 2 et co-moment sont
+    fusionnés bloc par bloc (formule de Chan). Exact aux arrondis flottants près.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros((k, k))
+        self.mean_x = np.zeros((k, k))
+        self.mean_y = np.zeros((k, k))
+        self.m2_x = np.zeros((k, k))
+        self.m2_y = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+
+    def update(self, values: np.ndarray):
+        """Ajoute un bloc de lignes (tableau n x k)."""
+        valid = ~np.isnan(values)
+        mask = valid.astype(np.float64)
+        # Décalage par la moyenne du bloc pour limiter les annulations numériques
+        shift = np.zeros(values.shape[1])
+        present = valid.any(axis=0)
+        shift[present] = np.nanmean(values[:, present], axis=0)
+        shifted = np.where(valid, values - shift, 0.0)
+
+        # Sommes restreintes, pour chaque paire (i, j), aux lignes où i et j sont présents
+        count = mask.T @ mask
+        sum_x = shifted.T @ mask
+        sum_xx = (shifted ** 2).T @ mask
+        sum_xy = shifted.T @ shifted
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x = np.where(count > 0, sum_x / count, 0.0)
+        mean_y = mean_x.T
+        m2_x = sum_xx - count * mean_x ** 2
+        m2_y = sum_xx.T - count * mean_y ** 2
+        comoment = sum_xy - count * mean_x * mean_y
+
+        self._combine(count, mean_x + shift[:, None], mean_y + shift[None, :], m2_x, m2_y, comoment)
+
+    def merge(self, other: "CorrelationAccumulator"):
+        self._combine(other.count, other.mean_x, other.mean_y, other.m2_x, other.m2_y, other.comoment)
+
+    def _combine(self, count, mean_x, mean_y, m2_x, m2_y, comoment):
+        total = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, self.count * count / total, 0.0)
+            delta_x = mean_x - self.mean_x
+            delta_y = mean_y - self.mean_y
+            self.mean_x = np.where(total > 0, self.mean_x + delta_x * count / total, 0.0)
+            self.mean_y = np.where(total > 0, self.mean_y + delta_y * count / total, 0.0)
+        self.m2_x = self.m2_x + m2_x + delta_x ** 2 * weight
+        self.m2_y = self.m2_y + m2_y + delta_y ** 2 * weight
+        self.comoment = self.comoment + comoment + delta_x * delta_y * weight
+        self.count = total
+
+    def matrix(self) -> pd.DataFrame:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comoment / np.sqrt(self.m2_x * self.m2_y)
+        corr = np.where(self.count > 1, np.clip(corr, -1.0, 1.0), np.nan)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class StreamingAggregator:
+    """
+    Accumulateurs fusionnables produisant les mêmes agrégats que DataAnalyzer._aggregate,
+    bloc par bloc, sans jamais charger le dataset entier.
+
+    Bornes d'erreur par rapport au calcul en mémoire :
+        - effectifs, sommes, moyennes par difficulté, ratio tentatives/réussites : exacts
+        - moyennes, écart-type, corrélations : exacts aux arrondis flottants près (~1e-12 ;
+          ~1e-7 face au calcul en mémoire sur des colonnes float32, fait en simple précision)
+        - quantiles et médianes : erreur relative <= quantile_alpha (voir QuantileSketch)
+    """
+
+    def __init__(
+        self,
+        mean_columns: Sequence[str],
+        correlation_columns: Sequence[str],
+        group_columns: Sequence[str],
+        quantile_columns: Sequence[str] = ("difficulty_score", "attempts"),
+        quantile_levels: Sequence[float] = (0.25, 0.5, 0.75),
+        quantile_alpha: float = 0.005
+    ):
+        self.mean_columns = list(mean_columns)
+        self.correlation_columns = list(correlation_columns)
+        self.group_columns = list(group_columns)
+        self.quantile_levels = list(quantile_levels)
+        self.count = 0
+        self.moments = MomentAccumulator(self.mean_columns)
+        self.correlations = CorrelationAccumulator(self.correlation_columns)
+        self.sketches = {col: QuantileSketch(quantile_alpha) for col in quantile_columns}
+        self.group_sums = pd.DataFrame()
+        self.ratio_sum = 0.0
+        self.ratio_count = 0
+
+    @property
+    def columns(self) -> List[str]:
+        """Colonnes à lire dans chaque bloc."""
+        needed = self.mean_columns + self.correlation_columns + self.group_columns + list(self.sketches)
+        return list(dict.fromkeys(needed + ["difficulty", "attempts", "clears"]))
+
+    def update(self, chunk: pd.DataFrame):
+        """Ajoute un bloc de lignes du dataset."""
+        self.count += len(chunk)
+        self.moments.update(chunk[self.mean_columns].to_numpy(dtype=np.float64))
+        self.correlations.update(chunk[self.correlation_columns].to_numpy(dtype=np.float64))
+        for col, sketch in self.sketches.items():
+            sketch.update(chunk[col].to_numpy(dtype=np.float64))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = chunk["attempts"].to_numpy(dtype=np.float64) / chunk["clears"].to_numpy(dtype=np.float64)
+        ratio = ratio[~np.isnan(ratio)]
+        self.ratio_sum += ratio.sum()
+        self.ratio_count += len(ratio)
+
+        # Effectifs, sommes et valeurs présentes par difficulté
+        grouped = chunk[self.group_columns].astype(np.float64).groupby(chunk["difficulty"], observed=False)
+        sums = pd.concat({"sum": grouped.sum(), "count": grouped.count()}, axis=1)
+        sums[("size", "")] = grouped.size()
+        sums.index = sums.index.astype(object)
+        self._add_group_sums(sums)
+
+    def merge(self, other: "StreamingAggregator"):
+        """Fusionne les accumulateurs d'un autre agrégateur (autre fichier, autre processus)."""
+        self.count += other.count
+        self.moments.merge(other.moments)
+        self.correlations.merge(other.correlations)
+        for col, sketch in self.sketches.items():
+            sketch.merge(other.sketches[col])
+        self.ratio_sum += other.ratio_sum
+        self.ratio_count += other.ratio_count
+        self._add_group_sums(other.group_sums)
+
+    def aggregates(self) -> Dict[str, Any]:
+        """Agrégats au format de DataAnalyzer._aggregate."""
+        quantiles = pd.DataFrame(
+            {col: sketch.quantiles(self.quantile_levels) for col, sketch in self.sketches.items()},
+            index=self.quantile_levels
+        )
+        groups = self.group_sums
+        if len(groups):
+            groups = groups.sort_index()
+            counts = groups[("size", "")].astype(np.int64).rename(None)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                group_means = groups["sum"] / groups["count"]
+        else:
+            counts = pd.Series(dtype=np.int64)
+            group_means = pd.DataFrame(columns=self.group_columns, dtype=float)
+        counts.index.name = "difficulty"
+        group_means.index.name = "difficulty"
+
+        return {
+            "count": self.count,
+            "means": self.moments.means(),
+            "difficulty_std": self.moments.std()["difficulty_score"],
+            "quantiles": quantiles,
+            "correlation_matrix": self.correlations.matrix(),
+            "difficulty_counts": counts.sort_values(ascending=False, kind="stable"),
+            "difficulty_means": group_means[self.group_columns],
+            "attempts_vs_clears_ratio": self.ratio_sum / self.ratio_count if self.ratio_count else np.nan
+        }
+
+    def _add_group_sums(self, sums: pd.DataFrame):
+        if not len(sums):
+            return
+        if not len(self.group_sums):
+            self.group_sums = sums.copy()
+        else:
+            self.group_sums = self.group_sums.add(sums, fill_value=0)
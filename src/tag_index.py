@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Iterable, Union
+from src.level_batch import LevelBatch
+
+
+class TagIndex:
+    """
+    Index inversé des tags d'un dataset.
+
+    Pour chaque tag du vocabulaire, la liste triée des numéros de ligne qui le portent
+    est stockée dans un tableau unique (row_ids) découpé par offsets :
+    les lignes du tag i sont row_ids[offsets[i]:offsets[i + 1]].
+
+    Une requête « speedrun ET technical » devient une intersection de tableaux triés,
+    sans balayer les chaînes de tags ; la cardinalité de chaque tag est immédiate.
+    """
+
+    def __init__(self, vocabulary: np.ndarray, offsets: np.ndarray, row_ids: np.ndarray, n_rows: int):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.row_ids = row_ids
+        self.n_rows = n_rows
+        self._positions = {tag: i for i, tag in enumerate(vocabulary.tolist())}
+
+    @classmethod
+    def from_tags(cls, tags: Union[pd.Series, List]) -> "TagIndex":
+        """Construit l'index à partir d'une colonne de tags (listes ou chaînes séparées par des virgules)."""
+        tag_offsets, tag_codes, vocabulary = LevelBatch.encode_tags(pd.Series(tags, dtype=object))
+        return cls.from_encoded(tag_offsets, tag_codes, vocabulary)
+
+    @classmethod
+    def from_batch(cls, batch: LevelBatch) -> "TagIndex":
+        """Construit l'index directement depuis l'encodage offsets + codes d'un LevelBatch."""
+        return cls.from_encoded(batch.tag_offsets, batch.tag_codes, batch.tag_vocabulary)
+
+    @classmethod
+    def from_encoded(cls, tag_offsets: np.ndarray, tag_codes: np.ndarray, vocabulary: np.ndarray) -> "TagIndex":
+        """Construit l'index à partir de tags encodés (offsets par ligne, codes dans le vocabulaire)."""
+        n_rows = len(tag_offsets) - 1
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(tag_offsets))
+
+        # Tri par (tag, ligne) et suppression des doublons d'un même tag sur une ligne
+        keys = np.unique(tag_codes.astype(np.int64) * max(n_rows, 1) + rows)
+        codes = keys // max(n_rows, 1)
+        row_ids = (keys % max(n_rows, 1)).astype(cls._row_dtype(n_rows))
+
+        counts = np.bincount(codes, minlength=len(vocabulary))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(np.asarray(vocabulary, dtype=object), offsets, row_ids, n_rows)
+
+    def rows(self, tag: str) -> np.ndarray:
+        """Lignes portant le tag, triées ; tableau vide pour un tag inconnu."""
+        position = self._positions.get(tag)
+        if position is None:
+            return self.row_ids[:0]
+        return self.row_ids[self.offsets[position]:self.offsets[position + 1]]
+
+    def rows_with_all(self, tags: Iterable[str]) -> np.ndarray:
+        """Lignes portant tous les tags (intersection, en partant de la liste la plus courte)."""
+        postings = sorted((self.rows(tag) for tag in tags), key=len)
+        if not postings:
+            return np.arange(self.n_rows)
+        result = postings[0]
+        for posting in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+    def rows_with_any(self, tags: Iterable[str]) -> np.ndarray:
+        """Lignes portant au moins un des tags (union)."""
+        postings = [self.rows(tag) for tag in tags]
+        if not postings:
+            return self.row_ids[:0]
+        return np.unique(np.concatenate(postings))
+
+    def mask(self, tags: Iterable[str], match_all: bool = True) -> np.ndarray:
+        """Masque booléen des lignes, utilisable directement sur le DataFrame du dataset."""
+        rows = self.rows_with_all(tags) if match_all else self.rows_with_any(tags)
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def cardinality(self) -> Dict[str, int]:
+        """Nombre de lignes par tag."""
+        return dict(zip(self.vocabulary.tolist(), np.diff(self.offsets).tolist()))
+
+    def save(self, path: Union[str, Path]):
+        """Enregistre l'index (format .npz compressé)."""
+        np.savez_compressed(
+            path,
+            vocabulary=self.vocabulary.astype(str),
+            offsets=self.offsets,
+            row_ids=self.row_ids,
+            n_rows=np.array(self.n_rows)
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TagIndex":
+        """Recharge un index enregistré par save."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["vocabulary"].astype(object),
+                data["offsets"],
+                data["row_ids"],
+                int(data["n_rows"])
+            )
+
+    @staticmethod
+    def _row_dtype(n_rows: int) -> np.dtype:
+        return np.dtype(np.int32) if n_rows <= np.iinfo(np.int32).max else np.dtype(np.int64)
@@ -0,0 +1,204 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+
+def _resample_counts(rng: np.random.Generator, n_resamples: int, n_units: int) -> np.ndarray:
+    """Matrice d'indices de rééchantillonnage (n_resamples x n_units) convertie en nombre de tirages par unité."""
+    indices = rng.integers(0, n_units, size=(n_resamples, n_units))
+    flat = indices + (np.arange(n_resamples) * n_units)[:, None]
+    return np.bincount(flat.ravel(), minlength=n_resamples * n_units).reshape(n_resamples, n_units).astype(np.float64)
+
+
+def _bootstrap_batch(args) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Un lot de rééchantillonnages (exécuté dans un processus du pool).
+    Returns:
+        (corrélations n_resamples x paires, [moyennes n_resamples x colonnes pour chaque groupe])
+    """
+    seed, n_resamples, pair_stats, group_stats = args
+    rng = np.random.default_rng(seed)
+
+    weights = _resample_counts(rng, n_resamples, pair_stats.shape[0])
+    sums = (weights @ pair_stats.reshape(pair_stats.shape[0], -1)).reshape(n_resamples, *pair_stats.shape[1:])
+    n, sx, sy, sxx, syy, sxy = (sums[:, :, i] for i in range(6))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sy / n
+        corr = cov / np.sqrt((sxx - sx ** 2 / n) * (syy - sy ** 2 / n))
+
+    group_means = []
+    for counts, totals in group_stats:
+        weights = _resample_counts(rng, n_resamples, counts.shape[0])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            group_means.append((weights @ totals) / (weights @ counts))
+    return corr, group_means
+
+
+class BootstrapEstimator:
+    """
+    Intervalles de confiance bootstrap (percentiles) des corrélations et des moyennes
+    par difficulté.
+
+    Les lignes sont réparties au hasard en au plus max_units unités (une ligne par unité
+    sur les petits datasets, soit le bootstrap classique) ; chaque unité est résumée par
+    ses statistiques suffisantes (effectifs, sommes, sommes des carrés et des produits).
+    Un rééchantillonnage est une ligne d'une matrice d'indices d'unités : les sommes
+    rééchantillonnées deviennent un produit matriciel, quel que soit le nombre de lignes.
+    Les moyennes par difficulté sont rééchantillonnées à l'intérieur de chaque groupe
+    (bootstrap stratifié).
+
+    Les lots sont répartis sur plusieurs processus ; chacun a sa graine dérivée de seed,
+    donc le résultat ne dépend pas du nombre de processus.
+    """
+
+    def __init__(
+        self,
+        n_resamples: int = 10_000,
+        confidence: float = 0.95,
+        seed: int = 0,
+        n_workers: Optional[int] = None,
+        batch_size: int = 1_000,
+        max_units: int = 2_000
+    ):
+        """
+        Args:
+            n_resamples : Nombre de rééchantillonnages
+            confidence : Niveau de confiance des intervalles
+            seed : Graine (résultats reproductibles)
+            n_workers : Nombre de processus (None = nombre de cœurs, 1 = série)
+            batch_size : Rééchantillonnages par lot
+            max_units : Nombre maximal d'unités rééchantillonnées par groupe
+        """
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_units = max_units
+
+    def estimate(
+        self,
+        df: pd.DataFrame,
+        correlation_pairs: Sequence[Tuple[str, str]],
+        group_column: str,
+        mean_columns: Sequence[str]
+    ) -> Dict[str, Any]:
+        """
+        Args:
+            df : Dataset
+            correlation_pairs : Paires (x, y) dont on veut la corrélation de Pearson
+            group_column : Colonne de regroupement (difficulty)
+            mean_columns : Colonnes dont on veut la moyenne par groupe
+        Returns:
+            {"correlations": {"x_vs_y": intervalle}, "group_means": {groupe: {colonne: intervalle}},
+             "argmax_probability": {colonne: {groupe: probabilité d'avoir la moyenne la plus élevée}},
+             ...paramètres}, chaque intervalle étant {"estimate", "ci_low", "ci_high"}
+        """
+        rng = np.random.default_rng(self.seed)
+        mean_columns = list(mean_columns)
+
+        pair_stats = self._pair_stats(df, correlation_pairs, rng)
+        codes, groups = pd.factorize(df[group_column], sort=True)
+        groups = list(groups)
+        values = df[mean_columns].to_numpy(dtype=np.float64)
+        group_stats = [self._group_stats(values[codes == g], rng) for g in range(len(groups))]
+
+        # Lots de rééchantillonnages, chacun avec une graine dérivée de seed
+        sizes = [min(self.batch_size, self.n_resamples - start) for start in range(0, self.n_resamples, self.batch_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(seed, size, pair_stats, group_stats) for seed, size in zip(seeds, sizes)]
+
+        n_workers = min(self.n_workers, len(tasks))
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                batches = list(executor.map(_bootstrap_batch, tasks))
+        else:
+            batches = [_bootstrap_batch(task) for task in tasks]
+
+        correlations = np.concatenate([batch[0] for batch in batches])
+        group_means = [np.concatenate([batch[1][g] for batch in batches]) for g in range(len(groups))]
+
+        estimates = self._pair_estimates(pair_stats)
+        results = {
+            "correlations": {
+                f"{x}_vs_{y}": self._interval(estimates[p], correlations[:, p])
+                for p, (x, y) in enumerate(correlation_pairs)
+            },
+            "group_means": {
+                group: {
+                    col: self._interval(
+                        group_stats[g][1][:, c].sum() / group_stats[g][0][:, c].sum(), group_means[g][:, c]
+                    )
+                    for c, col in enumerate(mean_columns)
+                }
+                for g, group in enumerate(groups)
+            },
+            "argmax_probability": self._argmax_probability(groups, group_means, mean_columns),
+            "n_resamples": self.n_resamples,
+            "confidence": self.confidence,
+            "seed": self.seed,
+            "resampling_units": int(pair_stats.shape[0])
+        }
+        logging.info(f"Bootstrap : {self.n_resamples} rééchantillonnages sur {len(tasks)} lots")
+        return results
+
+    def _units(self, n_rows: int, rng: np.random.Generator) -> np.ndarray:
+        """Unité (aléatoire, tailles égales à une ligne près) de chaque ligne."""
+        n_units = max(min(n_rows, self.max_units), 1)
+        return rng.permutation(n_rows) % n_units
+
+    def _pair_stats(self, df: pd.DataFrame, pairs: Sequence[Tuple[str, str]], rng: np.random.Generator) -> np.ndarray:
+        """Statistiques suffisantes (n, Sx, Sy, Sxx, Syy, Sxy) par unité et par paire : unités x paires x 6."""
+        units = self._units(len(df), rng)
+        n_units = int(units.max()) + 1 if len(units) else 1
+        stats = np.zeros((n_units, len(pairs), 6))
+        for p, (x, y) in enumerate(pairs):
+            xs = df[x].to_numpy(dtype=np.float64)
+            ys = df[y].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(xs) & ~np.isnan(ys)
+            # Centrage global pour limiter les annulations numériques (la corrélation n'en dépend pas)
+            xs = np.where(valid, xs - (xs[valid].mean() if valid.any() else 0.0), 0.0)
+            ys = np.where(valid, ys - (ys[valid].mean() if valid.any() else 0.0), 0.0)
+            for i, values in enumerate((valid.astype(np.float64), xs, ys, xs * xs, ys * ys, xs * ys)):
+                stats[:, p, i] = np.bincount(units, weights=values, minlength=n_units)
+        return stats
+
+    def _group_stats(self, values: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Effectifs et sommes non manquants par unité d'un groupe : (unités x colonnes, unités x colonnes)."""
+        units = self._units(len(values), rng)
+        n_units = int(units.max()) + 1 if len(units) else 1
+        valid = ~np.isnan(values)
+        counts = np.stack([np.bincount(units, weights=valid[:, c], minlength=n_units) for c in range(values.shape[1])], axis=1)
+        totals = np.stack([np.bincount(units, weights=np.where(valid[:, c], values[:, c], 0.0), minlength=n_units)
+                           for c in range(values.shape[1])], axis=1)
+        return counts, totals
+
+    @staticmethod
+    def _pair_estimates(pair_stats: np.ndarray) -> np.ndarray:
+        n, sx, sy, sxx, syy, sxy = pair_stats.sum(axis=0).T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (sxy - sx * sy / n) / np.sqrt((sxx - sx ** 2 / n) * (syy - sy ** 2 / n))
+
+    def _interval(self, estimate: float, replicates: np.ndarray) -> Dict[str, float]:
+        replicates = replicates[~np.isnan(replicates)]
+        if not len(replicates):
+            return {"estimate": float(estimate), "ci_low": np.nan, "ci_high": np.nan}
+        alpha = (1.0 - self.confidence) / 2.0
+        low, high = np.quantile(replicates, [alpha, 1.0 - alpha])
+        return {"estimate": float(estimate), "ci_low": float(low), "ci_high": float(high)}
+
+    @staticmethod
+    def _argmax_probability(groups: List, group_means: List[np.ndarray], mean_columns: List[str]) -> Dict[str, Dict[Any, float]]:
+        """Part des rééchantillonnages où chaque groupe a la moyenne la plus élevée."""
+        if not groups:
+            return {col: {} for col in mean_columns}
+        probabilities = {}
+        for c, col in enumerate(mean_columns):
+            replicates = np.stack([means[:, c] for means in group_means], axis=1)
+            winners = np.argmax(np.nan_to_num(replicates, nan=-np.inf), axis=1)
+            shares = np.bincount(winners, minlength=len(groups)) / len(winners)
+            probabilities[col] = {group: float(share) for group, share in zip(groups, shares)}
+        return probabilities
@@ -0,0 +1,87 @@
+import pytest
+
+from src.analysis import DataAnalyzer
+from src.level_generator import LevelGenerator
+from src.result_cache import ResultCache
+
+
+@pytest.fixture
+def dataset():
+    return LevelGenerator().generate_frame(500)
+
+
+@pytest.fixture
+def make_analyzer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # analysis_output/ relatif au répertoire courant
+
+    def make() -> DataAnalyzer:
+        analyzer = DataAnalyzer(cache=ResultCache(tmp_path / "cache"))
+        analyzer.aggregate_calls = 0
+        aggregate = analyzer._aggregate
+
+        def counting_aggregate(df):
+            analyzer.aggregate_calls += 1
+            return aggregate(df)
+
+        analyzer._aggregate = counting_aggregate
+        return analyzer
+
+    return make
+
+
+def _analyze(analyzer, dataset):
+    return analyzer.analyze_difficulty_patterns(dataset, headless=True, save_artifacts=False)
+
+
+def test_second_analysis_is_read_from_cache(make_analyzer, dataset):
+    first = _analyze(make_analyzer(), dataset)
+    analyzer = make_analyzer()
+    second = _analyze(analyzer, dataset)
+
+    assert analyzer.aggregate_calls == 0
+    assert second == first
+
+
+def test_columns_outside_the_analysis_do_not_change_the_key(make_analyzer, dataset):
+    _analyze(make_analyzer(), dataset)
+    analyzer = make_analyzer()
+    _analyze(analyzer, dataset.assign(title="autre titre", timestamp="2026-01-01"))
+
+    assert analyzer.aggregate_calls == 0
+
+
+def test_changed_values_are_recomputed(make_analyzer, dataset):
+    _analyze(make_analyzer(), dataset)
+    analyzer = make_analyzer()
+    changed = dataset.copy()
+    changed.loc[0, "likes"] += 1
+    _analyze(analyzer, changed)
+
+    assert analyzer.aggregate_calls == 1
+
+
+def test_keys_follow_the_parameters_each_section_reads(make_analyzer, dataset):
+    analyzer = make_analyzer()
+    content_hash = analyzer._content_hash(dataset)
+    sections = list(analyzer.section_parameters)
+    before = {section: analyzer._cache_key(content_hash, section) for section in sections}
+
+    analyzer.group_columns = analyzer.group_columns + ["clears"]
+    after = {section: analyzer._cache_key(content_hash, section) for section in sections}
+    changed = {section for section in sections if before[section] != after[section]}
+    assert changed == {"player_patterns", "tables", "snapshot_summary"}
+
+    analyzer.quantile_alpha = 0.01  # Lu uniquement par l'agrégation en flux des snapshots
+    assert {section for section in sections if analyzer._cache_key(content_hash, section) != after[section]} == {"snapshot_summary"}
+
+    analyzer.difficulty_thresholds = {"easy": 0.1}  # Lu par aucune section en cache
+    assert all(analyzer._cache_key(content_hash, section) == after[section] for section in sections if section != "snapshot_summary")
+
+
+def test_mean_columns_change_invalidates_cached_sections(make_analyzer, dataset):
+    _analyze(make_analyzer(), dataset)
+    analyzer = make_analyzer()
+    analyzer.mean_columns = analyzer.mean_columns + ["popularity_score"]
+    _analyze(analyzer, dataset)
+
+    assert analyzer.aggregate_calls == 1
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import git
+import pytest
+
+from src.data_collection import DataCollector
+from src.level_batch import LevelBatch
+
+HEADER = "level_id,title,maker,difficulty,likes,tags\n"
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Dépôt PED local : data/game_levels.csv versionné, et collecteur pointé dessus."""
+    monkeypatch.chdir(tmp_path)
+    repo = git.Repo.init(tmp_path / "PED")
+    repo.config_writer().set_value("user", "name", "test").release()
+    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    (tmp_path / "PED" / "data").mkdir()
+    return repo
+
+
+def _commit(repo, content: str) -> str:
+    path = repo.working_tree_dir + "/data/game_levels.csv"
+    with open(path, "w", newline="") as f:
+        f.write(content)
+    repo.index.add(["data/game_levels.csv"])
+    return repo.index.commit("update").hexsha
+
+
+def _collector(repo) -> DataCollector:
+    collector = DataCollector()
+    collector.local_repo_path = Path(repo.working_tree_dir)
+    return collector
+
+
+def test_changed_rows_include_plus_prefixed_and_multiline_records(repo):
+    base = HEADER + 'a,Titre A,m1,easy,1,x\nb,"Titre\nsur deux lignes",m2,hard,2,y\nc,Titre C,m3,normal,3,z\n'
+    old = _commit(repo, base)
+    # b : seule la seconde ligne physique de son titre change ; d : premier champ commençant par "++"
+    new = _commit(repo, base.replace("sur deux lignes", "sur deux lignes modifiées") + '++d,Titre D,m4,expert,4,"x,y"\n')
+
+    df = _collector(repo)._load_changed_rows(repo, old, new)
+
+    assert df["level_id"].tolist() == ["b", "++d"]
+    assert df["title"].tolist() == ["Titre\nsur deux lignes modifiées", "Titre D"]
+    assert df["tags"].tolist() == ["y", "x,y"]
+
+
+def test_file_created_between_commits_yields_all_rows_without_header(repo):
+    (Path(repo.working_tree_dir) / "README").write_text("PED\n")
+    repo.index.add(["README"])
+    old = repo.index.commit("init").hexsha
+    new = _commit(repo, HEADER + "a,Titre A,m1,easy,1,x\nb,Titre B,m2,hard,2,y\n")
+
+    df = _collector(repo)._load_changed_rows(repo, old, new)
+
+    assert df["level_id"].tolist() == ["a", "b"]
+
+
+def test_deletions_only_yield_no_rows(repo):
+    old = _commit(repo, HEADER + "a,Titre A,m1,easy,1,x\nb,Titre B,m2,hard,2,y\n")
+    new = _commit(repo, HEADER + "a,Titre A,m1,easy,1,x\n")
+
+    assert _collector(repo)._load_changed_rows(repo, old, new).empty
+
+
+def test_incremental_collection_rejects_a_limit_and_honours_compact(repo, monkeypatch):
+    collector = _collector(repo)
+    with pytest.raises(ValueError):
+        collector.collect_game_data(incremental=True)
+
+    head = _commit(repo, HEADER + "a,Titre A,m1,easy,1,x\n")
+    monkeypatch.setattr(collector, "_setup_repository", lambda: None)
+    monkeypatch.setattr(collector, "_get_remote_head", lambda: head)
+    monkeypatch.setattr(collector, "_save_raw_data", lambda data: None)
+    data = collector.collect_game_data(limit=None, incremental=True, compact=True)
+    unchanged = collector.collect_game_data(limit=None, incremental=True, compact=True)
+
+    assert isinstance(data["levels"], LevelBatch) and len(data["levels"]) == 1
+    assert data["source_commit"] == head
+    assert isinstance(unchanged["levels"], LevelBatch) and len(unchanged["levels"]) == 0
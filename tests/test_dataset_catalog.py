@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from src.dataset_catalog import DatasetCatalog
+from src.dataset_structure import DatasetBuilder
+from src.level_generator import LevelGenerator
+
+
+@pytest.fixture
+def levels():
+    return LevelGenerator().generate(500)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # DatasetBuilder écrit dans data/ relatif au répertoire courant
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "data"
+
+
+def test_same_content_same_format_is_deduplicated(data_dir, levels):
+    builder = DatasetBuilder()
+    builder.build_dataset(levels)
+    first = builder.catalog.latest()
+    builder.build_dataset(levels)
+
+    assert [v["version"] for v in builder.catalog.versions()] == [first["version"]]
+    assert builder.catalog.latest()["version"] == first["version"]
+    assert sorted(p.name for p in data_dir.glob("dataset_*")) == sorted(
+        pd.Series(first["files"]).map(lambda f: f.split("/")[-1])
+    )
+
+
+def test_same_content_other_format_is_kept(data_dir, levels):
+    catalog = DatasetCatalog(data_dir)
+    DatasetBuilder(output_format="parquet", catalog=catalog).build_dataset(levels)
+    DatasetBuilder(output_format="csv", catalog=catalog).build_dataset(levels)
+
+    versions = catalog.versions()
+    assert [v["path"].rsplit(".", 1)[-1] for v in versions] == ["parquet", "pkl"]
+    assert versions[0]["content_hash"] == versions[1]["content_hash"]
+    assert all(all((data_dir.parent / f).exists() for f in v["files"]) for v in versions)
+    assert catalog.find_by_hash(versions[0]["content_hash"], ".pkl")["version"] == versions[1]["version"]
+
+
+def test_run_metadata_is_not_hashed(data_dir, levels):
+    builder = DatasetBuilder(optimize_dtypes=False)
+    first = builder.build_dataset(levels)
+    second = builder.build_dataset(levels)
+
+    assert "timestamp" in first.columns
+    assert DatasetCatalog.content_hash(first) == DatasetCatalog.content_hash(second)
+    assert len(builder.catalog.versions()) == 1
+
+
+def test_retention_keeps_latest_and_drops_files(data_dir):
+    catalog = DatasetCatalog(data_dir, keep_last=2)
+    builder = DatasetBuilder(catalog=catalog)
+    generator = LevelGenerator()
+    for _ in range(4):
+        builder.build_dataset(generator.generate(50))
+
+    versions = catalog.versions()
+    assert len(versions) == 2 and catalog.latest()["version"] == versions[-1]["version"]
+    kept = {f.split("/")[-1] for v in versions for f in v["files"]}
+    assert {p.name for p in data_dir.glob("dataset_*")} == kept
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.dataset_structure import DatasetBuilder
+from src.level_generator import LevelGenerator
+
+
+@pytest.fixture
+def levels():
+    return LevelGenerator().generate(500)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # DatasetBuilder écrit dans data/ relatif au répertoire courant
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "data"
+
+
+def _delta(levels, difficulty):
+    """Dix niveaux d'une difficulté modifiés et trois niveaux nouveaux de la même difficulté."""
+    changed = [dict(level, likes=level["likes"] + 1) for level in levels["levels"] if level["difficulty"] == difficulty][:10]
+    added = [dict(level, level_id=f"new_{i}") for i, level in enumerate(changed[:3])]
+    return {"levels": changed + added}
+
+
+@pytest.mark.parametrize("partitioned", [False, True])
+def test_incremental_build_upserts_the_delta(data_dir, levels, partitioned):
+    builder = DatasetBuilder(partition_by_difficulty=partitioned)
+    builder.build_dataset(levels)
+    base = builder.catalog.latest()
+    difficulty = levels["levels"][0]["difficulty"]
+    delta = _delta(levels, difficulty)
+
+    entry = builder.build_incremental(delta)
+
+    stored = DatasetBuilder.load_dataset(entry["path"])
+    expected = pd.DataFrame(levels["levels"] + delta["levels"]).drop_duplicates("level_id", keep="last")
+    assert entry["version"] != base["version"] and entry["row_count"] == len(expected) == len(stored)
+    pd.testing.assert_series_equal(
+        stored.set_index("level_id")["likes"].sort_index().astype("int64"),
+        expected.set_index("level_id")["likes"].sort_index().astype("int64")
+    )
+    # Schéma du catalogue : celui des données écrites, pas celui du delta
+    assert entry["schema"] == {col: str(dtype) for col, dtype in stored.dtypes.items()}
+
+    if partitioned:
+        # Partitions non touchées par le delta reprises sans réécriture (même inode)
+        untouched = [p.name for p in Path(base["path"]).iterdir() if p.name != f"difficulty={difficulty}"]
+        assert untouched
+        for partition in untouched:
+            base_files = sorted((Path(base["path"]) / partition).iterdir())
+            new_files = sorted((Path(entry["path"]) / partition).iterdir())
+            assert [f.stat().st_ino for f in base_files] == [f.stat().st_ino for f in new_files]
+
+
+@pytest.mark.parametrize("partitioned", [False, True])
+def test_delta_without_changes_creates_no_version(data_dir, levels, partitioned):
+    builder = DatasetBuilder(partition_by_difficulty=partitioned)
+    builder.build_dataset(levels)
+    base = builder.catalog.latest()
+
+    entry = builder.build_incremental({"levels": levels["levels"][:20]})
+
+    assert entry["version"] == base["version"]
+    assert [version["version"] for version in builder.catalog.versions()] == [base["version"]]
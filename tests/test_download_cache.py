@@ -0,0 +1,171 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.download_cache import DownloadCache
+
+
+class _FileServer:
+    """Serveur HTTP local servant un CSV, avec ou sans ETag, et journal des requêtes reçues."""
+
+    def __init__(self, body: bytes, with_etag: bool = True):
+        self.body = body
+        self.with_etag = with_etag
+        self.requests = []  # (chemin, If-None-Match, statut renvoyé)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                etag = f'"{hashlib.sha256(server.body).hexdigest()[:16]}"'
+                if_none_match = self.headers.get("If-None-Match")
+                if server.with_etag and if_none_match == etag:
+                    server.requests.append((self.path, if_none_match, 304))
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                server.requests.append((self.path, if_none_match, 200))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                self.send_header("Content-Length", str(len(server.body)))
+                if server.with_etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/levels.csv"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _csv(n_rows: int) -> bytes:
+    return pd.DataFrame({"level_id": range(n_rows), "likes": range(0, 2 * n_rows, 2)}).to_csv(index=False).encode("utf-8")
+
+
+class _CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, stream) -> pd.DataFrame:
+        self.calls += 1
+        return pd.read_csv(stream)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(body: bytes, with_etag: bool = True) -> _FileServer:
+        servers.append(_FileServer(body, with_etag))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_cold_fetch_downloads_parses_and_stores(tmp_path, serve):
+    server = serve(_csv(100))
+    cache = DownloadCache(tmp_path)
+    parse = _CountingParser()
+
+    df = cache.fetch(server.url, parse)
+
+    assert len(df) == 100 and df["likes"].iloc[-1] == 198
+    assert [status for _, _, status in server.requests] == [200]
+    assert parse.calls == 1
+    entry = cache._index[cache.make_key(server.url)]
+    assert entry["etag"] and entry["content_hash"] == hashlib.sha256(server.body).hexdigest()
+    assert (tmp_path / entry["file"]).exists()
+
+
+def test_warm_read_sends_no_request(tmp_path, serve):
+    server = serve(_csv(100))
+    cache = DownloadCache(tmp_path)
+    parse = _CountingParser()
+    cache.fetch(server.url, parse)
+
+    df = cache.fetch(server.url, parse)
+    # Un nouveau cache sur le même répertoire relit l'index sur disque
+    reopened = DownloadCache(tmp_path).fetch(server.url, parse)
+
+    assert len(server.requests) == 1
+    assert parse.calls == 1
+    pd.testing.assert_frame_equal(df, reopened)
+
+
+def test_stale_entry_is_revalidated_with_etag(tmp_path, serve):
+    server = serve(_csv(100))
+    cache = DownloadCache(tmp_path, max_age=0)
+    parse = _CountingParser()
+    first = cache.fetch(server.url, parse)
+    validated_at = cache._index[cache.make_key(server.url)]["validated_at"]
+
+    df = cache.fetch(server.url, parse)
+
+    _, if_none_match, status = server.requests[-1]
+    assert status == 304 and if_none_match == cache._index[cache.make_key(server.url)]["etag"]
+    assert parse.calls == 1  # Réponse 304 : l'entrée en cache est relue, pas analysée de nouveau
+    assert cache._index[cache.make_key(server.url)]["validated_at"] >= validated_at
+    pd.testing.assert_frame_equal(df, first)
+
+
+def test_revalidation_by_content_hash_without_etag(tmp_path, serve):
+    server = serve(_csv(100), with_etag=False)
+    cache = DownloadCache(tmp_path, max_age=0)
+    parse = _CountingParser()
+    cache.fetch(server.url, parse)
+    key = cache.make_key(server.url)
+    entry_file = tmp_path / cache._index[key]["file"]
+    written_at = entry_file.stat().st_mtime_ns
+
+    # Même contenu : téléchargé et haché, mais l'entrée n'est pas réécrite
+    cache.fetch(server.url, parse)
+    assert [status for _, _, status in server.requests] == [200, 200]
+    assert entry_file.stat().st_mtime_ns == written_at
+
+    # Contenu modifié : nouveau hash, l'entrée est remplacée
+    server.body = _csv(150)
+    df = cache.fetch(server.url, parse)
+    assert len(df) == 150
+    assert cache._index[key]["content_hash"] == hashlib.sha256(server.body).hexdigest()
+    assert len(cache._read_entry(key, cache._index[key])) == 150
+
+
+def test_instances_sharing_a_directory_merge_their_index(tmp_path, serve):
+    servers = [serve(_csv(10 + i)) for i in range(6)]
+    first, second = DownloadCache(tmp_path), DownloadCache(tmp_path)
+    parse = _CountingParser()
+
+    # Écritures concurrentes de deux instances chargées avant toute entrée
+    threads = [
+        threading.Thread(target=cache.fetch, args=(server.url, parse))
+        for i, server in enumerate(servers)
+        for cache in [(first, second)[i % 2]]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reopened = DownloadCache(tmp_path)
+    assert sorted(reopened._index) == sorted(reopened.make_key(server.url) for server in servers)
+
+    # Une suppression n'est pas annulée par l'écriture suivante de l'autre instance
+    second.invalidate(servers[0].url)
+    first.fetch(servers[1].url, parse)
+    assert reopened.make_key(servers[0].url) not in DownloadCache(tmp_path)._index
+    # Entrée écrite par l'autre instance : servie depuis le disque, sans requête
+    requests_before = len(servers[2].requests)
+    second.fetch(servers[2].url, parse)
+    assert len(servers[2].requests) == requests_before
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import large_charts
+
+
+@pytest.fixture(autouse=True)
+def small_threshold(monkeypatch):
+    monkeypatch.setattr(large_charts, "LARGE_DATA_THRESHOLD", 1000)
+
+
+def _levels(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    difficulty = rng.choice(["easy", "normal", "hard"], n_rows)
+    clear_rate = rng.uniform(0, 100, n_rows)
+    return pd.DataFrame({
+        "difficulty": difficulty,
+        "clear_rate": clear_rate,
+        "engagement_score": 2.0 * clear_rate + rng.normal(0, 5, n_rows)
+    })
+
+
+def _payload(fig) -> int:
+    return len(fig.to_json())
+
+
+def test_small_dataset_keeps_raw_svg_points():
+    fig = large_charts.scatter(_levels(500), "clear_rate", "engagement_score", color="difficulty")
+
+    assert {trace.type for trace in fig.data} == {"scatter"}
+    assert sum(len(trace.x) for trace in fig.data) == 500
+
+
+def test_large_scatter_is_a_bounded_webgl_sample_with_full_trendlines():
+    df = _levels(20_000)
+    figs = [
+        large_charts.scatter(df.head(n_rows), "clear_rate", "engagement_score", color="difficulty",
+                             trendline="ols", max_points=500)
+        for n_rows in (5_000, 20_000)
+    ]
+
+    points = [trace for trace in figs[1].data if trace.mode == "markers"]
+    assert {trace.type for trace in figs[1].data} == {"scattergl"}
+    assert sum(len(trace.x) for trace in points) == 500
+    assert _payload(figs[1]) < 1.2 * _payload(figs[0])
+    # Tendance ajustée sur toutes les lignes, pas sur l'échantillon affiché
+    trend = next(trace for trace in figs[1].data if trace.name == "hard (tendance)")
+    hard = df[df["difficulty"] == "hard"]
+    slope = np.polyfit(hard["clear_rate"], hard["engagement_score"], 1)[0]
+    assert (trend.y[1] - trend.y[0]) / (trend.x[1] - trend.x[0]) == pytest.approx(slope)
+
+
+def test_density_mode_counts_every_level():
+    df = _levels(5_000)
+    df.loc[::10, "clear_rate"] = np.nan
+
+    fig = large_charts.scatter(df, "clear_rate", "engagement_score", mode="density")
+
+    assert np.nansum(np.array(fig.data[0].z, dtype=float)) == df["clear_rate"].notna().sum()
+
+
+def test_box_and_violin_send_precomputed_statistics():
+    df = _levels(20_000)
+    stats = large_charts.box_stats(df, "difficulty", "engagement_score")
+
+    for group, values in df.groupby("difficulty")["engagement_score"]:
+        q1, q3 = values.quantile([0.25, 0.75])
+        assert stats.loc[group, "median"] == pytest.approx(values.median())
+        assert stats.loc[group, "upperfence"] == values[values <= q3 + 1.5 * (q3 - q1)].max()
+        assert stats.loc[group, "count"] == len(values)
+
+    for fig in [large_charts.box(df, "difficulty", "engagement_score", color="difficulty"),
+                large_charts.violin(df, "difficulty", "engagement_score")]:
+        assert _payload(fig) < 50_000
+        assert all(trace.boxpoints is False for trace in fig.data if trace.type == "box")
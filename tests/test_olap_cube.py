@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.olap_cube import LevelCube
+
+
+def _levels(n_rows: int = 2000, offset: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "difficulty": rng.choice(["easy", "normal", "hard"], n_rows),
+        "maker": rng.choice([f"maker_{i}" for i in range(150)], n_rows),
+        "tags": [list(rng.choice(["speedrun", "puzzle", "auto"], rng.integers(0, 3), replace=False)) for _ in range(n_rows)],
+        "likes": offset + rng.normal(0.0, 1.0, n_rows),
+        "clear_rate": rng.uniform(0, 100, n_rows)
+    })
+    df.loc[::7, "clear_rate"] = np.nan
+    return df
+
+
+def _expected(df: pd.DataFrame, difficulty, tag) -> pd.DataFrame:
+    mask = df["difficulty"].isin([difficulty] if isinstance(difficulty, str) else difficulty)
+    if tag is not None:
+        mask &= df["tags"].map(lambda tags: tag in tags)
+    return df[mask]
+
+
+@pytest.mark.parametrize("difficulty, tag", [(["easy", "normal", "hard"], None), ("hard", "speedrun"), (["easy", "hard"], "puzzle")])
+def test_slice_matches_pandas(difficulty, tag):
+    df = _levels()
+    stats = LevelCube.from_frame(df).slice(difficulty=difficulty, tag=tag)
+    expected = _expected(df, difficulty, tag)
+
+    assert stats["levels"] == len(expected)
+    for measure in ["likes", "clear_rate"]:
+        assert stats[measure]["count"] == expected[measure].count()
+        assert stats[measure]["mean"] == pytest.approx(expected[measure].mean())
+        assert stats[measure]["variance"] == pytest.approx(expected[measure].var())
+
+
+def test_variance_is_accurate_for_large_values():
+    # Avec la somme des carrés (1e18) la variance (~1) se perd dans les arrondis
+    df = _levels(offset=1e9)
+    stats = LevelCube.from_frame(df).slice(difficulty="normal")
+
+    expected = _expected(df, "normal", None)["likes"].var()
+    assert stats["likes"]["variance"] >= 0
+    assert stats["likes"]["variance"] == pytest.approx(expected, rel=1e-6)
+
+
+def test_save_load_round_trip(tmp_path):
+    cube = LevelCube.from_frame(_levels())
+    cube.save(tmp_path / "cube.npz")
+
+    loaded = LevelCube.load(tmp_path / "cube.npz")
+
+    assert loaded.slice(tag="auto") == cube.slice(tag="auto")
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from src.analysis import DataAnalyzer
+from src.level_generator import LevelGenerator
+from src.result_cache import ResultCache
+
+
+def test_snapshots_of_the_same_second_keep_distinct_ordered_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # analysis_output/ relatif au répertoire courant
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    versions = ["20260101_115959", "20260101_120000", "20260101_120000_2", "20260101_120000_10"]
+    for i, version in enumerate(versions):
+        LevelGenerator().generate_frame(100 + i).to_pickle(data_dir / f"dataset_{version}.pkl")
+
+    series = DataAnalyzer(cache=ResultCache(tmp_path / "cache")).analyze_snapshot_series(data_dir, n_workers=1)
+
+    assert series.index.is_unique and series.index.is_monotonic_increasing
+    assert series["version"].tolist() == versions
+    assert series["levels"].tolist() == [100, 101, 102, 103]
+    assert (series.index.floor("s") == pd.Timestamp("2026-01-01 12:00:00")).sum() == 3
@@ -0,0 +1,40 @@
+import gzip
+
+from src.snapshot_store import SnapshotStore, _encode
+
+
+def _levels(ids):
+    return {"levels": [{"level_id": f"L{i}", "likes": i} for i in ids]}
+
+
+def test_save_writes_only_the_new_pack_object_list(tmp_path):
+    store = SnapshotStore(tmp_path)
+    store.save(_levels(range(100)))
+    lists = {path.name: path.stat().st_mtime_ns for path in (tmp_path / "objects").iterdir()}
+
+    # Un nouveau processus (nouvelle instance) : seuls 10 niveaux sont nouveaux
+    snapshot_id = SnapshotStore(tmp_path).save(_levels(range(10, 110)))
+
+    after = {path.name: path.stat().st_mtime_ns for path in (tmp_path / "objects").iterdir()}
+    assert len(after) == 2 and all(after[name] == mtime for name, mtime in lists.items())
+    assert store.list_snapshots()[-1]["new_levels"] == 10
+    assert store.load(snapshot_id) == _levels(range(10, 110))
+
+
+def test_store_with_a_single_object_table_is_migrated(tmp_path):
+    store = SnapshotStore(tmp_path)
+    first = store.save(_levels(range(50)))
+    # Store antérieur : une seule table hash -> pack, sans listes par pack
+    known = dict(store._known_objects())
+    for path in (tmp_path / "objects").iterdir():
+        path.unlink()
+    (tmp_path / "objects").rmdir()
+    (tmp_path / "objects.json.gz").write_bytes(gzip.compress(_encode(known)))
+
+    migrated = SnapshotStore(tmp_path)
+    migrated.save(_levels(range(51)))
+
+    assert not (tmp_path / "objects.json.gz").exists()
+    assert migrated.list_snapshots()[-1]["new_levels"] == 1
+    assert len(list((tmp_path / "objects").iterdir())) == 2
+    assert migrated.load(first) == _levels(range(50))
@@ -1,7 +1,18 @@
+import csv
 import pandas as pd
 import streamlit as st
-import requests
-import io
+from pathlib import Path
+from src.column_store import ColumnStore
+from src.dataset_catalog import DatasetCatalog
+from src.olap_cube import LevelCube
+from src.download_cache import DownloadCache
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # URL pour télécharger un fichier spécifique depuis Google Drive (traitées)
 def get_gdrive_download_url(file_id: str) -> str:
@@ -62,6 +73,107 @@ processed_file_ids = [
 def get_github_raw_url(repo_url: str, file_path: str) -> str:
     return f"https://raw.githubusercontent.com/{repo_url}/main/{file_path}"
 
+@st.cache_resource
+def get_download_cache(cache_dir="data/download_cache"):
+    """Cache disque des fichiers téléchargés, partagé par les sessions et conservé entre les redémarrages."""
+    return DownloadCache(Path(cache_dir))
+
+# Colonnes lues dans les CSV (graphiques, métriques, cube d'agrégats, dédoublonnage) et leur type
+CSV_COLUMN_TYPES = {
+    "level_id": "text",
+    "title": "text",
+    "maker": "category",
+    "difficulty": "category",
+    "tags": "text",
+    "clear_rate": "float",
+    "completion_rate": "float",
+    "difficulty_score": "float",
+    "popularity_score": "float",
+    "engagement_score": "float",
+    "attempts": "int",
+    "clears": "int",
+    "likes": "int"
+}
+
+NUMERIC_ARROW_TYPES = {"float": pa.float64(), "int": pa.int64()} if PYARROW_AVAILABLE else {}
+
+def _parse_csv(stream, chunk_size=100_000):
+    """
+    Analyse un CSV au fil du flux binaire de la réponse, sans copie complète du texte :
+    seules les colonnes de CSV_COLUMN_TYPES sont converties, avec leur type. Moteur
+    pyarrow (multithread, blocs de 4 Mo) si disponible, sinon moteur C de pandas par blocs.
+    Une valeur non numérique dans une colonne numérique devient manquante, sans faire
+    échouer le chargement du fichier.
+    """
+    header = _csv_header(stream)
+    columns = [col for col in header if col in CSV_COLUMN_TYPES] if header else None
+
+    if PYARROW_AVAILABLE:
+        arrow_types = {
+            "text": pa.string(),
+            "category": pa.dictionary(pa.int32(), pa.string()),
+            # Colonnes numériques lues en texte puis converties : le flux ne peut pas être relu
+            "float": pa.string(),
+            "int": pa.string()
+        }
+        reader = pa_csv.open_csv(
+            stream,
+            read_options=pa_csv.ReadOptions(block_size=4 << 20),
+            parse_options=pa_csv.ParseOptions(delimiter=',', invalid_row_handler=lambda row: "skip"),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                strings_can_be_null=True,  # Champs vides manquants, comme avec pandas
+                column_types={col: arrow_types[kind] for col, kind in CSV_COLUMN_TYPES.items()}
+            )
+        )
+        table = reader.read_all()
+        if columns is None:
+            table = table.select([col for col in table.column_names if col in CSV_COLUMN_TYPES])
+        for i, col in enumerate(table.column_names):
+            if CSV_COLUMN_TYPES[col] in NUMERIC_ARROW_TYPES:
+                table = table.set_column(i, col, _arrow_numeric(table.column(i), NUMERIC_ARROW_TYPES[CSV_COLUMN_TYPES[col]]))
+        # Les blocs Arrow sont libérés au fil de la conversion
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    pandas_types = {"text": object, "category": "category"}
+    chunks = pd.read_csv(
+        stream,
+        delimiter=',',
+        on_bad_lines='skip',
+        usecols=lambda col: col in CSV_COLUMN_TYPES,
+        # Entiers inférés par bloc : un bloc avec des valeurs manquantes passe en float
+        dtype={col: pandas_types[kind] for col, kind in CSV_COLUMN_TYPES.items() if kind in pandas_types},
+        chunksize=chunk_size
+    )
+    df = pd.concat(chunks, ignore_index=True)
+    for col in df.columns:
+        if CSV_COLUMN_TYPES[col] == "category":
+            # Catégories différentes d'un bloc à l'autre : la concaténation repasse en objets
+            df[col] = df[col].astype("category")
+        elif CSV_COLUMN_TYPES[col] in ("float", "int") and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+def _arrow_numeric(column, arrow_type):
+    """
+    Colonne texte convertie en nombres par Arrow ; si une valeur n'est pas numérique,
+    conversion par pandas où elle devient manquante (NaN).
+    """
+    try:
+        return column.cast(arrow_type)
+    except pa.ArrowInvalid:
+        return pa.array(pd.to_numeric(column.to_pandas(), errors="coerce"), from_pandas=True)
+
+def _csv_header(stream):
+    """Noms des colonnes lus dans le tampon du flux, sans le consommer (None si indisponible)."""
+    if not hasattr(stream, "peek"):
+        return None
+    head = stream.peek(1 << 16)
+    end = head.find(b"\n")
+    if end < 0:
+        return None
+    return next(csv.reader([head[:end].decode("utf-8-sig").rstrip("\r")]), None)
+
 @st.cache_data
 def load_data(use_processed=True, file_index=0):
     try:
@@ -73,11 +185,8 @@ def load_data(use_processed=True, file_index=0):
             repo_url = "AJEANEUDES/PED"  # Repos GitHub
             url = get_github_raw_url(repo_url, raw_github_file_path)
         
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        # Charger le CSV dans un DataFrame
-        df = pd.read_csv(io.StringIO(response.text), delimiter=',', on_bad_lines='skip')
+        # Charger le CSV dans un DataFrame (depuis le cache disque s'il est à jour)
+        df = get_download_cache().fetch(url, _parse_csv)
         
         # Vérifier l'existence de la colonne 'difficulty'
         if 'difficulty' not in df.columns:
@@ -91,3 +200,103 @@ def load_data(use_processed=True, file_index=0):
     except Exception as e:
         st.error(f"Erreur lors du chargement des données: {str(e)}")
         return None
+
+
+@st.cache_data
+def load_all_data(file_ids=None, max_workers=16):
+    """
+    Télécharge en parallèle les fichiers traités (tous par défaut) et les fusionne en un
+    seul DataFrame : la durée est celle du fichier le plus lent, non la somme des fichiers.
+
+    Un niveau présent dans plusieurs fichiers est gardé une fois (premier fichier de la
+    liste). La colonne source_file_id indique le fichier d'origine de chaque ligne et
+    df.attrs["sources"] le bilan de chaque fichier (lignes, doublons écartés, erreur).
+    """
+    try:
+        file_ids = list(file_ids) if file_ids is not None else processed_file_ids
+        urls = {file_id: get_gdrive_download_url(file_id) for file_id in file_ids}
+        frames = get_download_cache().fetch_many(list(urls.values()), _parse_csv, max_workers=max_workers)
+
+        sources = {}
+        parts = []
+        for file_id, url in urls.items():
+            frame = frames[url]
+            if isinstance(frame, Exception):
+                sources[file_id] = {"rows": 0, "duplicates": 0, "error": str(frame)}
+                continue
+            sources[file_id] = {"rows": len(frame), "duplicates": 0, "error": None}
+            parts.append(frame.assign(source_file_id=file_id))
+
+        if not parts:
+            st.error("Aucun fichier n'a pu être chargé.")
+            return None
+
+        df = pd.concat(parts, ignore_index=True)
+        if "level_id" in df.columns:
+            duplicated = df["level_id"].notna() & df.duplicated("level_id", keep="first")
+            for file_id, count in df.loc[duplicated, "source_file_id"].value_counts().items():
+                sources[file_id]["duplicates"] = int(count)
+            df = df[~duplicated].reset_index(drop=True)
+        df["source_file_id"] = df["source_file_id"].astype("category")
+        for col in df.columns:
+            if CSV_COLUMN_TYPES.get(col) == "category" and df[col].dtype != "category":
+                # Catégories différentes d'un fichier à l'autre : la concaténation repasse en objets
+                df[col] = df[col].astype("category")
+
+        if 'difficulty' not in df.columns:
+            st.error("La colonne 'difficulty' est manquante dans les données.")
+            return None
+
+        failed = [file_id for file_id, source in sources.items() if source["error"]]
+        if failed:
+            st.warning(f"{len(failed)} fichier(s) non chargé(s) : {', '.join(failed)}")
+
+        df.attrs["sources"] = sources
+        return df
+
+    except Exception as e:
+        st.error(f"Erreur lors du chargement des données: {str(e)}")
+        return None
+
+
+@st.cache_resource
+def load_numeric_columns(data_dir="data", version=None):
+    """
+    Projette en lecture seule les colonnes numériques d'une version du catalogue
+    (la dernière par défaut). Rien n'est lu au démarrage et les workers du tableau
+    de bord partagent la même copie en cache système.
+    """
+    try:
+        catalog = DatasetCatalog(Path(data_dir))
+        entry = catalog.get(version) if version else catalog.latest()
+        if entry is None:
+            st.error("Aucun dataset dans le catalogue.")
+            return None
+
+        columns_path = ColumnStore.path_for(entry["path"])
+        if not columns_path.exists():
+            st.error(f"Colonnes projetables absentes pour la version {entry['version']}.")
+            return None
+
+        return ColumnStore.open(columns_path).to_frame()
+
+    except Exception as e:
+        st.error(f"Erreur lors du chargement des colonnes numériques: {str(e)}")
+        return None
+
+
+@st.cache_resource
+def load_level_cube(df):
+    """
+    Cube d'agrégats difficulté x tag x créateur des données chargées, construit une
+    seule fois : chaque changement de filtre n'additionne ensuite que quelques cellules.
+    """
+    try:
+        if "maker" not in df.columns:
+            st.warning("La colonne 'maker' est absente : tranches par créateur indisponibles.")
+            return None
+        return LevelCube.from_frame(df)
+
+    except Exception as e:
+        st.error(f"Erreur lors de la construction du cube d'agrégats: {str(e)}")
+        return None